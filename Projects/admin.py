@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db.models import Count, Prefetch, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
@@ -6,8 +8,11 @@ from .models import (
     Project, City, Category, ProjectType, Tag, Amenity, 
     ProjectOverview, GalleryImage, NearestArea, FloorPlan, 
     ConstructionUpdate, WhyChooseUs, SpecificationCategory, 
-    SpecificationItem, ProjectAmenityImage, FloorPlanAccess
+    SpecificationItem, ProjectAmenityImage, FloorPlanAccess, ProjectInquiry
 )
+from theme.admin_mixins import LeadContactMixin, QueryBudgetMixin
+from .images import preview_url
+from theme.exports import EXPORT_ACTIONS
 
 
 # Inline Admin Classes
@@ -37,7 +42,7 @@ class GalleryImageInline(admin.TabularInline):
         if obj.image:
             return format_html(
                 '<img src="{}" width="60" height="40" style="border-radius: 4px; object-fit: cover;" />',
-                obj.image.url
+                preview_url(obj.image)
             )
         return "No image"
     image_preview.short_description = 'Preview'
@@ -62,7 +67,7 @@ class FloorPlanInline(admin.TabularInline):
         if obj.image:
             return format_html(
                 '<img src="{}" width="60" height="40" style="border-radius: 4px; object-fit: cover;" />',
-                obj.image.url
+                preview_url(obj.image)
             )
         return "No image"
     image_preview.short_description = 'Preview'
@@ -80,7 +85,7 @@ class ConstructionUpdateInline(admin.TabularInline):
         if obj.image:
             return format_html(
                 '<img src="{}" width="60" height="40" style="border-radius: 4px; object-fit: cover;" />',
-                obj.image.url
+                preview_url(obj.image)
             )
         return "No image"
     image_preview.short_description = 'Preview'
@@ -114,7 +119,7 @@ class ProjectAmenityImageInline(admin.TabularInline):
         if obj.image:
             return format_html(
                 '<img src="{}" width="60" height="40" style="border-radius: 4px; object-fit: cover;" />',
-                obj.image.url
+                preview_url(obj.image)
             )
         return "No image"
     image_preview.short_description = 'Preview'
@@ -122,7 +127,7 @@ class ProjectAmenityImageInline(admin.TabularInline):
 
 # Main Admin Classes
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = (
         'project_thumbnail', 'name', 'project_by', 'city', 'status_badge', 
         'bhk', 'formatted_price', 'views', 'feature_badges', 'edit_button', 'is_active', 'created_at'
@@ -139,8 +144,16 @@ class ProjectAdmin(admin.ModelAdmin):
     filter_horizontal = ('tags', 'amenities')
     list_per_page = 25
     list_max_show_all = 100
-    list_select_related = ('city', 'category', 'project_type')
-    prefetch_related = ('tags', 'amenities')  # Optimize feature badges query
+    list_select_related = ('city',)
+    # Columns read by list_display; the change form still loads full rows
+    changelist_fields = (
+        'id', 'name', 'project_by', 'banner_image', 'status', 'bhk', 'onwards_price', 'views',
+        'is_featured', 'is_most_viewed', 'is_hot_deal', 'is_premium_listing', 'is_editors_choice',
+        'is_nearby_property', 'is_recently_viewed', 'trending_tag', 'is_active', 'created_at',
+        'city__name', 'city__state',
+    )
+    # One query per list filter over related models on top of the list itself
+    changelist_query_budget = 16
     
     # Enable bulk actions and checkboxes
     actions_on_top = True
@@ -151,6 +164,16 @@ class ProjectAdmin(admin.ModelAdmin):
     def get_list_display(self, request):
         return super().get_list_display(request)
     
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name == 'Projects_project_changelist':
+            queryset = queryset.only(*self.changelist_fields).prefetch_related(
+                # Feature badges read the tags of every row
+                Prefetch('tags', queryset=Tag.objects.only('id', 'name', 'color')),
+            )
+        return queryset
+    
     class Media:
         css = {
             'all': ('css/admin_custom.css',)
@@ -161,7 +184,7 @@ class ProjectAdmin(admin.ModelAdmin):
         if obj.banner_image:
             return format_html(
                 '<img src="{}" width="300" height="200" style="border-radius: 8px; object-fit: cover; box-shadow: 0 3px 8px rgba(0,0,0,0.15);" />',
-                obj.banner_image.url
+                preview_url(obj.banner_image, 'card')
             )
         return format_html('<div style="width:300px;height:200px;background:#f0f0f0;border-radius:8px;display:flex;align-items:center;justify-content:center;font-size:16px;color:#666;">No Image</div>')
     project_thumbnail.short_description = '🖼️ Image'
@@ -225,12 +248,13 @@ class ProjectAdmin(admin.ModelAdmin):
             trend_class = f'badge-trend-{obj.trending_tag.replace("_", "-")}'
             badges.append(f'<span class="badge {trend_class}">🎯 {obj.get_trending_tag_display()}</span>')
         
-        # Tags from ManyToMany field
-        for tag in obj.tags.all()[:3]:  # Limit to first 3 tags to avoid overcrowding
+        # Tags from ManyToMany field (prefetched by get_queryset)
+        tags = list(obj.tags.all())
+        for tag in tags[:3]:  # Limit to first 3 tags to avoid overcrowding
             badges.append(f'<span class="badge badge-tag" style="background-color: {tag.color};">🏷️ {tag.name}</span>')
         
-        if obj.tags.count() > 3:
-            badges.append(f'<span class="badge badge-more">+{obj.tags.count() - 3} more</span>')
+        if len(tags) > 3:
+            badges.append(f'<span class="badge badge-more">+{len(tags) - 3} more</span>')
         
         if badges:
             html_content = f'<div class="feature-badges-container">{"".join(badges)}</div>'
@@ -243,7 +267,7 @@ class ProjectAdmin(admin.ModelAdmin):
         if obj.banner_image:
             return format_html(
                 '<img src="{}" style="max-width: 300px; max-height: 200px; border-radius: 8px;" />',
-                obj.banner_image.url
+                preview_url(obj.banner_image, 'card')
             )
         return "No banner image"
     project_preview.short_description = 'Project Banner Preview'
@@ -317,7 +341,7 @@ class ProjectAdmin(admin.ModelAdmin):
 
 # Continue with other admin classes...
 @admin.register(City)
-class CityAdmin(admin.ModelAdmin):
+class CityAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('city_icon', 'name', 'state', 'country', 'project_count', 'status_badge', 'created_at')
     list_display_links = ('city_icon', 'name')
     list_filter = ('country', 'state', 'is_active', 'created_at')
@@ -356,9 +380,13 @@ class CityAdmin(admin.ModelAdmin):
         return format_html('<span style="background-color: #dc3545; color: white; padding: 2px 8px; border-radius: 12px; font-size: 11px;">Inactive</span>')
     status_badge.short_description = '📊 Status'
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(project_total=Count('projects'))
+    
     def project_count(self, obj):
-        return obj.projects.count()
+        return obj.project_total
     project_count.short_description = 'Projects'
+    project_count.admin_order_field = 'project_total'
     
     def icon_preview(self, obj):
         if obj.icon:
@@ -371,7 +399,7 @@ class CityAdmin(admin.ModelAdmin):
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('name', 'project_count', 'project_type_count', 'created_at')
     search_fields = ('name', 'description', 'keywords')
     readonly_fields = ('created_at',)
@@ -392,21 +420,31 @@ class CategoryAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            # distinct: the two joins multiply each other's rows
+            project_total=Count('projects', distinct=True),
+            project_type_total=Count('project_types', distinct=True),
+        )
+    
     def project_count(self, obj):
-        return obj.projects.count()
+        return obj.project_total
     project_count.short_description = 'Projects'
+    project_count.admin_order_field = 'project_total'
     
     def project_type_count(self, obj):
-        return obj.project_types.count()
+        return obj.project_type_total
     project_type_count.short_description = 'Project Types'
+    project_type_count.admin_order_field = 'project_type_total'
 
 
 @admin.register(ProjectType)
-class ProjectTypeAdmin(admin.ModelAdmin):
+class ProjectTypeAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('name', 'category', 'project_count', 'created_at')
     list_filter = ('category', 'created_at')
     search_fields = ('name', 'category__name', 'description', 'keywords')
     readonly_fields = ('created_at',)
+    list_select_related = ('category',)
     
     fieldsets = (
         ('🏠 Basic Information', {
@@ -424,13 +462,17 @@ class ProjectTypeAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(project_total=Count('projects'))
+    
     def project_count(self, obj):
-        return obj.projects.count()
+        return obj.project_total
     project_count.short_description = 'Projects'
+    project_count.admin_order_field = 'project_total'
 
 
 @admin.register(Tag)
-class TagAdmin(admin.ModelAdmin):
+class TagAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('tag_preview', 'name', 'project_count', 'status_badge', 'created_at')
     list_display_links = ('tag_preview', 'name')
     list_filter = ('is_active', 'created_at')
@@ -450,13 +492,17 @@ class TagAdmin(admin.ModelAdmin):
         return format_html('<span style="background-color: #dc3545; color: white; padding: 2px 8px; border-radius: 12px; font-size: 11px;">Inactive</span>')
     status_badge.short_description = '📊 Status'
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(project_total=Count('projects'))
+    
     def project_count(self, obj):
-        return obj.projects.count()
+        return obj.project_total
     project_count.short_description = 'Projects'
+    project_count.admin_order_field = 'project_total'
 
 
 @admin.register(Amenity)
-class AmenityAdmin(admin.ModelAdmin):
+class AmenityAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('amenity_icon', 'name', 'project_count', 'status_badge', 'created_at')
     list_display_links = ('amenity_icon', 'name')
     list_filter = ('is_active', 'created_at')
@@ -495,9 +541,13 @@ class AmenityAdmin(admin.ModelAdmin):
         return format_html('<span style="background-color: #dc3545; color: white; padding: 2px 8px; border-radius: 12px; font-size: 11px;">Inactive</span>')
     status_badge.short_description = '📊 Status'
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(project_total=Count('projects'))
+    
     def project_count(self, obj):
-        return obj.projects.count()
+        return obj.project_total
     project_count.short_description = 'Projects'
+    project_count.admin_order_field = 'project_total'
     
     def icon_preview(self, obj):
         if obj.icon:
@@ -511,13 +561,13 @@ class AmenityAdmin(admin.ModelAdmin):
 
 # Register all other models with basic admin
 @admin.register(ProjectOverview)
-class ProjectOverviewAdmin(admin.ModelAdmin):
+class ProjectOverviewAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('project', 'title')
     search_fields = ('project__name', 'title')
 
 
 @admin.register(GalleryImage)
-class GalleryImageAdmin(admin.ModelAdmin):
+class GalleryImageAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('image_thumbnail', 'project', 'caption', 'order', 'status_badge', 'uploaded_at')
     list_display_links = ('image_thumbnail', 'caption')
     list_filter = ('is_active', 'uploaded_at', 'project')
@@ -528,7 +578,7 @@ class GalleryImageAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" width="60" height="40" style="border-radius: 4px; object-fit: cover;" />',
-                obj.image.url
+                preview_url(obj.image)
             )
         return "No image"
     image_thumbnail.short_description = '🖼️ Thumbnail'
@@ -543,14 +593,14 @@ class GalleryImageAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-width: 300px; max-height: 200px; border-radius: 8px;" />',
-                obj.image.url
+                preview_url(obj.image, 'card')
             )
         return "No image uploaded"
     image_preview.short_description = 'Image Preview'
 
 
 @admin.register(FloorPlan)
-class FloorPlanAdmin(admin.ModelAdmin):
+class FloorPlanAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('plan_thumbnail', 'project', 'name', 'area', 'formatted_price', 'order', 'status_badge')
     list_display_links = ('plan_thumbnail', 'name')
     list_filter = ('is_active', 'project')
@@ -561,7 +611,7 @@ class FloorPlanAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" width="60" height="40" style="border-radius: 4px; object-fit: cover;" />',
-                obj.image.url
+                preview_url(obj.image)
             )
         return "No image"
     plan_thumbnail.short_description = '📐 Plan'
@@ -591,21 +641,21 @@ class FloorPlanAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-width: 400px; max-height: 300px; border-radius: 8px;" />',
-                obj.image.url
+                preview_url(obj.image, 'card')
             )
         return "No floor plan image uploaded"
     image_preview.short_description = 'Floor Plan Preview'
 
 
 @admin.register(NearestArea)
-class NearestAreaAdmin(admin.ModelAdmin):
+class NearestAreaAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('project', 'name', 'area_type', 'distance')
     list_filter = ('area_type', 'project')
     search_fields = ('project__name', 'name')
 
 
 @admin.register(ConstructionUpdate)
-class ConstructionUpdateAdmin(admin.ModelAdmin):
+class ConstructionUpdateAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('project', 'title', 'update_date', 'order')
     list_filter = ('update_date', 'project')
     search_fields = ('project__name', 'title')
@@ -613,14 +663,14 @@ class ConstructionUpdateAdmin(admin.ModelAdmin):
 
 
 @admin.register(WhyChooseUs)
-class WhyChooseUsAdmin(admin.ModelAdmin):
+class WhyChooseUsAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('project', 'title', 'icon', 'order')
     list_filter = ('project',)
     search_fields = ('project__name', 'title')
 
 
 @admin.register(SpecificationCategory)
-class SpecificationCategoryAdmin(admin.ModelAdmin):
+class SpecificationCategoryAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('name', 'order', 'item_count', 'status_badge')
     list_filter = ('is_active',)
     search_fields = ('name',)
@@ -632,20 +682,24 @@ class SpecificationCategoryAdmin(admin.ModelAdmin):
         return format_html('<span style="background-color: #dc3545; color: white; padding: 2px 8px; border-radius: 12px; font-size: 11px;">Inactive</span>')
     status_badge.short_description = '📊 Status'
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(item_total=Count('items'))
+    
     def item_count(self, obj):
-        return obj.items.count()
+        return obj.item_total
     item_count.short_description = 'Items'
+    item_count.admin_order_field = 'item_total'
 
 
 @admin.register(SpecificationItem)
-class SpecificationItemAdmin(admin.ModelAdmin):
+class SpecificationItemAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('project', 'category', 'name', 'order')
     list_filter = ('category', 'project')
     search_fields = ('project__name', 'name', 'description')
 
 
 @admin.register(ProjectAmenityImage)
-class ProjectAmenityImageAdmin(admin.ModelAdmin):
+class ProjectAmenityImageAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('image_thumbnail', 'project', 'amenity_name', 'status_badge', 'uploaded_at')
     list_display_links = ('image_thumbnail', 'amenity_name')
     list_filter = ('is_active', 'uploaded_at', 'project')
@@ -656,7 +710,7 @@ class ProjectAmenityImageAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" width="60" height="40" style="border-radius: 4px; object-fit: cover;" />',
-                obj.image.url
+                preview_url(obj.image)
             )
         return "No image"
     image_thumbnail.short_description = '🖼️ Thumbnail'
@@ -671,19 +725,21 @@ class ProjectAmenityImageAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-width: 300px; max-height: 200px; border-radius: 8px;" />',
-                obj.image.url
+                preview_url(obj.image, 'card')
             )
         return "No image uploaded"
     image_preview.short_description = 'Image Preview'
 
 
 @admin.register(FloorPlanAccess)
-class FloorPlanAccessAdmin(admin.ModelAdmin):
-    list_display = ('project', 'name', 'email', 'phone', 'accessed_at', 'access_count')
+class FloorPlanAccessAdmin(LeadContactMixin, QueryBudgetMixin, admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
+    list_display = ('project', 'name', 'email', 'phone', 'accessed_at', 'access_count', 'contact_leads')
     list_display_links = ('name', 'email')
     list_filter = ('accessed_at', 'project')
     search_fields = ('project__name', 'name', 'email', 'phone')
     readonly_fields = ('ip_address', 'user_agent', 'accessed_at')
+    list_select_related = ('project',)
     date_hierarchy = 'accessed_at'
     ordering = ('-accessed_at',)
     
@@ -701,19 +757,60 @@ class FloorPlanAccessAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        # Accesses per (project, email) as a correlated subquery, served by
+        # the (project, email) index
+        same_visitor = (
+            FloorPlanAccess.objects.filter(project=OuterRef('project'), email=OuterRef('email'))
+            .order_by().values('project').annotate(total=Count('id')).values('total')
+        )
+        return super().get_queryset(request).annotate(
+            access_total=Coalesce(Subquery(same_visitor, output_field=IntegerField()), 0)
+        )
+    
     def access_count(self, obj):
-        count = FloorPlanAccess.objects.filter(project=obj.project, email=obj.email).count()
         return format_html(
             '<span style="background-color: #007bff; color: white; padding: 2px 8px; border-radius: 12px; font-size: 11px;">{} times</span>',
-            count
+            obj.access_total
         )
     access_count.short_description = '🔄 Access Count'
+    access_count.admin_order_field = 'access_total'
     
     def has_add_permission(self, request):
         # Usually floor plan access records are created through the website
         return False
 
 
+@admin.register(ProjectInquiry)
+class ProjectInquiryAdmin(LeadContactMixin, QueryBudgetMixin, admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
+    list_display = ('project', 'name', 'email', 'phone', 'interest', 'created_at', 'contact_leads')
+    list_display_links = ('name', 'email')
+    list_filter = ('created_at', 'project')
+    search_fields = ('project__name', 'name', 'email', 'phone')
+    readonly_fields = ('ip_address', 'user_agent', 'created_at')
+    list_select_related = ('project',)
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
+    
+    fieldsets = (
+        ('📞 Contact Information', {
+            'fields': ('project', 'name', 'email', 'phone')
+        }),
+        ('💬 Inquiry', {
+            'fields': ('interest', 'message'),
+        }),
+        ('🔍 Technical Details', {
+            'fields': ('ip_address', 'user_agent', 'created_at'),
+            'classes': ('collapse',)
+        }),
+    )
+    
+    def has_add_permission(self, request):
+        # Inquiries come from the project detail page
+        return False
+
+
 # Jazzmin Admin Site Configuration
 admin.site.site_header = "VeloCity"
 admin.site.site_title = "VeloCity"
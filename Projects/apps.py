@@ -9,3 +9,4 @@ class ProjectsConfig(AppConfig):
     def ready(self):
         # Import admin here to ensure all models are registered
         from . import admin
+        from . import signals
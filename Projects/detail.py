@@ -0,0 +1,93 @@
+"""
+Loader for the public project detail page.
+
+Fetches a project with every child collection the detail template shows
+in a fixed number of queries, independent of how many gallery images,
+floor plans, updates etc. the project has. Collections are attached as
+plain lists so the template never goes back to the database.
+"""
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+
+from .models import (
+    Project, Amenity, GalleryImage, FloorPlan, NearestArea, ConstructionUpdate,
+    WhyChooseUs, SpecificationItem, ProjectAmenityImage, RelatedProject,
+)
+
+
+RELATED_PROJECTS_LIMIT = 4
+
+
+def detail_prefetches():
+    """Prefetch objects for each displayed collection, filtered and ordered"""
+    return [
+        Prefetch(
+            'gallery_images',
+            queryset=GalleryImage.objects.filter(is_active=True).order_by('order', 'uploaded_at'),
+            to_attr='active_gallery_images',
+        ),
+        Prefetch(
+            'floor_plans',
+            queryset=FloorPlan.objects.filter(is_active=True).order_by('order', 'name'),
+            to_attr='active_floor_plans',
+        ),
+        Prefetch(
+            'nearest_areas',
+            queryset=NearestArea.objects.order_by('area_type', 'name'),
+            to_attr='nearest_area_list',
+        ),
+        Prefetch(
+            'construction_updates',
+            queryset=ConstructionUpdate.objects.order_by('-update_date', 'order'),
+            to_attr='construction_update_list',
+        ),
+        Prefetch(
+            'why_choose_us',
+            queryset=WhyChooseUs.objects.order_by('order', 'title'),
+            to_attr='why_choose_us_list',
+        ),
+        Prefetch(
+            'specifications',
+            queryset=SpecificationItem.objects.filter(category__is_active=True)
+            .select_related('category').order_by('category__order', 'order', 'name'),
+            to_attr='specification_list',
+        ),
+        Prefetch(
+            'amenities',
+            queryset=Amenity.objects.filter(is_active=True).order_by('name'),
+            to_attr='active_amenities',
+        ),
+        Prefetch(
+            'amenity_images',
+            queryset=ProjectAmenityImage.objects.filter(is_active=True).order_by('amenity_name', 'uploaded_at'),
+            to_attr='active_amenity_images',
+        ),
+    ]
+
+
+def load_project_detail(project_id):
+    """Active project with its detail collections; raises Http404 if missing"""
+    return get_object_or_404(
+        Project.objects.filter(is_active=True)
+        .select_related('city', 'category', 'project_type', 'overview')
+        .prefetch_related(*detail_prefetches()),
+        id=project_id,
+    )
+
+
+def related_projects(project, limit=RELATED_PROJECTS_LIMIT):
+    """Top precomputed matches; falls back to same category (or city) until built"""
+    related = [
+        entry.related for entry in
+        RelatedProject.objects.filter(project_id=project.id, related__is_active=True)
+        .select_related('related').order_by('rank')[:limit]
+    ]
+    if related:
+        return related
+
+    projects = Project.objects.filter(is_active=True).exclude(id=project.id)
+    if project.category_id:
+        projects = projects.filter(category_id=project.category_id)
+    elif project.city_id:
+        projects = projects.filter(city_id=project.city_id)
+    return list(projects[:limit])
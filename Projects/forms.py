@@ -1,4 +1,8 @@
 from django import forms
+from django.db import transaction
+from django.utils import timezone
+
+from theme.content_cache import bump_content_version, project_content
 from .models import (
     Project, City, Category, ProjectType, Tag, Amenity,
     ProjectOverview, GalleryImage, NearestArea, FloorPlan,
@@ -145,61 +149,113 @@ class ProjectForm(forms.ModelForm):
         instance = super().save(commit=False)
         
         if commit:
-            instance.save()
-            
-            # Save many-to-many relationships
-            self.save_m2m()
-            
-            # Handle project overview
-            if self.cleaned_data.get('overview_title') or self.cleaned_data.get('overview_description'):
-                ProjectOverview.objects.update_or_create(
-                    project=instance,
-                    defaults={
-                        'title': self.cleaned_data.get('overview_title', ''),
-                        'short_description': self.cleaned_data.get('overview_description', '')
-                    }
-                )
-            
-            # Handle nearest areas
-            if self.cleaned_data.get('nearest_areas'):
-                # Clear existing nearest areas
-                NearestArea.objects.filter(project=instance).delete()
+            # All or nothing: a failure part way leaves the project as it was
+            with transaction.atomic():
+                instance.save()
                 
-                areas = [area.strip() for area in self.cleaned_data['nearest_areas'].split(',') if area.strip()]
-                for i, area in enumerate(areas):
-                    if ' - ' in area:
-                        place, distance = area.split(' - ', 1)
-                        NearestArea.objects.create(
-                            project=instance,
-                            place=place.strip(),
-                            distance=distance.strip(),
-                            order=i + 1
-                        )
-            
-            # Handle construction updates
-            if self.cleaned_data.get('construction_updates'):
-                # Clear existing construction updates
-                ConstructionUpdate.objects.filter(project=instance).delete()
+                # Save many-to-many relationships
+                self.save_m2m()
                 
-                updates = [update.strip() for update in self.cleaned_data['construction_updates'].split(',') if update.strip()]
-                for i, update in enumerate(updates):
-                    ConstructionUpdate.objects.create(
+                # Handle project overview
+                if self.cleaned_data.get('overview_title') or self.cleaned_data.get('overview_description'):
+                    ProjectOverview.objects.update_or_create(
                         project=instance,
-                        update=update,
-                        order=i + 1
+                        defaults={
+                            'title': self.cleaned_data.get('overview_title', ''),
+                            'short_description': self.cleaned_data.get('overview_description', '')
+                        }
                     )
-            
-            # Handle why choose us points
-            if self.cleaned_data.get('why_choose_us'):
-                # Clear existing why choose us points
-                WhyChooseUs.objects.filter(project=instance).delete()
                 
-                points = [point.strip() for point in self.cleaned_data['why_choose_us'].split(',') if point.strip()]
-                for i, point in enumerate(points):
-                    WhyChooseUs.objects.create(
-                        project=instance,
-                        point=point,
-                        order=i + 1
-                    )
+                # Handle nearest areas ("School - 2 km, Metro - 500 m")
+                if self.cleaned_data.get('nearest_areas'):
+                    areas = []
+                    for area in split_entries(self.cleaned_data['nearest_areas']):
+                        name, _, distance = area.partition(' - ')
+                        areas.append({
+                            'name': name.strip()[:200],
+                            'distance': distance.strip()[:50],
+                            'area_type': guess_area_type(name),
+                        })
+                    sync_children(instance, NearestArea, 'name', areas, update_fields=['distance'])
+                
+                # Handle construction updates
+                if self.cleaned_data.get('construction_updates'):
+                    updates = [
+                        {'title': update[:200], 'order': i + 1, 'update_date': timezone.localdate()}
+                        for i, update in enumerate(split_entries(self.cleaned_data['construction_updates']))
+                    ]
+                    sync_children(instance, ConstructionUpdate, 'title', updates, update_fields=['order'])
+                
+                # Handle why choose us points
+                if self.cleaned_data.get('why_choose_us'):
+                    points = [
+                        {'title': point[:200], 'order': i + 1}
+                        for i, point in enumerate(split_entries(self.cleaned_data['why_choose_us']))
+                    ]
+                    sync_children(instance, WhyChooseUs, 'title', points, update_fields=['order'])
+            
+            # Bulk writes send no signals; invalidate the cached detail page
+            # once the new rows are visible
+            project_id = instance.pk
+            transaction.on_commit(lambda: bump_content_version(project_content(project_id)))
         
         return instance
+
+
+def split_entries(value):
+    """Comma separated form input -> stripped, non-empty entries"""
+    return [entry.strip() for entry in value.split(',') if entry.strip()]
+
+
+def guess_area_type(name):
+    """Map a free-text place name to a NearestArea.area_type"""
+    lowered = name.lower()
+    for area_type, label in NearestArea.AREA_TYPES:
+        if area_type != 'other' and (area_type.replace('_', ' ') in lowered or label.lower() in lowered):
+            return area_type
+    return 'other'
+
+
+def sync_children(project, model, key, entries, update_fields):
+    """
+    Make project's `model` rows match `entries` (dicts of field values).
+
+    Rows are matched on `key` (case-insensitively). Matched rows get
+    `update_fields` refreshed with one bulk_update, new entries are added
+    with one bulk_create and rows no longer listed are deleted, as are
+    all but the oldest of rows sharing a key, so the cost does not grow
+    with the number of rows. Call inside a transaction.
+    """
+    existing, stale = {}, []
+    for row in model.objects.filter(project=project).order_by('pk'):
+        lookup = getattr(row, key).lower()
+        if lookup in existing:
+            stale.append(row.pk)
+        else:
+            existing[lookup] = row
+    wanted = {}
+    for entry in entries:
+        if entry[key]:
+            wanted[entry[key].lower()] = entry
+
+    to_create, to_update = [], []
+    for lookup, entry in wanted.items():
+        row = existing.get(lookup)
+        if row is None:
+            to_create.append(model(project=project, **entry))
+            continue
+        changed = False
+        for field in update_fields + [key]:
+            if getattr(row, field) != entry[field]:
+                setattr(row, field, entry[field])
+                changed = True
+        if changed:
+            to_update.append(row)
+
+    stale += [row.pk for lookup, row in existing.items() if lookup not in wanted]
+    if stale:
+        model.objects.filter(pk__in=stale).delete()
+    if to_update:
+        model.objects.bulk_update(to_update, update_fields + [key])
+    if to_create:
+        model.objects.bulk_create(to_create)
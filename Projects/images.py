@@ -0,0 +1,214 @@
+"""
+Responsive image derivatives for project media.
+
+Every uploaded project image gets fixed-width variants (VARIANTS) in WebP
+and JPEG, stored next to the original as ``<name>.<ext>__<variant>.<ext>``
+(the source extension is kept so ``a.jpg`` and ``a.png`` don't collide).
+Variants wider than the source are not written: the set stops at the
+first variant at least as wide as the original, which is kept at the
+source width. Once a set is written the job records the source name and
+width in the model's ``<field>_variants`` and ``<field>_width`` columns,
+so checking for derivatives never touches storage.
+Browsers that support WebP pick it from the <picture> source; everything
+else falls back to the JPEG. Templates use the ``responsive_image`` tag
+from theme's image_tags library, which falls back to the original upload
+for images that have no derivatives yet.
+"""
+import logging
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from theme.content_cache import HOME_CONTENT, SEARCH_CONTENT, bump_content_version, project_content
+
+
+logger = logging.getLogger(__name__)
+
+# Variant name -> target width in pixels
+VARIANTS = {
+    'thumb': 160,
+    'card': 480,
+    'hero': 1280,
+    'full': 1920,
+}
+
+# Format -> (extension, Pillow save options)
+FORMATS = {
+    'webp': ('webp', {'format': 'WEBP', 'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# (model label, image field) pairs that get derivatives
+IMAGE_FIELDS = [
+    ('Projects.Project', 'banner_image'),
+    ('Projects.GalleryImage', 'image'),
+    ('Projects.FloorPlan', 'image'),
+    ('Projects.ConstructionUpdate', 'image'),
+    ('Projects.ProjectAmenityImage', 'image'),
+]
+
+
+# Pillow errors that mean the upload itself is bad; retrying can't help
+BAD_IMAGE_ERRORS = (UnidentifiedImageError, Image.DecompressionBombError)
+
+
+def derivative_name(name, variant, fmt):
+    return f'{name}__{variant}.{FORMATS[fmt][0]}'
+
+
+def variants_field(fieldfile):
+    return f'{fieldfile.field.name}_variants'
+
+
+def width_field(fieldfile):
+    return f'{fieldfile.field.name}_width'
+
+
+def generated_variants(source_width):
+    """(variant, width) pairs written for a source this wide, narrowest first"""
+    generated = []
+    for variant, width in sorted(VARIANTS.items(), key=lambda item: item[1]):
+        generated.append((variant, min(width, source_width)))
+        if width >= source_width:
+            break
+    return generated
+
+
+def has_derivatives(fieldfile):
+    # Only for the file the variants were made from, not a replacement
+    return (
+        bool(fieldfile)
+        and getattr(fieldfile.instance, variants_field(fieldfile), None) == fieldfile.name
+        and bool(getattr(fieldfile.instance, width_field(fieldfile), None))
+    )
+
+
+def mark_derivatives(fieldfile, source_width):
+    """Record on the row that `fieldfile` has its variants, and expire cached pages showing it"""
+    instance = fieldfile.instance
+    values = {variants_field(fieldfile): fieldfile.name, width_field(fieldfile): source_width}
+    # update() keeps the save signals (and another processing job) out of
+    # it, so the page caches have to be bumped here
+    type(instance)._default_manager.filter(pk=instance.pk).update(**values)
+    for field, value in values.items():
+        setattr(instance, field, value)
+    if instance._meta.label == 'Projects.Project':
+        bump_content_version(HOME_CONTENT)
+        bump_content_version(SEARCH_CONTENT)
+        bump_content_version(project_content(instance.pk))
+    else:
+        bump_content_version(project_content(instance.project_id))
+
+
+def _resize(image, width):
+    if image.width <= width:
+        return image
+    height = round(image.height * width / image.width)
+    return image.resize((width, height), Image.LANCZOS)
+
+
+# Pillow format -> save options when re-encoding an original
+REENCODE_OPTIONS = {
+    'JPEG': {'quality': 90, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 90},
+}
+
+
+def strip_metadata(fieldfile):
+    """
+    Re-encode an original upload in place without EXIF/metadata.
+
+    Orientation is baked into the pixels first. Formats not listed in
+    REENCODE_OPTIONS are left untouched. Returns the (possibly new) name.
+    """
+    storage = fieldfile.storage
+    with fieldfile.open('rb') as source:
+        image = Image.open(source)
+        fmt = image.format
+        if fmt not in REENCODE_OPTIONS:
+            return fieldfile.name
+        image = ImageOps.exif_transpose(image)
+        if fmt == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        buffer = BytesIO()
+        image.save(buffer, format=fmt, **REENCODE_OPTIONS[fmt])
+    name = fieldfile.name
+    storage.delete(name)
+    return storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def generate_derivatives(fieldfile):
+    """
+    Write the variants of an uploaded image; returns the source width.
+
+    EXIF orientation is applied and all metadata dropped. Images are never
+    upscaled: see generated_variants() for which variants get written.
+    """
+    storage = fieldfile.storage
+    with fieldfile.open('rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+
+    for variant, width in generated_variants(image.width):
+        resized = _resize(image, width)
+        for fmt in ('webp', 'jpeg'):
+            buffer = BytesIO()
+            resized.save(buffer, **FORMATS[fmt][1])
+            name = derivative_name(fieldfile.name, variant, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+    return image.width
+
+
+def ensure_derivatives(fieldfile):
+    """Generate derivatives unless they already exist; never raises on bad images"""
+    if not fieldfile or has_derivatives(fieldfile) or not fieldfile.storage.exists(fieldfile.name):
+        return False
+    try:
+        source_width = generate_derivatives(fieldfile)
+    except (OSError, ValueError, *BAD_IMAGE_ERRORS):
+        logger.warning('Could not generate derivatives for %s', fieldfile.name, exc_info=True)
+        return False
+    mark_derivatives(fieldfile, source_width)
+    return True
+
+
+def delete_derivatives(fieldfile):
+    if not fieldfile:
+        return
+    for variant in VARIANTS:
+        for fmt in FORMATS:
+            name = derivative_name(fieldfile.name, variant, fmt)
+            if fieldfile.storage.exists(name):
+                fieldfile.storage.delete(name)
+
+
+def _generated(fieldfile):
+    return generated_variants(getattr(fieldfile.instance, width_field(fieldfile)))
+
+
+def variant_url(fieldfile, variant, fmt='jpeg'):
+    """URL of `variant`, or of the widest one written when the source is narrower"""
+    generated = [name for name, _ in _generated(fieldfile)]
+    if variant not in generated:
+        variant = generated[-1]
+    return fieldfile.storage.url(derivative_name(fieldfile.name, variant, fmt))
+
+
+def preview_url(fieldfile, variant='thumb'):
+    """JPEG variant when available, else the original (admin previews)"""
+    if has_derivatives(fieldfile):
+        return variant_url(fieldfile, variant)
+    return fieldfile.url
+
+
+def srcset(fieldfile, fmt):
+    """``url 160w, url 480w, ...`` over the variants written, at their real widths"""
+    return ', '.join(
+        f'{fieldfile.storage.url(derivative_name(fieldfile.name, variant, fmt))} {width}w'
+        for variant, width in _generated(fieldfile)
+    )
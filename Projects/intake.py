@@ -0,0 +1,68 @@
+"""
+Shared ingestion for the project detail page's JSON lead endpoints
+(floor plan access and project inquiry).
+
+Both accept JSON (or form-encoded) name/email/phone plus their own
+optional fields, validate the contact details the same way and store one
+row with the visitor's IP and user agent.
+"""
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from theme.ratelimit import client_ip
+from theme.spool import save_lead
+
+
+class IntakeError(ValueError):
+    """Submission rejected; the message is shown to the visitor"""
+
+
+def read_payload(request):
+    """Request body as a dict of stripped strings"""
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            raise IntakeError('Invalid request format.')
+        if not isinstance(data, dict):
+            raise IntakeError('Invalid request format.')
+    else:
+        data = request.POST
+    return {key: str(value).strip() for key, value in data.items() if isinstance(value, (str, int, float))}
+
+
+def clean_contact(data):
+    """Validated name/email/phone; raises IntakeError"""
+    name, email, phone = data.get('name', ''), data.get('email', ''), data.get('phone', '')
+    if not name or not email or not phone:
+        raise IntakeError('Name, email, and phone are required fields.')
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise IntakeError('Please enter a valid email address.')
+    # Basic check; numbers are normalized for matching by theme.dedupe
+    if len(phone) < 10:
+        raise IntakeError('Please enter a valid phone number.')
+    return {'name': name[:100], 'email': email, 'phone': phone[:20]}
+
+
+def client_details(request):
+    return {'ip_address': client_ip(request), 'user_agent': request.META.get('HTTP_USER_AGENT', '')}
+
+
+def ingest(model, project, request, fields=()):
+    """
+    Validate a submission and store it as a `model` row for `project`.
+
+    `fields` names the optional extra values copied from the payload.
+    Returns the row, or None when leads are spooled (theme.spool).
+    Raises IntakeError for invalid input.
+    """
+    data = read_payload(request)
+    values = clean_contact(data)
+    for field in fields:
+        max_length = model._meta.get_field(field).max_length
+        values[field] = data.get(field, '')[:max_length] if max_length else data.get(field, '')
+    return save_lead(model, project_id=project.pk, **values, **client_details(request))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from Projects.recommendations import build_related_projects
+
+
+class Command(BaseCommand):
+    help = 'Recompute the related-projects table used by project detail pages'
+
+    def handle(self, *args, **options):
+        rows = build_related_projects()
+        self.stdout.write(self.style.SUCCESS(f'Stored {rows} related project entries.'))
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from Projects.view_counter import FLUSH_LOCK_KEY, flush_views
+
+
+class Command(BaseCommand):
+    help = (
+        'Write buffered project view counts to the database. Needs the cache '
+        'the web processes count in, i.e. a shared CACHE_URL such as redis://'
+    )
+
+    def handle(self, *args, **options):
+        # The same turn the request path takes, held for one flush interval
+        if not cache.add(FLUSH_LOCK_KEY, True, timeout=getattr(settings, 'PROJECT_VIEWS_FLUSH_INTERVAL', 60)):
+            self.stdout.write('Views were flushed within the last interval; nothing to do.')
+            return
+        written = flush_views()
+        self.stdout.write(self.style.SUCCESS(f'Flushed {written} project views.'))
@@ -0,0 +1,17 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from Projects.images import IMAGE_FIELDS, ensure_derivatives
+
+
+class Command(BaseCommand):
+    help = 'Create responsive image variants for project images uploaded before they existed'
+
+    def handle(self, *args, **options):
+        created = 0
+        for label, field in IMAGE_FIELDS:
+            model = apps.get_model(label)
+            for instance in model.objects.exclude(**{field: ''}).only('pk', field, f'{field}_variants', f'{field}_width').iterator():
+                if ensure_derivatives(getattr(instance, field)):
+                    created += 1
+        self.stdout.write(self.style.SUCCESS(f'Generated variants for {created} images.'))
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.2 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Projects', '0006_floorplanaccess'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='Projects.project')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='Projects.project')),
+            ],
+            options={
+                'verbose_name': 'Related Project',
+                'verbose_name_plural': 'Related Projects',
+                'ordering': ['project', 'rank'],
+                'indexes': [models.Index(fields=['project', 'rank'], name='Projects_re_project_5c0dc9_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedproject',
+            constraint=models.UniqueConstraint(fields=('project', 'related'), name='unique_related_project'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.2 on 2026-10-18 09:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Projects', '0008_lead_dedupe_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectInquiry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('phone', models.CharField(max_length=20)),
+                ('interest', models.CharField(blank=True, max_length=100)),
+                ('message', models.TextField(blank=True)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('user_agent', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('phone_key', models.CharField(blank=True, db_index=True, editable=False, max_length=32)),
+                ('email_key', models.CharField(blank=True, db_index=True, editable=False, max_length=32)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inquiries', to='Projects.project')),
+            ],
+            options={
+                'verbose_name': 'Project Inquiry',
+                'verbose_name_plural': 'Project Inquiries',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['project', 'created_at'], name='Projects_pr_project_754e43_idx'), models.Index(fields=['created_at'], name='Projects_pr_created_3e707c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+
+INTEREST_PREFIX = 'Interest: '
+MESSAGE_SEPARATOR = '\n\nMessage: '
+
+
+def split_message(text):
+    """Undo the 'Interest: ...\n\nMessage: ...' packing of the old inquiry endpoint"""
+    if not text.startswith(INTEREST_PREFIX):
+        return '', text
+    interest, _, message = text[len(INTEREST_PREFIX):].partition(MESSAGE_SEPARATOR)
+    return interest[:100], message
+
+
+def move_inquiries(apps, schema_editor):
+    """
+    Inquiries were stored as floor plan accesses with a message (the floor
+    plan gate sends none). Move them, and their Lead index rows, over.
+    """
+    FloorPlanAccess = apps.get_model('Projects', 'FloorPlanAccess')
+    ProjectInquiry = apps.get_model('Projects', 'ProjectInquiry')
+    Lead = apps.get_model('theme', 'Lead')
+    # Keep the original timestamps
+    ProjectInquiry._meta.get_field('created_at').auto_now_add = False
+
+    inquiries = FloorPlanAccess.objects.exclude(message__isnull=True).exclude(message='').order_by('pk')
+    for access in inquiries.iterator(chunk_size=500):
+        interest, message = split_message(access.message)
+        inquiry = ProjectInquiry.objects.create(
+            project_id=access.project_id, name=access.name, email=access.email, phone=access.phone,
+            interest=interest, message=message, ip_address=access.ip_address, user_agent=access.user_agent,
+            created_at=access.accessed_at, phone_key=access.phone_key, email_key=access.email_key,
+        )
+        Lead.objects.filter(source='floor_plan', object_id=access.pk).update(
+            source='project_inquiry', object_id=inquiry.pk,
+        )
+        access.delete()
+
+
+def restore_inquiries(apps, schema_editor):
+    FloorPlanAccess = apps.get_model('Projects', 'FloorPlanAccess')
+    ProjectInquiry = apps.get_model('Projects', 'ProjectInquiry')
+    Lead = apps.get_model('theme', 'Lead')
+    FloorPlanAccess._meta.get_field('accessed_at').auto_now_add = False
+
+    for inquiry in ProjectInquiry.objects.order_by('pk').iterator(chunk_size=500):
+        message = f'{INTEREST_PREFIX}{inquiry.interest}{MESSAGE_SEPARATOR}{inquiry.message}' if inquiry.interest else inquiry.message
+        access = FloorPlanAccess.objects.create(
+            project_id=inquiry.project_id, name=inquiry.name, email=inquiry.email, phone=inquiry.phone,
+            message=message, ip_address=inquiry.ip_address, user_agent=inquiry.user_agent,
+            accessed_at=inquiry.created_at, phone_key=inquiry.phone_key, email_key=inquiry.email_key,
+        )
+        Lead.objects.filter(source='project_inquiry', object_id=inquiry.pk).update(
+            source='floor_plan', object_id=access.pk,
+        )
+        inquiry.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Projects', '0009_project_inquiry'),
+        ('theme', '0015_project_inquiry'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_inquiries, restore_inquiries),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-18 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Projects', '0010_split_project_inquiries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='constructionupdate',
+            name='image_variants',
+            field=models.CharField(blank=True, editable=False, help_text='Image name the stored variants were made from', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='floorplan',
+            name='image_variants',
+            field=models.CharField(blank=True, editable=False, help_text='Image name the stored variants were made from', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_variants',
+            field=models.CharField(blank=True, editable=False, help_text='Image name the stored variants were made from', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='banner_image_variants',
+            field=models.CharField(blank=True, editable=False, help_text='Banner image name the stored variants were made from', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='projectamenityimage',
+            name='image_variants',
+            field=models.CharField(blank=True, editable=False, help_text='Image name the stored variants were made from', max_length=255),
+        ),
+    ]
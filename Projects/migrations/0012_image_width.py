@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-18 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Projects', '0011_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='constructionupdate',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Width in pixels of the image the variants were made from', null=True),
+        ),
+        migrations.AddField(
+            model_name='floorplan',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Width in pixels of the image the variants were made from', null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Width in pixels of the image the variants were made from', null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='banner_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Width in pixels of the banner image the variants were made from', null=True),
+        ),
+        migrations.AddField(
+            model_name='projectamenityimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Width in pixels of the image the variants were made from', null=True),
+        ),
+    ]
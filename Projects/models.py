@@ -160,6 +160,8 @@ class Project(models.Model):
     project_by = models.CharField(max_length=200, help_text="Company or Brand", blank=True, null=True)
     logo = models.ImageField(upload_to='project/logo/', blank=True, null=True)
     banner_image = models.ImageField(upload_to='project/banner/', blank=True, null=True)
+    banner_image_variants = models.CharField(max_length=255, blank=True, editable=False, help_text="Banner image name the stored variants were made from")
+    banner_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False, help_text="Width in pixels of the banner image the variants were made from")
     brochure = models.FileField(upload_to='project/brochure/', blank=True, null=True, help_text="PDF download")
     
     # Location & Details
@@ -239,9 +241,10 @@ class Project(models.Model):
         return f"{self.name} by {self.project_by}"
     
     def increment_views(self):
-        """Increment view count"""
+        """Increment view count (buffered, see Projects.view_counter)"""
+        from .view_counter import record_view
+        record_view(self.pk)
         self.views += 1
-        self.save(update_fields=['views'])
 
 
 class ProjectOverview(models.Model):
@@ -258,6 +261,8 @@ class GalleryImage(models.Model):
     """Multiple gallery images per project"""
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='gallery_images')
     image = models.ImageField(upload_to='project/gallery/')
+    image_variants = models.CharField(max_length=255, blank=True, editable=False, help_text="Image name the stored variants were made from")
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False, help_text="Width in pixels of the image the variants were made from")
     caption = models.CharField(max_length=200, blank=True)
     order = models.PositiveIntegerField(default=0, help_text="Display order")
     is_active = models.BooleanField(default=True)
@@ -330,6 +335,8 @@ class FloorPlan(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='floor_plans')
     name = models.CharField(max_length=100, help_text="e.g. 2BHK East Facing")
     image = models.ImageField(upload_to='project/floor_plans/')
+    image_variants = models.CharField(max_length=255, blank=True, editable=False, help_text="Image name the stored variants were made from")
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False, help_text="Width in pixels of the image the variants were made from")
     area = models.CharField(max_length=50, blank=True, help_text="e.g. 1200 sq ft")
     price = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)
     order = models.PositiveIntegerField(default=0)
@@ -347,6 +354,8 @@ class ConstructionUpdate(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='construction_updates')
     title = models.CharField(max_length=200, blank=True)
     image = models.ImageField(upload_to='project/construction_updates/')
+    image_variants = models.CharField(max_length=255, blank=True, editable=False, help_text="Image name the stored variants were made from")
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False, help_text="Width in pixels of the image the variants were made from")
     description = models.TextField(blank=True)
     update_date = models.DateField()
     order = models.PositiveIntegerField(default=0)
@@ -409,6 +418,8 @@ class ProjectAmenityImage(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='amenity_images')
     amenity_name = models.CharField(max_length=100, help_text="e.g. Swimming Pool, Gym, Clubhouse")
     image = models.ImageField(upload_to='project/amenities/', help_text="Upload amenity image")
+    image_variants = models.CharField(max_length=255, blank=True, editable=False, help_text="Image name the stored variants were made from")
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False, help_text="Width in pixels of the image the variants were made from")
     is_active = models.BooleanField(default=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
@@ -431,6 +442,9 @@ class FloorPlanAccess(models.Model):
     ip_address = models.GenericIPAddressField(blank=True, null=True)
     user_agent = models.TextField(blank=True, null=True)
     accessed_at = models.DateTimeField(auto_now_add=True)
+    # Hashed normalized phone/email for duplicate matching (theme.dedupe)
+    phone_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
+    email_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
     
     class Meta:
         ordering = ['-accessed_at']
@@ -449,3 +463,53 @@ class FloorPlanAccess(models.Model):
     def has_access(cls, project, email):
         """Check if user has already provided contact details for this project"""
         return cls.objects.filter(project=project, email=email).exists()
+
+
+class ProjectInquiry(models.Model):
+    """Enquiries sent from the contact form on a project detail page"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='inquiries')
+    name = models.CharField(max_length=100)
+    email = models.EmailField()
+    phone = models.CharField(max_length=20)
+    interest = models.CharField(max_length=100, blank=True)
+    message = models.TextField(blank=True)
+    ip_address = models.GenericIPAddressField(blank=True, null=True)
+    user_agent = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Hashed normalized phone/email for duplicate matching (theme.dedupe)
+    phone_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
+    email_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Project Inquiry"
+        verbose_name_plural = "Project Inquiries"
+        indexes = [
+            models.Index(fields=['project', 'created_at']),
+            models.Index(fields=['created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.project.name} - {self.name} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+class RelatedProject(models.Model):
+    """Precomputed "similar projects" for the detail page (see Projects.recommendations)"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    
+    class Meta:
+        ordering = ['project', 'rank']
+        verbose_name = "Related Project"
+        verbose_name_plural = "Related Projects"
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'related'], name='unique_related_project'),
+        ]
+        indexes = [
+            models.Index(fields=['project', 'rank']),
+        ]
+    
+    def __str__(self):
+        return f"{self.project.name} -> {self.related.name} ({self.score:.2f})"
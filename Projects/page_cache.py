@@ -0,0 +1,63 @@
+"""
+Whole-page cache for public project detail pages.
+
+Anonymous GET requests without a query string are served from a rendered
+copy tagged with the project's content version (bumped by theme.signals when
+the project or any of its children change), the shared detail-page version
+and the SiteConfig version. When those change, one request re-renders the
+page while concurrent visitors get the previous copy (get_or_build).
+Nothing visitor-specific is rendered into the page: the CSRF token is a
+placeholder swapped in per response, and the floor plan gate and view
+counting go through the project_visit endpoint.
+"""
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+from theme.content_cache import PROJECT_DETAIL_CONTENT, get_content_version, get_or_build, project_content
+from theme.models import SITE_CONFIG_CONTENT
+
+
+# Edits invalidate a page immediately; this only bounds how stale the
+# related-projects cards (other projects' rows) can get.
+PROJECT_PAGE_TIMEOUT = 60 * 15
+
+CSRF_PLACEHOLDER = 'csrf-token-placeholder-7f3a91c2'
+
+
+def is_cacheable(request):
+    return (
+        request.method == 'GET'
+        and not request.GET
+        and not request.user.is_authenticated
+    )
+
+
+def page_cache_key(request, project_id):
+    return f'project_page:{project_id}:{request.get_host()}'
+
+
+def page_version(project_id):
+    return ':'.join(
+        str(get_content_version(namespace))
+        for namespace in (project_content(project_id), PROJECT_DETAIL_CONTENT, SITE_CONFIG_CONTENT)
+    )
+
+
+def cached_page(request, project_id, render_page):
+    """The anonymous page, rendered by render_page() when the cached copy is stale"""
+    def build():
+        response = render_page()
+        return response.content.decode(response.charset)
+
+    content = get_or_build(
+        page_cache_key(request, project_id), build, PROJECT_PAGE_TIMEOUT, version=page_version(project_id),
+    )
+    return finish_response(request, HttpResponse(content))
+
+
+def finish_response(request, response):
+    """Swap this visitor's CSRF token into a page rendered with the placeholder"""
+    response.content = response.content.replace(
+        CSRF_PLACEHOLDER.encode(), get_token(request).encode()
+    )
+    return response
@@ -0,0 +1,103 @@
+"""
+Precomputed related-project recommendations.
+
+build_related_projects() scores every pair of active projects on shared
+category, city, project type, price band, BHK configurations and amenities,
+and stores the best RELATED_PROJECTS_STORED matches per project in the
+RelatedProject table. The detail page then reads its top matches with one
+indexed query. The table is rebuilt by the build_related_projects
+management command (run it from cron after catalog edits).
+"""
+from bisect import bisect_right
+
+from django.db import transaction
+
+from theme.search_index import parse_bhk
+from .models import Project, RelatedProject
+
+
+RELATED_PROJECTS_STORED = 8
+
+WEIGHTS = {
+    'category': 3.0,
+    'city': 3.0,
+    'project_type': 2.0,
+    'price': 2.0,
+    'bhk': 1.5,
+    'amenities': 1.5,
+}
+
+# Upper bounds of the price bands used by the search budget filter
+PRICE_BANDS = [2000000, 5000000, 10000000, 20000000, 50000000]
+
+
+def price_band(price):
+    if price is None:
+        return None
+    return bisect_right(PRICE_BANDS, price)
+
+
+def _overlap(a, b):
+    # Jaccard similarity of two sets
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def similarity(a, b):
+    """Weighted similarity of two project profiles (see _profiles)"""
+    score = 0.0
+    for field in ('category', 'city', 'project_type'):
+        if a[field] is not None and a[field] == b[field]:
+            score += WEIGHTS[field]
+    if a['band'] is not None and b['band'] is not None:
+        distance = abs(a['band'] - b['band'])
+        if distance <= 1:
+            score += WEIGHTS['price'] / (1 + distance)
+    score += WEIGHTS['bhk'] * _overlap(a['bhk'], b['bhk'])
+    score += WEIGHTS['amenities'] * _overlap(a['amenities'], b['amenities'])
+    return score
+
+
+def _profiles():
+    rows = Project.objects.filter(is_active=True).values(
+        'id', 'category_id', 'city_id', 'project_type_id', 'onwards_price', 'bhk',
+    )
+    profiles = {
+        row['id']: {
+            'category': row['category_id'],
+            'city': row['city_id'],
+            'project_type': row['project_type_id'],
+            'band': price_band(row['onwards_price']),
+            'bhk': parse_bhk(row['bhk']),
+            'amenities': set(),
+        }
+        for row in rows
+    }
+    for project_id, amenity_id in Project.amenities.through.objects.values_list('project_id', 'amenity_id'):
+        if project_id in profiles:
+            profiles[project_id]['amenities'].add(amenity_id)
+    return profiles
+
+
+def build_related_projects(limit=RELATED_PROJECTS_STORED):
+    """Recompute the whole RelatedProject table; returns the number of rows"""
+    profiles = _profiles()
+    entries = []
+    for project_id, profile in profiles.items():
+        scored = []
+        for other_id, other in profiles.items():
+            if other_id == project_id:
+                continue
+            score = similarity(profile, other)
+            if score > 0:
+                scored.append((score, other_id))
+        # Best score first; newer projects win ties
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        for rank, (score, other_id) in enumerate(scored[:limit], start=1):
+            entries.append(RelatedProject(project_id=project_id, related_id=other_id, score=score, rank=rank))
+
+    with transaction.atomic():
+        RelatedProject.objects.all().delete()
+        RelatedProject.objects.bulk_create(entries, batch_size=500)
+    return len(entries)
@@ -0,0 +1,25 @@
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete
+
+from .images import IMAGE_FIELDS, delete_derivatives, has_derivatives
+from .tasks import queue_image_processing
+
+
+def _image_saved(sender, instance, update_fields=None, **kwargs):
+    field = IMAGE_SIGNAL_FIELDS[sender]
+    if update_fields and field not in update_fields:
+        return
+    fieldfile = getattr(instance, field)
+    if fieldfile and not has_derivatives(fieldfile):
+        queue_image_processing(instance, field)
+
+
+def _image_deleted(sender, instance, **kwargs):
+    delete_derivatives(getattr(instance, IMAGE_SIGNAL_FIELDS[sender]))
+
+
+IMAGE_SIGNAL_FIELDS = {apps.get_model(label): field for label, field in IMAGE_FIELDS}
+
+for model in IMAGE_SIGNAL_FIELDS:
+    post_save.connect(_image_saved, sender=model, dispatch_uid=f'image_derivatives_save_{model.__name__}')
+    post_delete.connect(_image_deleted, sender=model, dispatch_uid=f'image_derivatives_delete_{model.__name__}')
@@ -0,0 +1,58 @@
+"""Background jobs for project media (run by theme's run_worker command)"""
+import logging
+
+from django.apps import apps
+
+from theme.jobs import enqueue, enqueue_many, task
+from .images import BAD_IMAGE_ERRORS, generate_derivatives, mark_derivatives, strip_metadata
+
+
+logger = logging.getLogger(__name__)
+
+
+def process_image_key(instance, field):
+    name = getattr(instance, field).name
+    return f'process_image:{instance._meta.label}:{instance.pk}:{name}'
+
+
+def queue_image_processing(instance, field):
+    """Queue EXIF stripping and variant generation for a freshly saved image"""
+    return enqueue(
+        'projects.process_image', instance._meta.label, instance.pk, field,
+        getattr(instance, field).name, key=process_image_key(instance, field),
+    )
+
+
+def queue_images_processing(instances, field):
+    """queue_image_processing() for many rows (e.g. after bulk_create)"""
+    enqueue_many('projects.process_image', [
+        (
+            (instance._meta.label, instance.pk, field, getattr(instance, field).name),
+            process_image_key(instance, field),
+        )
+        for instance in instances
+    ])
+
+
+@task('projects.process_image')
+def process_image(label, pk, field, name):
+    model = apps.get_model(label)
+    instance = model.objects.filter(pk=pk).first()
+    fieldfile = getattr(instance, field, None)
+    # Deleted or replaced since the job was queued: nothing to do
+    if not fieldfile or fieldfile.name != name:
+        return
+
+    try:
+        stored_name = strip_metadata(fieldfile)
+        if stored_name != name:
+            # The storage picked a new name; point the row at it without
+            # re-triggering the save signals
+            model.objects.filter(pk=pk).update(**{field: stored_name})
+            fieldfile.name = stored_name
+        source_width = generate_derivatives(fieldfile)
+    except BAD_IMAGE_ERRORS:
+        # Not an image, or a decompression bomb: fails the same way every attempt
+        logger.warning('Skipping variants for unusable image %s', fieldfile.name, exc_info=True)
+        return
+    mark_derivatives(fieldfile, source_width)
@@ -1,3 +1,472 @@
-from django.test import TestCase
+import datetime
+import importlib
+import json
+import shutil
+import tempfile
+from io import BytesIO
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from theme.content_cache import HOME_CONTENT, get_content_version, project_content
+from theme.jobs import run_pending
+from theme.models import SiteConfig, Job, Lead
+from .forms import guess_area_type, sync_children
+from .images import VARIANTS, derivative_name, has_derivatives
+from .detail import load_project_detail, related_projects
+from .models import (
+    Project, City, Category, ProjectType, Amenity, FloorPlanAccess, GalleryImage, FloorPlan, NearestArea, ConstructionUpdate,
+    WhyChooseUs, SpecificationCategory, SpecificationItem, Tag, ProjectInquiry,
+)
+from .uploads import save_uploads
+from .recommendations import build_related_projects
+from .view_counter import flush_views, pending_views, record_view, FLUSH_LOCK_KEY
+
+
+class BufferedViewCounterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Hold the flush turn so record_view() only buffers
+        cache.set(FLUSH_LOCK_KEY, True)
+        self.project = Project.objects.create(name="Skyline Residency")
+        self.other = Project.objects.create(name="Lake View")
+
+    def test_views_are_buffered_until_flush(self):
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                self.project.increment_views()
+            record_view(self.other.pk)
+        self.assertEqual(pending_views(self.project.pk), 3)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views, 0)
+
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(flush_views(), 4)
+        self.project.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.project.views, 3)
+        self.assertEqual(self.other.views, 1)
+        self.assertEqual(pending_views(self.project.pk), 0)
+        self.assertEqual(flush_views(), 0)
+
+    def test_failed_update_keeps_views_buffered(self):
+        record_view(self.project.pk)
+        with mock.patch('Projects.view_counter.Project.objects.filter', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError), self.captureOnCommitCallbacks(execute=True):
+                flush_views()
+        self.assertEqual(pending_views(self.project.pk), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(flush_views(), 1)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views, 1)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ProjectDetailLoaderTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        cache.set(FLUSH_LOCK_KEY, True)
+        SiteConfig.get_cached_config()
+        self.project = Project.objects.create(name="Skyline Residency", city=City.objects.create(name="Pune", state="Maharashtra"))
+        Project.objects.create(name="Lake View", city=self.project.city)
+        build_related_projects()
+        self.specs = SpecificationCategory.objects.create(name="Flooring")
+        self.add_children(1)
+
+    def add_children(self, count, start=0):
+        for i in range(start, start + count):
+            GalleryImage.objects.create(project=self.project, image=f"gallery/{i}.jpg", order=i)
+            GalleryImage.objects.create(project=self.project, image=f"gallery/hidden{i}.jpg", is_active=False)
+            FloorPlan.objects.create(project=self.project, name=f"Plan {i}", image=f"plans/{i}.jpg", order=i)
+            NearestArea.objects.create(project=self.project, name=f"School {i}", area_type='school')
+            ConstructionUpdate.objects.create(project=self.project, title=f"Update {i}", image=f"updates/{i}.jpg", update_date=datetime.date(2024, 1, i + 1))
+            WhyChooseUs.objects.create(project=self.project, title=f"Reason {i}", order=i)
+            SpecificationItem.objects.create(project=self.project, category=self.specs, name=f"Spec {i}", description="Vitrified")
+            self.project.amenities.add(Amenity.objects.create(name=f"Amenity {i}"))
+
+    def test_loader_query_count(self):
+        with self.assertNumQueries(9):
+            project = load_project_detail(self.project.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(project.active_gallery_images), 1)
+            self.assertEqual(project.specification_list[0].category.name, "Flooring")
+
+    def test_detail_page_queries_do_not_grow_with_children(self):
+        url = reverse('public_project_detail', args=[self.project.id])
+        with self.assertNumQueries(10):
+            response = self.client.get(url)
+        self.assertContains(response, "Reason 0")
+        self.assertContains(response, "Lake View")
+        self.assertNotContains(response, "gallery/hidden0.jpg")
+        self.add_children(3, start=1)
+        with self.assertNumQueries(10):
+            response = self.client.get(url)
+        self.assertContains(response, "Update 3")
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ProjectPageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        cache.set(FLUSH_LOCK_KEY, True)
+        # Creating the config bumps its version, which is part of the page key
+        SiteConfig.get_cached_config()
+        self.project = Project.objects.create(name="Skyline Residency")
+        self.url = reverse('public_project_detail', args=[self.project.id])
+
+    def test_anonymous_page_is_cached_until_a_child_changes(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, "Skyline Residency")
+        self.assertNotContains(response, "csrf-token-placeholder")
+
+        WhyChooseUs.objects.create(project=self.project, title="Lake facing towers")
+        self.assertContains(self.client.get(self.url), "Lake facing towers")
+
+    def test_visit_counts_view_and_reports_floor_plan_access(self):
+        visit_url = reverse('project_visit', args=[self.project.id])
+        self.assertEqual(self.client.post(visit_url).json()['has_floor_plan_access'], False)
+        session = self.client.session
+        session[f'floor_plan_access_{self.project.id}'] = True
+        session.save()
+        self.assertEqual(self.client.post(visit_url).json()['has_floor_plan_access'], True)
+        self.assertEqual(pending_views(self.project.id), 2)
+
+
+class RelatedProjectsTest(TestCase):
+    def setUp(self):
+        self.pune = City.objects.create(name="Pune", state="Maharashtra")
+        self.mumbai = City.objects.create(name="Mumbai", state="Maharashtra")
+        self.pool = Amenity.objects.create(name="Pool")
+        self.project = Project.objects.create(name="Skyline Residency", city=self.pune, bhk="2, 3 BHK", onwards_price=Decimal('6000000'))
+        self.twin = Project.objects.create(name="Skyline Twin", city=self.pune, bhk="2, 3 BHK", onwards_price=Decimal('7000000'))
+        self.cousin = Project.objects.create(name="Pune Heights", city=self.pune, bhk="4 BHK", onwards_price=Decimal('40000000'))
+        self.stranger = Project.objects.create(name="Harbour Lofts", city=self.mumbai, bhk="1 BHK", onwards_price=Decimal('90000000'))
+        self.project.amenities.add(self.pool)
+        self.twin.amenities.add(self.pool)
+
+    def test_related_projects_ranked_by_similarity(self):
+        build_related_projects()
+        with self.assertNumQueries(1):
+            related = related_projects(self.project)
+        self.assertEqual(related, [self.twin, self.cousin])
+
+    def test_inactive_projects_are_skipped(self):
+        build_related_projects()
+        self.twin.is_active = False
+        self.twin.save()
+        self.assertEqual(related_projects(self.project), [self.cousin])
+
+
+class ImageDerivativeTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        self.project = Project.objects.create(name="Skyline Residency")
+
+    def upload(self, size=(2400, 1200), exif=None):
+        from PIL import Image
+        buffer = BytesIO()
+        Image.new('RGB', size, 'red').save(buffer, 'JPEG', exif=exif or b'')
+        return SimpleUploadedFile('tower.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+    def test_upload_writes_variants(self):
+        from PIL import Image
+        gallery = GalleryImage.objects.create(project=self.project, image=self.upload())
+        self.assertFalse(has_derivatives(gallery.image))
+        self.assertEqual(run_pending(), 1)
+        gallery.refresh_from_db()
+        self.assertTrue(has_derivatives(gallery.image))
+        self.assertEqual(derivative_name('a.png', 'full', 'jpeg'), 'a.png__full.jpg')
+        storage = gallery.image.storage
+        for variant, width in VARIANTS.items():
+            with Image.open(storage.path(derivative_name(gallery.image.name, variant, 'webp'))) as image:
+                self.assertEqual(image.width, width)
+        gallery.delete()
+        self.assertFalse(storage.exists(derivative_name(gallery.image.name, 'card', 'jpeg')))
+
+    def test_small_source_lists_only_generated_widths(self):
+        from PIL import Image
+        gallery = GalleryImage.objects.create(project=self.project, image=self.upload(size=(800, 400)))
+        run_pending()
+        gallery.refresh_from_db()
+        self.assertEqual(gallery.image_width, 800)
+        storage = gallery.image.storage
+        with Image.open(storage.path(derivative_name(gallery.image.name, 'hero', 'jpeg'))) as image:
+            self.assertEqual(image.width, 800)
+        self.assertFalse(storage.exists(derivative_name(gallery.image.name, 'full', 'jpeg')))
+
+        html = Template("{% load image_tags %}{% responsive_image image 'full' %}").render(Context({'image': gallery.image}))
+        self.assertIn('__hero.jpg 800w', html)
+        self.assertIn('__hero.webp 800w', html)
+        self.assertNotIn('1280w', html)
+        self.assertNotIn('1920w', html)
+        self.assertNotIn('__full.', html)
+
+    def test_processing_expires_cached_pages(self):
+        gallery = GalleryImage.objects.create(project=self.project, image=self.upload())
+        project_version = get_content_version(project_content(self.project.pk))
+        run_pending()
+        self.assertNotEqual(get_content_version(project_content(self.project.pk)), project_version)
+
+        self.project.banner_image = self.upload()
+        self.project.save()
+        home_version = get_content_version(HOME_CONTENT)
+        run_pending()
+        self.assertNotEqual(get_content_version(HOME_CONTENT), home_version)
+
+    def test_decompression_bomb_is_not_retried(self):
+        gallery = GalleryImage.objects.create(project=self.project, image=self.upload())
+        with mock.patch('PIL.Image.MAX_IMAGE_PIXELS', 1000), self.assertLogs('Projects.tasks', 'WARNING'):
+            run_pending()
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.DONE)
+        gallery.refresh_from_db()
+        self.assertFalse(has_derivatives(gallery.image))
+
+    def test_responsive_image_tag(self):
+        gallery = GalleryImage.objects.create(project=self.project, image=self.upload())
+        run_pending()
+        gallery.refresh_from_db()
+        html = Template("{% load image_tags %}{% responsive_image image 'card' alt='Tower' %}").render(Context({'image': gallery.image}))
+        self.assertIn('type="image/webp"', html)
+        self.assertIn('__card.jpg', html)
+        self.assertIn(' 1920w', html)
+
+        plain = GalleryImage.objects.create(project=self.project, image="gallery/missing.jpg")
+        html = Template("{% load image_tags %}{% responsive_image image %}").render(Context({'image': plain.image}))
+        self.assertIn('src="/media/gallery/missing.jpg"', html)
+
+    def test_processing_strips_exif(self):
+        from PIL import Image
+        exif = Image.Exif()
+        exif[0x0110] = "Phone Camera"
+        gallery = GalleryImage.objects.create(project=self.project, image=self.upload(exif=exif.tobytes()))
+        run_pending()
+        gallery.refresh_from_db()
+        with gallery.image.open('rb') as source, Image.open(source) as image:
+            self.assertEqual(len(image.getexif()), 0)
+
+
+class BulkUploadTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        self.project = Project.objects.create(name="Skyline Residency")
+        GalleryImage.objects.create(project=self.project, image="gallery/existing.jpg", order=5)
+
+    def test_uploads_inserted_in_one_statement_after_existing_order(self):
+        files = [SimpleUploadedFile(f'photo{i}.jpg', b'jpeg-bytes') for i in range(12)]
+        with CaptureQueriesContext(connection) as queries:
+            created = save_uploads(GalleryImage, self.project, files)
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "Projects_galleryimage"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual([image.order for image in created], list(range(6, 18)))
+        self.assertTrue(all(image.image.storage.exists(image.image.name) for image in created))
+        self.assertEqual(Job.objects.filter(key__contains='gallery/photo').count(), 12)
+
+    def test_floor_plans_named_after_files(self):
+        created = save_uploads(FloorPlan, self.project, [SimpleUploadedFile('3BHK East.png', b'png-bytes')])
+        self.assertEqual(created[0].name, "3BHK East")
+        self.assertEqual(created[0].order, 1)
+
+
+class ChildSyncTest(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(name="Skyline Residency")
+        for i, title in enumerate(["Gated community", "Metro nearby", "Club house"]):
+            WhyChooseUs.objects.create(project=self.project, title=title, order=i + 1)
+
+    def test_diff_applied_in_fixed_queries(self):
+        entries = [
+            {'title': "Club house", 'order': 1},
+            {'title': "gated community", 'order': 2},
+            {'title': "Rooftop pool", 'order': 3},
+        ]
+        # select, delete (collect + delete, signals are connected), bulk update, bulk create
+        with self.assertNumQueries(5):
+            sync_children(self.project, WhyChooseUs, 'title', entries, update_fields=['order'])
+
+        self.assertEqual(
+            list(self.project.why_choose_us.order_by('order').values_list('title', flat=True)),
+            ["Club house", "gated community", "Rooftop pool"],
+        )
+
+    def test_unchanged_rows_are_not_written(self):
+        entries = [{'title': title, 'order': order} for title, order in
+                   self.project.why_choose_us.values_list('title', 'order')]
+        with self.assertNumQueries(1):
+            sync_children(self.project, WhyChooseUs, 'title', entries, update_fields=['order'])
+
+    def test_duplicate_rows_are_collapsed(self):
+        WhyChooseUs.objects.create(project=self.project, title="METRO NEARBY", order=9)
+        entries = [{'title': "Metro nearby", 'order': 1}, {'title': "Club house", 'order': 2}]
+        sync_children(self.project, WhyChooseUs, 'title', entries, update_fields=['order'])
+        self.assertEqual(
+            list(self.project.why_choose_us.order_by('order').values_list('title', 'order')),
+            [("Metro nearby", 1), ("Club house", 2)],
+        )
+
+    def test_area_type_from_name(self):
+        self.assertEqual(guess_area_type("City Hospital"), 'hospital')
+        self.assertEqual(guess_area_type("Noida Sector 18 Metro Station"), 'metro')
+        self.assertEqual(guess_area_type("Riverside"), 'other')
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class AdminCountColumnsTest(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def add_rows(self, start, count):
+        for i in range(start, start + count):
+            category = Category.objects.create(name=f"Category {i}")
+            ProjectType.objects.create(name=f"Type {i}", category=category)
+            project = Project.objects.create(name=f"Project {i}", category=category)
+            FloorPlanAccess.objects.create(project=project, name="Asha", email="asha@example.com", phone="9876543210")
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        urls = [
+            reverse('admin:Projects_category_changelist'),
+            reverse('admin:Projects_projecttype_changelist'),
+            reverse('admin:Projects_floorplanaccess_changelist'),
+        ]
+        self.add_rows(0, 2)
+        before = [self.changelist_queries(url) for url in urls]
+        self.add_rows(2, 6)
+        after = [self.changelist_queries(url) for url in urls]
+        self.assertEqual(before, after)
+
+    def test_counts_are_sortable(self):
+        self.add_rows(0, 2)
+        Project.objects.create(name="Extra", category=Category.objects.get(name="Category 1"))
+        response = self.client.get(reverse('admin:Projects_category_changelist'), {'o': '-2'})
+        totals = [(c.name, c.project_total) for c in response.context['cl'].result_list]
+        self.assertEqual(totals, [("Category 1", 2), ("Category 0", 1)])
+
+
+@override_settings(DEBUG=True, STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class AdminQueryBudgetTest(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        city = City.objects.create(name="Noida", state="UP")
+        tags = [Tag.objects.create(name=f"Tag {i}") for i in range(5)]
+        spec_category = SpecificationCategory.objects.create(name="Flooring")
+        for i in range(5):
+            project = Project.objects.create(name=f"Project {i}", city=city, banner_image=f"projects/{i}.jpg")
+            project.tags.set(tags)
+            GalleryImage.objects.create(project=project, image=f"gallery/{i}.jpg")
+            FloorPlan.objects.create(project=project, name="2 BHK", image=f"plans/{i}.jpg")
+            NearestArea.objects.create(project=project, name="Metro", area_type='metro')
+            ConstructionUpdate.objects.create(project=project, image=f"updates/{i}.jpg", update_date=datetime.date(2024, 1, 1))
+            WhyChooseUs.objects.create(project=project, title="Location")
+            SpecificationItem.objects.create(project=project, category=spec_category, name="Vitrified tiles")
+            FloorPlanAccess.objects.create(project=project, name="Asha", email="asha@example.com", phone="9876543210")
+
+    def test_every_projects_changelist_stays_in_budget(self):
+        for model in admin.site._registry:
+            if model._meta.app_label != 'Projects':
+                continue
+            with self.subTest(model=model.__name__):
+                url = reverse(f'admin:Projects_{model._meta.model_name}_changelist')
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class LeadIntakeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(name="Skyline Residency")
+
+    def post(self, name, payload):
+        return self.client.post(
+            reverse(name, args=[self.project.id]), json.dumps(payload), content_type='application/json',
+        ).json()
+
+    def test_inquiries_get_their_own_table(self):
+        result = self.post('submit_project_inquiry', {
+            'name': "Asha", 'email': "asha@example.com", 'phone': "9876543210",
+            'interest': "3 BHK", 'message': "Site visit on Sunday",
+        })
+        self.assertTrue(result['success'])
+        inquiry = ProjectInquiry.objects.get()
+        self.assertEqual((inquiry.interest, inquiry.message), ("3 BHK", "Site visit on Sunday"))
+        self.assertFalse(FloorPlanAccess.objects.exists())
+        self.assertTrue(Lead.objects.filter(source='project_inquiry', object_id=inquiry.pk).exists())
+
+    def test_floor_plan_access_shares_validation(self):
+        result = self.post('submit_floor_plan_access', {'name': "Asha", 'email': "not-an-email", 'phone': "9876543210"})
+        self.assertEqual(result, {'success': False, 'error': 'Please enter a valid email address.'})
+
+        result = self.post('submit_floor_plan_access', {'name': "Asha", 'email': "asha@example.com", 'phone': "9876543210"})
+        self.assertTrue(result['success'])
+        self.assertEqual(FloorPlanAccess.objects.get().project, self.project)
+        self.assertTrue(self.client.session[f'floor_plan_access_{self.project.id}'])
+
+    def test_packed_inquiry_messages_are_split(self):
+        migration = importlib.import_module('Projects.migrations.0010_split_project_inquiries')
+        self.assertEqual(migration.split_message("Interest: 2 BHK\n\nMessage: Call me"), ("2 BHK", "Call me"))
+        self.assertEqual(migration.split_message("Just a note"), ("", "Just a note"))
+
+
+@override_settings(RATE_LIMITS={'floor_plan_access': (2, 60), 'project_views': (3, 60)})
+class RateLimitTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(name="Skyline Residency")
+        self.other = Project.objects.create(name="Lake View")
+
+    def submit(self, project, ip='203.0.113.5', spoofed='10.0.0.1'):
+        # The client sends its own X-Forwarded-For; the proxy appends the real address
+        return self.client.post(
+            reverse('submit_floor_plan_access', args=[project.id]),
+            json.dumps({'name': "Bot", 'email': "bot@example.com", 'phone': "9876543210"}),
+            content_type='application/json', HTTP_X_FORWARDED_FOR=f'{spoofed}, {ip}',
+        )
+
+    def test_budget_per_ip_and_project(self):
+        self.assertEqual([self.submit(self.project).status_code for _ in range(3)], [200, 200, 429])
+        response = self.submit(self.project)
+        self.assertEqual(response.json()['success'], False)
+        self.assertTrue(int(response['Retry-After']) > 0)
+        self.assertEqual(FloorPlanAccess.objects.count(), 2)
+
+        # Other projects and other clients have their own budgets
+        self.assertEqual(self.submit(self.other).status_code, 200)
+        self.assertEqual(self.submit(self.project, ip='198.51.100.7').status_code, 200)
+
+    def test_forged_forwarded_for_does_not_reset_the_budget(self):
+        statuses = [self.submit(self.project, spoofed=f'192.0.2.{i}').status_code for i in range(4)]
+        self.assertEqual(statuses, [200, 200, 429, 429])
+        self.assertEqual(FloorPlanAccess.objects.first().ip_address, '203.0.113.5')
+        # Junk where the proxy's hop should be falls back to the peer address
+        self.assertEqual(self.submit(self.other, ip='x' * 500).status_code, 200)
+
+    def test_throttled_visits_are_not_counted(self):
+        cache.set(FLUSH_LOCK_KEY, True)
+        url = reverse('project_visit', args=[self.project.id])
+        for _ in range(5):
+            response = self.client.post(url)
+            self.assertEqual(response.status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            flush_views()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views, 3)
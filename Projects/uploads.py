@@ -0,0 +1,51 @@
+"""
+Bulk image upload for the project create/edit forms.
+
+save_uploads() streams every uploaded file to storage chunk by chunk
+(Storage.save() copies ``File.chunks()``), then inserts all rows with one
+bulk_create inside a transaction, numbering them after the current
+highest ``order``. Image processing is queued for the whole batch at once.
+"""
+import os
+
+from django.db import transaction
+from django.db.models import Max
+
+from theme.content_cache import bump_content_version, project_content
+from .models import FloorPlan
+from .tasks import queue_images_processing
+
+
+UPLOAD_BATCH_SIZE = 100
+
+
+def save_uploads(model, project, files):
+    """Store uploads as `model` rows (GalleryImage/FloorPlan) appended to project"""
+    if not files:
+        return []
+    field = model._meta.get_field('image')
+    storage = field.storage
+    saved_names = []
+    try:
+        with transaction.atomic():
+            offset = model.objects.filter(project=project).aggregate(top=Max('order'))['top'] or 0
+            objects = []
+            for i, upload in enumerate(files, start=1):
+                instance = model(project=project, order=offset + i, is_active=True)
+                if model is FloorPlan:
+                    instance.name = os.path.splitext(os.path.basename(upload.name))[0][:100]
+                name = storage.save(field.generate_filename(instance, upload.name), upload, max_length=field.max_length)
+                saved_names.append(name)
+                instance.image = name
+                objects.append(instance)
+            created = model.objects.bulk_create(objects, batch_size=UPLOAD_BATCH_SIZE)
+            queue_images_processing(created, 'image')
+    except Exception:
+        # Don't leave orphaned files behind a rolled back insert
+        for name in saved_names:
+            storage.delete(name)
+        raise
+
+    # bulk_create sends no post_save, so invalidate the cached detail page here
+    bump_content_version(project_content(project.pk))
+    return created
@@ -7,6 +7,7 @@ urlpatterns = [
     path('project/<int:project_id>/detail/', views.project_detail_view, name='project_detail'),
     path('project/<int:project_id>/', views.public_project_detail_view, name='public_project_detail'),
     path('increment-views/<int:project_id>/', views.increment_project_views, name='increment_project_views'),
+    path('project-visit/<int:project_id>/', views.project_visit, name='project_visit'),
     path('floor-plan-access/<int:project_id>/', views.submit_floor_plan_access, name='submit_floor_plan_access'),
     path('project-inquiry/<int:project_id>/', views.submit_project_inquiry, name='submit_project_inquiry'),
     # PDF download route removed
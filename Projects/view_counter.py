@@ -0,0 +1,142 @@
+"""
+Buffered project view counting.
+
+Detail page hits only increment a counter in the cache. Pending counts are
+applied to ``Project.views`` in bulk by ``flush_views()``, which runs
+opportunistically from the request path at most once per
+``PROJECT_VIEWS_FLUSH_INTERVAL`` seconds and from the
+``flush_project_views`` management command.
+
+Projects with pending views are listed in a dirty set, so a flush reads
+only their counters. The cache has no set type, so the set is a log of
+slots numbered by an atomic counter; a project is appended the first time
+it is viewed after a flush. Counters and the log need atomic add/incr in a
+cache every process shares (CACHE_URL=redis://...); with the per-process
+locmem default, a separate ``flush_project_views`` process sees none of the
+web workers' views.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import Project
+
+
+FLUSH_LOCK_KEY = 'project_views:flush_lock'
+DIRTY_SEQ_KEY = 'project_views:dirty_seq'
+FLUSHED_SEQ_KEY = 'project_views:flushed_seq'
+# A project whose log slot was lost (evicted) is listed again after this
+DIRTY_MARKER_TIMEOUT = 60 * 60 * 24
+# Taken by a writer that gave up on a slot; the writer moves to the next one
+SKIPPED_SLOT = 'skipped'
+
+
+def _counter_key(project_id):
+    return f'project_views:{project_id}'
+
+
+def _dirty_key(project_id):
+    return f'project_views:dirty:{project_id}'
+
+
+def _slot_key(slot):
+    return f'project_views:dirty_slot:{slot}'
+
+
+def _flush_interval():
+    return getattr(settings, 'PROJECT_VIEWS_FLUSH_INTERVAL', 60)
+
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # First hit since the key expired or was never set
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+def _mark_dirty(project_id):
+    """Append the project to the dirty log unless it is listed already"""
+    if not cache.add(_dirty_key(project_id), True, timeout=DIRTY_MARKER_TIMEOUT):
+        return
+    # A flush may skip a slot this writer has not filled yet; take another
+    while not cache.add(_slot_key(_incr(DIRTY_SEQ_KEY)), project_id, timeout=None):
+        pass
+
+
+def record_view(project_id):
+    """Count one view of a project without writing to the database"""
+    _incr(_counter_key(project_id))
+    _mark_dirty(project_id)
+
+    # The first request after the interval elapses takes the flush turn
+    if cache.add(FLUSH_LOCK_KEY, True, timeout=_flush_interval()):
+        flush_views()
+
+
+def pending_views(project_id):
+    """Views recorded for a project but not flushed yet"""
+    return cache.get(_counter_key(project_id)) or 0
+
+
+def _read_dirty_log():
+    """(project ids, slot keys read) for every slot filled since the last flush"""
+    last = cache.get(DIRTY_SEQ_KEY, 0)
+    done = cache.get(FLUSHED_SEQ_KEY, 0)
+    if last < done:
+        # The sequence was evicted and started over
+        done = 0
+    slot_keys = [_slot_key(slot) for slot in range(done + 1, last + 1)]
+    found = cache.get_many(slot_keys)
+    for key in slot_keys:
+        # Claimed but not written yet: skip it, the writer takes a new slot
+        if key not in found and not cache.add(key, SKIPPED_SLOT, timeout=None):
+            found[key] = cache.get(key)
+    project_ids = {value for value in found.values() if value not in (None, SKIPPED_SLOT)}
+    return project_ids, last, slot_keys
+
+
+def flush_views():
+    """
+    Apply the buffered view counts of dirty projects with a single UPDATE.
+
+    Counters are decremented only once the UPDATE has committed, so a failed
+    write leaves the views buffered for the next flush. Callers must hold
+    FLUSH_LOCK_KEY. Returns the number of views written.
+    """
+    project_ids, last, slot_keys = _read_dirty_log()
+    if not slot_keys:
+        return 0
+    # Views from here on list their project again for the next flush
+    cache.delete_many([_dirty_key(project_id) for project_id in project_ids])
+
+    keys = {_counter_key(project_id): project_id for project_id in project_ids}
+    counts = {
+        keys[key]: count
+        for key, count in cache.get_many(list(keys)).items()
+        if count
+    }
+    if counts:
+        Project.objects.filter(id__in=counts).update(
+            views=F('views') + Case(
+                *[When(id=project_id, then=Value(count)) for project_id, count in counts.items()],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+
+    def written():
+        # Decrement rather than delete so hits that landed mid-flush are kept
+        for project_id, count in counts.items():
+            try:
+                cache.decr(_counter_key(project_id), count)
+            except ValueError:
+                pass
+        cache.set(FLUSHED_SEQ_KEY, last, timeout=None)
+        cache.delete_many(slot_keys)
+
+    transaction.on_commit(written)
+    return sum(counts.values())
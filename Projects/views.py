@@ -4,12 +4,15 @@ from django.http import JsonResponse
 from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
-from django.core.exceptions import ValidationError
-from django.core.validators import validate_email
-from .models import Project, Category, ProjectType, GalleryImage, FloorPlan, FloorPlanAccess
+from .models import Project, Category, ProjectType, GalleryImage, FloorPlan, FloorPlanAccess, ProjectInquiry
 from .forms import ProjectForm
+from .detail import load_project_detail, related_projects
+from .intake import IntakeError, ingest
+from .uploads import save_uploads
+from .page_cache import CSRF_PLACEHOLDER, cached_page, finish_response, is_cacheable
 from theme.models import SiteConfig
-import json
+from theme.ratelimit import rate_limit, throttled
+from theme.replica import not_sticky, read_from_replica
 
 
 def index(request):
@@ -38,51 +41,69 @@ def project_detail_view(request, project_id):
     return render(request, 'admin/Projects/project_detail.html', context)
 
 
+@read_from_replica
 def public_project_detail_view(request, project_id):
     """Public detailed view of a project using the new redesigned template"""
-    project = get_object_or_404(Project, id=project_id, is_active=True)
-    
-    # Increment view count
-    project.increment_views()
+    # Anonymous visitors get the cached page when nothing has changed
+    if is_cacheable(request):
+        return cached_page(request, project_id, lambda: render_project_page(request, project_id))
+    return finish_response(request, render_project_page(request, project_id))
+
+
+def render_project_page(request, project_id):
+    """The detail page with a CSRF placeholder, so any visitor's copy can be cached"""
+    project = load_project_detail(project_id)
     
     # Get site configuration
-    site_config = SiteConfig.get_config()
-    
-    # Check if user has floor plan access (using session-based tracking)
-    session_key = f'floor_plan_access_{project_id}'
-    has_floor_plan_access = request.session.get(session_key, False)
-    
-    # Get related projects (same category or city)
-    related_projects = Project.objects.filter(
-        is_active=True
-    ).exclude(id=project.id)
-    
-    if project.category:
-        related_projects = related_projects.filter(category=project.category)
-    elif project.city:
-        related_projects = related_projects.filter(city=project.city)
-    
-    related_projects = related_projects[:4]
+    site_config = SiteConfig.get_cached_config()
     
+    # Collections are prefetched lists; the template never queries again.
+    # Nothing per-visitor is rendered: view counting and the floor plan
+    # gate are handled by project_visit from the page's JavaScript.
     context = {
         'project': project,
-        'gallery_images': project.gallery_images.filter(is_active=True).order_by('order'),
-        'floor_plans': project.floor_plans.filter(is_active=True).order_by('order'),
-        'nearest_areas': project.nearest_areas.all().order_by('area_type', 'name'),
-        'construction_updates': project.construction_updates.all().order_by('-update_date', 'order'),
-        'why_choose_us': project.why_choose_us.all().order_by('order'),
-        'specifications': project.specifications.all().order_by('category__order', 'order'),
-        'amenity_images': project.amenity_images.filter(is_active=True),
+        'gallery_images': project.active_gallery_images,
+        'floor_plans': project.active_floor_plans,
+        'nearest_areas': project.nearest_area_list,
+        'construction_updates': project.construction_update_list,
+        'why_choose_us': project.why_choose_us_list,
+        'specifications': project.specification_list,
+        'amenities': project.active_amenities,
+        'amenity_images': project.active_amenity_images,
         'project_overview': getattr(project, 'overview', None),
         'site_config': site_config,
-        'related_projects': related_projects,
-        'has_floor_plan_access': has_floor_plan_access,
+        'related_projects': related_projects(project),
+        'has_floor_plan_access': False,
+        'csrf_token': CSRF_PLACEHOLDER,
         'title': f'{project.name} - Project Details',
     }
 
     return render(request, 'pages/project_detail_redesign.html', context)
 
 
+@csrf_exempt
+@require_POST
+@not_sticky
+def project_visit(request, project_id):
+    """Count a detail page view and report this visitor's floor plan access"""
+    project = get_object_or_404(Project, id=project_id, is_active=True)
+    # Over budget: still report floor plan access, just stop counting
+    if not throttled(request, 'project_views', project_id):
+        project.increment_views()
+    session_key = f'floor_plan_access_{project_id}'
+    return JsonResponse({
+        'success': True,
+        'views': project.views,
+        'has_floor_plan_access': request.session.get(session_key, False),
+    })
+
+
+def save_project_uploads(request, project):
+    """Bulk-save the gallery and floor plan images posted with the project form"""
+    for model, field in ((GalleryImage, 'gallery_images'), (FloorPlan, 'floor_plan_images')):
+        save_uploads(model, project, request.FILES.getlist(field))
+
+
 def project_create(request):
     """Create a new project with single-page form"""
     if request.method == 'POST':
@@ -90,25 +111,8 @@ def project_create(request):
         if form.is_valid():
             project = form.save()
             
-            # Handle gallery images
-            gallery_images = request.FILES.getlist('gallery_images')
-            for i, image in enumerate(gallery_images):
-                GalleryImage.objects.create(
-                    project=project,
-                    image=image,
-                    order=i + 1,
-                    is_active=True
-                )
-            
-            # Handle floor plan images
-            floor_plan_images = request.FILES.getlist('floor_plan_images')
-            for i, image in enumerate(floor_plan_images):
-                FloorPlan.objects.create(
-                    project=project,
-                    image=image,
-                    order=i + 1,
-                    is_active=True
-                )
+            # Handle gallery and floor plan images
+            save_project_uploads(request, project)
             
             messages.success(request, f'Project "{project.name}" has been created successfully!')
             return redirect('admin:Projects_project_change', project.id)
@@ -129,29 +133,8 @@ def project_edit(request, project_id):
         if form.is_valid():
             project = form.save()
             
-            # Handle gallery images (append new ones)
-            gallery_images = request.FILES.getlist('gallery_images')
-            if gallery_images:
-                existing_count = GalleryImage.objects.filter(project=project).count()
-                for i, image in enumerate(gallery_images):
-                    GalleryImage.objects.create(
-                        project=project,
-                        image=image,
-                        order=existing_count + i + 1,
-                        is_active=True
-                    )
-            
-            # Handle floor plan images (append new ones)
-            floor_plan_images = request.FILES.getlist('floor_plan_images')
-            if floor_plan_images:
-                existing_count = FloorPlan.objects.filter(project=project).count()
-                for i, image in enumerate(floor_plan_images):
-                    FloorPlan.objects.create(
-                        project=project,
-                        image=image,
-                        order=existing_count + i + 1,
-                        is_active=True
-                    )
+            # Handle gallery and floor plan images (appended after existing ones)
+            save_project_uploads(request, project)
             
             messages.success(request, f'Project "{project.name}" has been updated successfully!')
             return redirect('admin:Projects_project_change', project.id)
@@ -167,21 +150,21 @@ def project_edit(request, project_id):
             initial_data['overview_description'] = project.overview.short_description
         
         # Get nearest areas
-        nearest_areas = project.nearest_areas.all().order_by('order')
+        nearest_areas = project.nearest_areas.all().order_by('area_type', 'name')
         if nearest_areas:
-            areas_list = [f"{area.place} - {area.distance}" for area in nearest_areas]
+            areas_list = [f"{area.name} - {area.distance}" if area.distance else area.name for area in nearest_areas]
             initial_data['nearest_areas'] = ', '.join(areas_list)
         
         # Get construction updates
         construction_updates = project.construction_updates.all().order_by('order')
         if construction_updates:
-            updates_list = [update.update for update in construction_updates]
+            updates_list = [update.title for update in construction_updates if update.title]
             initial_data['construction_updates'] = ', '.join(updates_list)
         
         # Get why choose us points
         why_choose_us = project.why_choose_us.all().order_by('order')
         if why_choose_us:
-            points_list = [point.point for point in why_choose_us]
+            points_list = [point.title for point in why_choose_us]
             initial_data['why_choose_us'] = ', '.join(points_list)
         
         form = ProjectForm(instance=project, initial=initial_data)
@@ -204,6 +187,8 @@ def get_project_types(request):
 
 @csrf_exempt
 @require_POST
+@rate_limit('project_views')
+@not_sticky
 def increment_project_views(request, project_id):
     """AJAX endpoint to increment project views"""
     try:
@@ -216,58 +201,12 @@ def increment_project_views(request, project_id):
 
 @csrf_exempt
 @require_POST
+@rate_limit('floor_plan_access')
 def submit_floor_plan_access(request, project_id):
     """Submit contact details to access floor plans"""
     try:
         project = get_object_or_404(Project, id=project_id, is_active=True)
-        
-        # Get form data
-        data = json.loads(request.body)
-        name = data.get('name', '').strip()
-        email = data.get('email', '').strip()
-        phone = data.get('phone', '').strip()
-        message = data.get('message', '').strip()
-        
-        # Validate required fields
-        if not name or not email or not phone:
-            return JsonResponse({
-                'success': False, 
-                'error': 'Name, email, and phone are required fields.'
-            })
-        
-        # Validate email format
-        try:
-            validate_email(email)
-        except ValidationError:
-            return JsonResponse({
-                'success': False, 
-                'error': 'Please enter a valid email address.'
-            })
-        
-        # Validate phone (basic check)
-        if len(phone) < 10:
-            return JsonResponse({
-                'success': False, 
-                'error': 'Please enter a valid phone number.'
-            })
-        
-        # Get IP address and user agent
-        ip_address = request.META.get('REMOTE_ADDR')
-        if request.META.get('HTTP_X_FORWARDED_FOR'):
-            ip_address = request.META.get('HTTP_X_FORWARDED_FOR').split(',')[0].strip()
-        
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-        
-        # Create floor plan access record
-        FloorPlanAccess.objects.create(
-            project=project,
-            name=name,
-            email=email,
-            phone=phone,
-            message=message,
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
+        ingest(FloorPlanAccess, project, request, fields=['message'])
         
         # Grant access in session
         session_key = f'floor_plan_access_{project_id}'
@@ -279,10 +218,10 @@ def submit_floor_plan_access(request, project_id):
             'message': 'Thank you! You can now view the floor plans.'
         })
         
-    except json.JSONDecodeError:
+    except IntakeError as e:
         return JsonResponse({
             'success': False, 
-            'error': 'Invalid request format.'
+            'error': str(e)
         })
     except Exception as e:
         return JsonResponse({
@@ -293,76 +232,22 @@ def submit_floor_plan_access(request, project_id):
 
 @csrf_exempt
 @require_POST
+@rate_limit('project_inquiry')
 def submit_project_inquiry(request, project_id):
     """Submit project inquiry form"""
     try:
         project = get_object_or_404(Project, id=project_id, is_active=True)
-        
-        # Get form data
-        if request.content_type == 'application/json':
-            data = json.loads(request.body)
-        else:
-            data = request.POST
-            
-        name = data.get('name', '').strip()
-        email = data.get('email', '').strip()
-        phone = data.get('phone', '').strip()
-        interest = data.get('interest', '').strip()
-        message = data.get('message', '').strip()
-        
-        # Validate required fields
-        if not name or not email or not phone:
-            return JsonResponse({
-                'success': False, 
-                'error': 'Name, email, and phone are required fields.'
-            })
-        
-        # Validate email format
-        try:
-            validate_email(email)
-        except ValidationError:
-            return JsonResponse({
-                'success': False, 
-                'error': 'Please enter a valid email address.'
-            })
-        
-        # Validate phone (basic check)
-        if len(phone) < 10:
-            return JsonResponse({
-                'success': False, 
-                'error': 'Please enter a valid phone number.'
-            })
-        
-        # Get IP address and user agent
-        ip_address = request.META.get('REMOTE_ADDR')
-        if request.META.get('HTTP_X_FORWARDED_FOR'):
-            ip_address = request.META.get('HTTP_X_FORWARDED_FOR').split(',')[0].strip()
-        
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-        
-        # Create inquiry record (you may want to create a ProjectInquiry model)
-        # For now, we'll use FloorPlanAccess as a general inquiry model
-        inquiry_message = f"Interest: {interest}\n\nMessage: {message}" if interest else message
-        
-        FloorPlanAccess.objects.create(
-            project=project,
-            name=name,
-            email=email,
-            phone=phone,
-            message=inquiry_message,
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
+        ingest(ProjectInquiry, project, request, fields=['interest', 'message'])
         
         return JsonResponse({
             'success': True, 
             'message': 'Thank you for your inquiry! We will contact you within 24 hours.'
         })
         
-    except json.JSONDecodeError:
+    except IntakeError as e:
         return JsonResponse({
             'success': False, 
-            'error': 'Invalid request format.'
+            'error': str(e)
         })
     except Exception as e:
         return JsonResponse({
@@ -0,0 +1,74 @@
+"""
+CACHES from CACHE_URL and CONTENT_CACHE_URL.
+
+    locmem://                        per-process memory (the default)
+    redis://host:6379/0              Redis or a compatible server (needs redis-py)
+    file:///var/tmp/velocity-cache   files shared by the processes of one host
+                                     (CONTENT_CACHE_URL only)
+
+``default`` (CACHE_URL) holds locks, counters and rate limits, which rely
+on atomic add()/incr(). Only locmem and Redis provide those: the file
+backend's add() is a check-then-set and its incr() a get-then-set, so it is
+refused there. locmem is atomic only within one process; production with
+several workers or a separate worker process needs redis://.
+
+``content`` (versioned page and search caches, theme.content_cache) and
+``template_fragments`` (the {% cache %} tag) are stored in
+CONTENT_CACHE_URL, CACHE_URL by default. When that store is shared between
+processes they put an in-process LRU in front of it (theme.tiered_cache).
+With locmem they are the same store as ``default``.
+"""
+from urllib.parse import urlsplit
+
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+}
+# Schemes whose add()/incr() are atomic, as locks and counters need
+ATOMIC_SCHEMES = ('locmem', 'redis', 'rediss')
+
+LAYERED_ALIASES = ('content', 'template_fragments')
+CONTENT_STORE_ALIAS = 'content_store'
+
+
+def shared_cache_config(url, base_dir):
+    parts = urlsplit(url)
+    if parts.scheme not in BACKENDS:
+        raise ValueError(f'Unsupported cache URL scheme: {parts.scheme!r}')
+    config = {'BACKEND': BACKENDS[parts.scheme]}
+    if parts.scheme == 'locmem':
+        config['LOCATION'] = parts.netloc or 'velocity'
+    elif parts.scheme == 'file':
+        # file:///abs/path, or file://name relative to the project
+        config['LOCATION'] = parts.path if not parts.netloc else base_dir / (parts.netloc + parts.path)
+    else:
+        config['LOCATION'] = url
+    return config
+
+
+def cache_config(url, base_dir, content_url=None, l1_timeout=5, l1_max_entries=1000):
+    if urlsplit(url).scheme not in ATOMIC_SCHEMES:
+        raise ValueError(
+            f'CACHE_URL {url!r} cannot hold locks and counters (no atomic add/incr); '
+            'use redis:// there and set CONTENT_CACHE_URL for a file cache'
+        )
+    caches = {'default': shared_cache_config(url, base_dir)}
+    store_alias = 'default'
+    if content_url and content_url != url:
+        store_alias = CONTENT_STORE_ALIAS
+        caches[store_alias] = shared_cache_config(content_url, base_dir)
+
+    store = caches[store_alias]
+    for alias in LAYERED_ALIASES:
+        if store['BACKEND'] == BACKENDS['locmem'] or not l1_timeout:
+            caches[alias] = dict(store)
+        else:
+            caches[alias] = {
+                'BACKEND': 'theme.tiered_cache.TieredCache',
+                'LOCATION': alias,
+                'OPTIONS': {'L2': store_alias, 'L1_TIMEOUT': l1_timeout, 'L1_MAX_ENTRIES': l1_max_entries},
+            }
+    return caches
@@ -25,6 +25,9 @@ import shutil
 from pathlib import Path
 from dotenv import load_dotenv
 
+from .caches import cache_config
+from .database import database_config
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -110,6 +113,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'theme.replica.StickyPrimaryMiddleware',
 ]
 
 ROOT_URLCONF = 'Source.urls'
@@ -141,14 +145,60 @@ WSGI_APPLICATION = 'Source.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# Use SQLite for simplicity in deployment
+# DATABASE_URL selects the backend (see Source/database.py); SQLite by
+# default. Production SQLite should add ?journal_mode=wal&synchronous=normal;
+# the default URL leaves the committed db.sqlite3 as it is. DB_CONN_MAX_AGE keeps connections open between requests,
+# DB_POOL uses Django's connection pool instead (PostgreSQL, Django 5.1+).
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+DB_POOL = os.getenv('DB_POOL', 'False').lower() == 'true'
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(
+        os.getenv('DATABASE_URL', 'sqlite:///db.sqlite3'), BASE_DIR, conn_max_age=DB_CONN_MAX_AGE, pool=DB_POOL,
+    )
 }
 
+# Optional read replica for the public catalog pages (theme.replica). A
+# session that wrote something reads from the primary for
+# REPLICA_STICKY_SECONDS; tests point the replica at the test database.
+if os.getenv('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = database_config(
+        os.getenv('DATABASE_REPLICA_URL'), BASE_DIR, conn_max_age=DB_CONN_MAX_AGE, pool=DB_POOL,
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['theme.replica.ReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '15'))
+
+# CACHE_URL selects the cache for locks, counters and rate limits (see
+# Source/caches.py): locmem:// or redis://, and production with more than
+# one process needs redis://. CONTENT_CACHE_URL may move the page and
+# fragment caches elsewhere (e.g. file://). Content caches keep an
+# in-process copy of shared entries for up to CACHE_L1_TIMEOUT seconds
+# (0 turns that off).
+CACHES = cache_config(
+    os.getenv('CACHE_URL', 'locmem://'),
+    BASE_DIR,
+    content_url=os.getenv('CONTENT_CACHE_URL'),
+    l1_timeout=int(os.getenv('CACHE_L1_TIMEOUT', '5')),
+    l1_max_entries=int(os.getenv('CACHE_L1_MAX_ENTRIES', '1000')),
+)
+
+# Public lead forms: 'direct' inserts on the request, 'spool' appends to a
+# write-behind spool drained by `manage.py drain_lead_spool` (theme.spool).
+# In deployment LEAD_SPOOL_PATH must be on a persistent volume.
+LEAD_INGESTION = os.getenv('LEAD_INGESTION', 'direct')
+LEAD_SPOOL_PATH = os.getenv('LEAD_SPOOL_PATH', str(BASE_DIR / 'lead_spool.sqlite3'))
+
+# Budgets for the public write endpoints, name -> (requests, seconds) per
+# client IP and project; overrides theme.ratelimit.DEFAULT_RATE_LIMITS.
+# The counters live in the default cache: with the locmem default every
+# worker process keeps its own, multiplying each budget by the worker
+# count, so production needs a shared CACHE_URL (redis://).
+RATE_LIMITS = {}
+# Reverse proxies in front of the app that append to X-Forwarded-For
+# (Railway's edge is one); the client IP is read that many hops from the
+# right. 0 ignores the header and uses REMOTE_ADDR.
+TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '1'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
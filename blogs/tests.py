@@ -1,4 +1,5 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.urls import reverse
 from .models import Blog, Tag
 
 class BlogModelTest(TestCase):
@@ -8,3 +9,12 @@ class BlogModelTest(TestCase):
         blog.tags.add(tag)
         self.assertTrue(blog.slug.startswith("test-blog-title"))
         self.assertIn(tag, blog.tags.all())
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class BlogSearchTest(TestCase):
+    def test_search_form_and_results(self):
+        Blog.objects.create(title="Buying land in Kolkata", content="<p>Checklist</p>")
+        Blog.objects.create(title="Home loans explained", content="<p>Rates</p>")
+        response = self.client.get(reverse('blog_list'), {'q': "kolk"})
+        self.assertContains(response, 'name="q" value="kolk"')
+        self.assertEqual([blog.title for blog in response.context['blogs']], ["Buying land in Kolkata"])
@@ -1,9 +1,18 @@
 from django.shortcuts import render, get_object_or_404
+from theme import fulltext
+from theme.replica import read_from_replica
 from .models import Blog
 
+@read_from_replica
 def blog_list(request):
+    search_query = request.GET.get('q', '').strip()
     blogs = Blog.objects.filter(is_published=True).order_by('-created_at')
-    return render(request, 'blogs/blog_list.html', {'blogs': blogs})
+    if search_query:
+        # Most relevant posts first
+        ranked_ids = fulltext.search('blog', search_query)
+        published = blogs.in_bulk(ranked_ids)
+        blogs = [published[blog_id] for blog_id in ranked_ids if blog_id in published]
+    return render(request, 'blogs/blog_list.html', {'blogs': blogs, 'search_query': search_query})
 
 def blog_detail(request, slug):
     blog = get_object_or_404(Blog, slug=slug, is_published=True)
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Career, CareerApplication
+from theme.exports import EXPORT_ACTIONS
 
 @admin.register(Career)
 class CareerAdmin(admin.ModelAdmin):
@@ -10,6 +11,7 @@ class CareerAdmin(admin.ModelAdmin):
 
 @admin.register(CareerApplication)
 class CareerApplicationAdmin(admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
     list_display = ("name", "email", "career", "applied_at")
     list_filter = ("career",)
     search_fields = ("name", "email", "phone", "career__title")
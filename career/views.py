@@ -1,7 +1,9 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from theme.replica import read_from_replica
 from .models import Career
 from .forms import CareerApplicationForm
 
+@read_from_replica
 def career_list(request):
     careers = Career.objects.filter(is_active=True).order_by('-created_at')
     return render(request, 'career/career_list.html', {'careers': careers})
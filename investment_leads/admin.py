@@ -2,11 +2,14 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from .models import InvestmentRequirement
+from theme.admin_mixins import LeadContactMixin
+from theme.exports import EXPORT_ACTIONS
 
 
 @admin.register(InvestmentRequirement)
-class InvestmentRequirementAdmin(admin.ModelAdmin):
-    list_display = ['name', 'contact_number', 'budget', 'requirement_type', 'how_did_you_know', 'created_at', 'action_buttons']
+class InvestmentRequirementAdmin(LeadContactMixin, admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
+    list_display = ['name', 'contact_number', 'budget', 'requirement_type', 'how_did_you_know', 'contact_leads', 'created_at', 'action_buttons']
     list_filter = ['requirement_type', 'how_did_you_know', 'agreed_to_terms', 'created_at']
     search_fields = ['name', 'contact_number', 'location']
     ordering = ['-created_at']
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.2 on 2026-10-18 09:15
+
+import hashlib
+import re
+
+from django.db import migrations, models
+
+
+# Key derivation as of this migration (theme.dedupe at the time)
+def normalize_phone(value):
+    value = (value or '').strip()
+    digits = re.sub(r'\D', '', value)
+    if not digits:
+        return ''
+    if value.startswith('+'):
+        return f'+{digits}'
+    if digits.startswith('00'):
+        return f'+{digits[2:]}'
+    digits = digits.lstrip('0')
+    if len(digits) == 10:
+        return f'+91{digits}'
+    return f'+{digits}'
+
+
+def hash_key(normalized):
+    if not normalized:
+        return ''
+    return hashlib.sha256(normalized.encode()).hexdigest()[:32]
+
+
+def backfill_keys(model, phone_field, batch_size=500):
+    batch = []
+    for row in model.objects.order_by('pk').iterator(chunk_size=batch_size):
+        row.phone_key = hash_key(normalize_phone(getattr(row, phone_field)))
+        row.email_key = hash_key((row.email or '').strip().lower())
+        batch.append(row)
+        if len(batch) >= batch_size:
+            model.objects.bulk_update(batch, ['phone_key', 'email_key'])
+            batch = []
+    model.objects.bulk_update(batch, ['phone_key', 'email_key'])
+
+
+def fill_keys(apps, schema_editor):
+    backfill_keys(apps.get_model('investment_leads', 'InvestmentRequirement'), 'contact_number')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment_leads', '0003_alter_investmentrequirement_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='investmentrequirement',
+            name='email_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='investmentrequirement',
+            name='phone_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=32),
+        ),
+        migrations.RunPython(fill_keys, migrations.RunPython.noop),
+    ]
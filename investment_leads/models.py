@@ -31,6 +31,9 @@ class InvestmentRequirement(models.Model):
     how_did_you_know = models.CharField(max_length=20, choices=HOW_DID_YOU_KNOW_CHOICES, blank=True, null=True, verbose_name="How did you get to know about us?")
     agreed_to_terms = models.BooleanField(default=False, verbose_name="Agreed to Terms")
     created_at = models.DateTimeField(auto_now_add=True)
+    # Hashed normalized phone/email for duplicate matching (theme.dedupe)
+    phone_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
+    email_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
 
     def __str__(self):
         return f"{self.name} - {self.get_requirement_type_display()}"
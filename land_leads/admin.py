@@ -2,11 +2,14 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from .models import LandRequirement
+from theme.admin_mixins import LeadContactMixin
+from theme.exports import EXPORT_ACTIONS
 
 
 @admin.register(LandRequirement)
-class LandRequirementAdmin(admin.ModelAdmin):
-    list_display = ['name', 'contact_number', 'budget', 'requirement_type', 'status_badge', 'created_at', 'action_buttons']
+class LandRequirementAdmin(LeadContactMixin, admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
+    list_display = ['name', 'contact_number', 'budget', 'requirement_type', 'status_badge', 'contact_leads', 'created_at', 'action_buttons']
     list_filter = ['requirement_type', 'area_unit', 'status', 'agreed_to_terms', 'created_at']
     search_fields = ['name', 'contact_number', 'location']
     ordering = ['-created_at']
@@ -35,6 +35,9 @@ class LandRequirement(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new')
     agreed_to_terms = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Hashed normalized phone/email for duplicate matching (theme.dedupe)
+    phone_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
+    email_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
 
     def __str__(self):
         return f"{self.name} - {self.contact_number}"
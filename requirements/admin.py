@@ -1,10 +1,13 @@
 from django.contrib import admin
 from .models import Requirement
+from theme.admin_mixins import LeadContactMixin
+from theme.exports import EXPORT_ACTIONS
 
 
 @admin.register(Requirement)
-class RequirementAdmin(admin.ModelAdmin):
-    list_display = ['name', 'contact_number', 'requirement_type', 'property_type', 'location', 'budget', 'created_at']
+class RequirementAdmin(LeadContactMixin, admin.ModelAdmin):
+    actions = EXPORT_ACTIONS
+    list_display = ['name', 'contact_number', 'requirement_type', 'property_type', 'location', 'budget', 'contact_leads', 'created_at']
     list_filter = ['requirement_type', 'property_type', 'budget_range', 'created_at']
     search_fields = ['name', 'contact_number', 'email', 'location']
     readonly_fields = ['created_at']
@@ -41,6 +41,9 @@ class Requirement(models.Model):
     specific_requirements = models.TextField(blank=True, null=True)
     agreed_to_terms = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Hashed normalized phone/email for duplicate matching (theme.dedupe)
+    phone_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
+    email_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
 
     def __str__(self):
         return f"{self.name} - {self.get_requirement_type_display()} {self.get_property_type_display()}"
@@ -1,5 +1,10 @@
 from django.contrib import admin
-from .models import SiteConfig, ContactForm, Developer
+from django.urls import reverse
+from django.utils.html import format_html
+from .models import SiteConfig, ContactForm, Developer, Lead, LeadContact
+from .admin_mixins import LeadContactMixin, QueryBudgetMixin
+from .exports import EXPORT_ACTIONS
+from .leads import normalize_email, normalize_phone
 
 
 @admin.register(Developer)
@@ -34,10 +39,12 @@ class DeveloperAdmin(admin.ModelAdmin):
 
 
 @admin.register(ContactForm)
-class ContactFormAdmin(admin.ModelAdmin):
+class ContactFormAdmin(LeadContactMixin, admin.ModelAdmin):
     """Admin configuration for ContactForm model"""
     
-    list_display = ('name', 'email', 'phone', 'subject', 'submitted_at', 'is_read')
+    actions = EXPORT_ACTIONS
+    
+    list_display = ('name', 'email', 'phone', 'subject', 'contact_leads', 'submitted_at', 'is_read')
     list_filter = ('is_read', 'submitted_at')
     search_fields = ('name', 'email', 'phone', 'subject')
     readonly_fields = ('submitted_at',)
@@ -105,3 +112,70 @@ class SiteConfigAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         """Prevent deletion of SiteConfig"""
         return False
+
+
+@admin.register(Lead)
+class LeadAdmin(QueryBudgetMixin, admin.ModelAdmin):
+    """Read-only timeline of leads from every source"""
+    
+    list_display = ('created_at', 'source', 'name', 'phone', 'email', 'project', 'status', 'contact_leads')
+    list_filter = ('source', 'status')
+    search_fields = ('name',)
+    date_hierarchy = 'created_at'
+    list_select_related = ('project', 'contact')
+    show_full_result_count = False
+    
+    def contact_leads(self, obj):
+        if obj.contact is None:
+            return '-'
+        return format_html(
+            '<a href="?contact__id__exact={}">{} leads</a>', obj.contact_id, obj.contact.lead_count
+        )
+    contact_leads.short_description = '👥 Contact Leads'
+    contact_leads.admin_order_field = 'contact__lead_count'
+    
+    def lookup_allowed(self, lookup, value, request=None):
+        # The contact links filter on it; a list_filter would load every contact
+        if lookup == 'contact__id__exact':
+            return True
+        return super().lookup_allowed(lookup, value, request)
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Phone numbers and emails are matched exactly on their indexes"""
+        term = search_term.strip()
+        if '@' in term:
+            return queryset.filter(email=normalize_email(term)), False
+        if sum(char.isdigit() for char in term) >= 10:
+            return queryset.filter(phone=normalize_phone(term)), False
+        return super().get_search_results(request, queryset, search_term)
+    
+    def has_add_permission(self, request):
+        """Leads are indexed from their source tables"""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(LeadContact)
+class LeadContactAdmin(QueryBudgetMixin, admin.ModelAdmin):
+    """People behind the leads, as clustered by the lead matcher"""
+    
+    list_display = ('name', 'lead_count', 'sources', 'first_seen', 'last_seen', 'leads_link')
+    list_filter = ('last_seen',)
+    search_fields = ('name',)
+    ordering = ('-last_seen',)
+    show_full_result_count = False
+    
+    def leads_link(self, obj):
+        return format_html(
+            '<a href="{}?contact__id__exact={}">View leads</a>', reverse('admin:theme_lead_changelist'), obj.pk
+        )
+    leads_link.short_description = 'Leads'
+    
+    def has_add_permission(self, request):
+        """Contacts are created by the lead matcher"""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,76 @@
+"""
+Admin helpers shared by the apps.
+
+LeadContactMixin shows contact-level lead aggregates on lead changelists.
+
+QueryBudgetMixin counts the SQL queries a changelist page runs and
+complains when a page goes over ``changelist_query_budget``: an
+AssertionError under DEBUG (so an N+1 column is caught while developing
+and in the tests), a logged warning in production.
+"""
+import logging
+
+from django.conf import settings
+from django.db import connection
+from django.utils.html import format_html
+
+from .leads import annotate_contact
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    """connection.execute_wrapper callable that counts queries"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMixin:
+    # Queries allowed for one changelist page, whatever the number of rows
+    changelist_query_budget = 12
+
+    def changelist_view(self, request, extra_context=None):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = super().changelist_view(request, extra_context)
+            # The result list is evaluated while the template renders
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+
+        if counter.count > self.changelist_query_budget:
+            message = (
+                f'{type(self).__name__} changelist ran {counter.count} queries '
+                f'(budget {self.changelist_query_budget})'
+            )
+            if settings.DEBUG:
+                raise AssertionError(message)
+            logger.warning(message)
+        return response
+
+
+class LeadContactMixin:
+    """
+    Adds a sortable 'contact_leads' column for lead models: how many leads
+    the same person (theme.dedupe contact) has left across all sources.
+    Read from the precomputed LeadContact row with one subquery per page.
+    """
+
+    def get_queryset(self, request):
+        return annotate_contact(super().get_queryset(request))
+
+    def contact_leads(self, obj):
+        if not obj.contact_lead_count:
+            return '-'
+        sources = ', '.join(obj.contact_sources.split(','))
+        return format_html(
+            '<span title="{}" style="background-color: #6f42c1; color: white; padding: 2px 8px; border-radius: 12px; font-size: 11px;">{} leads</span>',
+            sources, obj.contact_lead_count
+        )
+    contact_leads.short_description = '👥 Contact Leads'
+    contact_leads.admin_order_field = 'contact_lead_count'
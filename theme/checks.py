@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches)
+def shared_cache_check(app_configs, **kwargs):
+    """Locks, counters and rate limits are per process on locmem"""
+    if settings.DEBUG or 'LocMemCache' not in settings.CACHES['default']['BACKEND']:
+        return []
+    return [Warning(
+        'The default cache is per-process memory.',
+        hint=(
+            'Job and matcher locks, buffered view counts and rate limits are not shared '
+            'between web workers and background processes; set CACHE_URL=redis://...'
+        ),
+        id='theme.W001',
+    )]
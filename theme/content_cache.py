@@ -0,0 +1,89 @@
+import time
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+
+# Versions and versioned content live on the 'content' alias, which keeps
+# an in-process copy of shared entries (see Source/caches.py)
+cache = ConnectionProxy(caches, 'content')
+
+# get_or_build: an expired or outdated entry is still served for this long
+# while one request rebuilds it (stale-while-revalidate)
+STALE_TIMEOUT = 60 * 5
+BUILD_LOCK_TIMEOUT = 30
+# A cold miss waits up to BUILD_WAIT_TRIES * BUILD_WAIT seconds for another
+# request's build before building itself
+BUILD_WAIT = 0.05
+BUILD_WAIT_TRIES = 20
+
+# How long rendered homepage fragments live when nothing is edited. Content
+# changes bump the version instead, so this only bounds staleness of the
+# view-count driven "trending" ordering.
+HOME_FRAGMENT_TIMEOUT = 60 * 15
+
+HOME_CONTENT = 'home'
+SEARCH_CONTENT = 'search'
+# Shared by every project detail page (cities, categories, amenities, ...)
+PROJECT_DETAIL_CONTENT = 'project_detail'
+
+
+def project_content(project_id):
+    """Namespace for one project's detail page"""
+    return f'project:{project_id}'
+
+
+def _version_key(namespace):
+    return f'content_version:{namespace}'
+
+
+def get_content_version(namespace):
+    """Return the current content version for a cache namespace"""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        # add() so concurrent first requests agree on a single version
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_content_version(namespace):
+    """Invalidate every fragment keyed on this namespace's version"""
+    cache.set(_version_key(namespace), time.time_ns(), timeout=None)
+
+
+def get_or_build(key, build, timeout, version=None):
+    """
+    Cached result of build(), rebuilt by one request at a time.
+
+    The entry remembers the `version` (e.g. a content version) it was built
+    for. Once it expires or is outdated, the request that takes the build
+    lock rebuilds it while concurrent requests keep serving the old value;
+    only a cold miss waits for the builder.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version and entry[1] > time.time():
+        return entry[2]
+
+    # Atomic on locmem/Redis; on a file content store two requests may
+    # occasionally both rebuild, which only costs the extra render
+    lock_key = f'{key}:building'
+    if not cache.add(lock_key, True, BUILD_LOCK_TIMEOUT):
+        if entry is not None:
+            return entry[2]
+        for _ in range(BUILD_WAIT_TRIES):
+            time.sleep(BUILD_WAIT)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[2]
+        # The builder is slow or gone; build without storing
+        return build()
+
+    try:
+        value = build()
+        cache.set(key, (version, time.time() + timeout, value), timeout + STALE_TIMEOUT)
+        return value
+    finally:
+        cache.delete(lock_key)
@@ -4,7 +4,7 @@ from .models import SiteConfig
 def site_config(request):
     """Context processor to make site configuration available in all templates"""
     try:
-        config = SiteConfig.get_config()
+        config = SiteConfig.get_cached_config()
         return {
             'site_config': config
         }
@@ -0,0 +1,167 @@
+"""
+Lead de-duplication.
+
+Phones (E.164, Indian numbers by default) and emails (lower-cased) are
+normalized and hashed into fixed-length keys. Every lead model stores its
+``phone_key``/``email_key`` (set on save, see theme.signals), and so does
+the unified Lead index. The keys are indexed, so "other leads from this
+person" is an equality lookup whatever the spelling of the number.
+
+The background matcher (``theme.match_leads`` job, ``match_leads``
+command) walks Lead rows not yet assigned to a LeadContact and clusters
+them: leads sharing a phone or email key belong to the same contact, and
+contacts linked by a new lead are merged. Each LeadContact keeps its lead
+count, sources and first/last seen dates, so admins show contact-level
+aggregates without counting per row.
+"""
+import hashlib
+import re
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from .jobs import enqueue
+from .models import Lead, LeadContact
+
+
+DEFAULT_COUNTRY_CODE = '91'
+
+MATCH_LOCK_KEY = 'lead_matcher_running'
+MATCH_LOCK_TIMEOUT = 60 * 10
+# New leads are matched by one job per window, shortly after it closes
+MATCH_WINDOW = 60
+
+
+def normalize_phone(value):
+    """
+    E.164 for Indian numbers: '098765 43210', '+91-98765-43210' and
+    '9876543210' all become '+919876543210'. Numbers with another
+    country code keep it; junk without digits becomes ''.
+    """
+    value = (value or '').strip()
+    digits = re.sub(r'\D', '', value)
+    if not digits:
+        return ''
+    if value.startswith('+'):
+        return f'+{digits}'
+    if digits.startswith('00'):
+        return f'+{digits[2:]}'
+    digits = digits.lstrip('0')
+    if len(digits) == 10:
+        return f'+{DEFAULT_COUNTRY_CODE}{digits}'
+    return f'+{digits}'
+
+
+def normalize_email(value):
+    return (value or '').strip().lower()
+
+
+def hash_key(normalized):
+    """Index key for a normalized value ('' stays '')"""
+    if not normalized:
+        return ''
+    return hashlib.sha256(normalized.encode()).hexdigest()[:32]
+
+
+def phone_key(value):
+    return hash_key(normalize_phone(value))
+
+
+def email_key(value):
+    return hash_key(normalize_email(value))
+
+
+def queue_matching():
+    """Schedule the matcher for the current window (one job per window)"""
+    now = timezone.now()
+    window = int(now.timestamp()) // MATCH_WINDOW
+    delay = (window + 1) * MATCH_WINDOW - now.timestamp()
+    enqueue('theme.match_leads', key=f'match_leads:{window}', delay=delay)
+
+
+def match_leads(batch_size=500):
+    """
+    Assign unmatched leads to contacts; returns how many were matched.
+
+    Each batch's Lead rows are locked in the database (FOR UPDATE SKIP
+    LOCKED), so concurrent matchers never assign the same lead. SQLite has
+    no row locks; there the cache lock keeps to one matcher at a time. A
+    skipped run leaves its leads for the next one.
+    """
+    if not cache.add(MATCH_LOCK_KEY, True, MATCH_LOCK_TIMEOUT):
+        return 0
+    try:
+        matched = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    Lead.objects.filter(contact__isnull=True).select_for_update(skip_locked=True)
+                    .order_by('id')[:batch_size]
+                )
+                if not batch:
+                    break
+                touched = {_match_lead(lead) for lead in batch}
+                refresh_contacts(touched)
+            matched += len(batch)
+        return matched
+    finally:
+        cache.delete(MATCH_LOCK_KEY)
+
+
+def _match_lead(lead):
+    """Attach one lead to its contact, merging contacts it links; returns the contact id"""
+    keys = Q()
+    if lead.phone_key:
+        keys |= Q(phone_key=lead.phone_key)
+    if lead.email_key:
+        keys |= Q(email_key=lead.email_key)
+    contact_ids = set()
+    if keys:
+        contact_ids = set(
+            Lead.objects.filter(keys, contact__isnull=False).values_list('contact_id', flat=True).distinct()
+        )
+
+    if not contact_ids:
+        contact_id = LeadContact.objects.create().pk
+    else:
+        contact_id = min(contact_ids)
+        merged = contact_ids - {contact_id}
+        if merged:
+            Lead.objects.filter(contact_id__in=merged).update(contact_id=contact_id)
+            LeadContact.objects.filter(pk__in=merged).delete()
+    Lead.objects.filter(pk=lead.pk).update(contact_id=contact_id)
+    return contact_id
+
+
+def refresh_contacts(contact_ids):
+    """Recompute the aggregates of the given contacts with two grouped queries"""
+    contact_ids = set(contact_ids)
+    stats = {
+        row['contact_id']: row for row in
+        Lead.objects.filter(contact_id__in=contact_ids).values('contact_id')
+        .annotate(total=Count('id'), first=Min('created_at'), last=Max('created_at')).order_by()
+    }
+    sources, names = {}, {}
+    for contact_id, source, name in (
+        Lead.objects.filter(contact_id__in=contact_ids).order_by('created_at', 'id')
+        .values_list('contact_id', 'source', 'name')
+    ):
+        sources.setdefault(contact_id, set()).add(source)
+        names[contact_id] = name
+
+    # Contacts left without leads (their leads were deleted) go away
+    LeadContact.objects.filter(pk__in=contact_ids - set(stats)).delete()
+    contacts = list(LeadContact.objects.filter(pk__in=stats))
+    for contact in contacts:
+        row = stats[contact.pk]
+        contact.lead_count = row['total']
+        contact.first_seen = row['first']
+        contact.last_seen = row['last']
+        contact.sources = ','.join(sorted(sources[contact.pk]))
+        contact.name = names[contact.pk]
+        contact.updated_at = timezone.now()
+    LeadContact.objects.bulk_update(
+        contacts, ['lead_count', 'first_seen', 'last_seen', 'sources', 'name', 'updated_at'],
+    )
@@ -0,0 +1,250 @@
+"""
+Streaming lead exports.
+
+Each exportable model is listed in EXPORTS with the columns to write, the
+timestamp used for date-range filters and, where the model has one, its
+status field. Rows are read with ``values_list(...).iterator(chunk_size)``
+so memory stays flat however many leads are exported:
+
+    queryset = export_queryset('land_leads.LandRequirement', since=date(2024, 1, 1), status='new')
+    for row in export_rows(queryset):
+        ...
+
+CSV is streamed straight into a StreamingHttpResponse (admin action) or a
+file (``export_leads`` command). XLSX uses openpyxl's write-only workbook.
+
+Lead values come from public forms. In CSV, text that a spreadsheet would
+read as a formula (starting with =, +, -, @, tab or CR) is prefixed with a
+quote; XLSX text cells are always written as strings, so values stay as
+they are there.
+"""
+import csv
+import datetime
+import tempfile
+
+from django.apps import apps
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import capfirst
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+FORMATS = ('csv', 'xlsx')
+
+# Model label -> columns (field paths), date field, status field and,
+# for boolean status fields, the accepted status names
+EXPORTS = {
+    'land_leads.LandRequirement': {
+        'fields': ['id', 'name', 'email', 'contact_number', 'location', 'budget', 'area', 'area_unit',
+                   'requirement_type', 'status', 'agreed_to_terms', 'created_at'],
+        'date_field': 'created_at',
+        'status_field': 'status',
+    },
+    'investment_leads.InvestmentRequirement': {
+        'fields': ['id', 'name', 'email', 'contact_number', 'location', 'budget', 'requirement_type',
+                   'how_did_you_know', 'agreed_to_terms', 'created_at'],
+        'date_field': 'created_at',
+    },
+    'requirements.Requirement': {
+        'fields': ['id', 'name', 'email', 'contact_number', 'location', 'budget', 'budget_range',
+                   'requirement_type', 'property_type', 'area_needed', 'specific_requirements',
+                   'agreed_to_terms', 'created_at'],
+        'date_field': 'created_at',
+    },
+    'theme.ContactForm': {
+        'fields': ['id', 'name', 'email', 'phone', 'subject', 'message', 'is_read', 'submitted_at'],
+        'date_field': 'submitted_at',
+        'status_field': 'is_read',
+        'status_values': {'read': True, 'unread': False},
+    },
+    'Projects.FloorPlanAccess': {
+        'fields': ['id', 'project__name', 'name', 'email', 'phone', 'message', 'ip_address', 'accessed_at'],
+        'date_field': 'accessed_at',
+    },
+    'Projects.ProjectInquiry': {
+        'fields': ['id', 'project__name', 'name', 'email', 'phone', 'interest', 'message', 'ip_address', 'created_at'],
+        'date_field': 'created_at',
+    },
+    'career.CareerApplication': {
+        'fields': ['id', 'career__title', 'name', 'email', 'phone', 'cover_letter', 'resume', 'applied_at'],
+        'date_field': 'applied_at',
+    },
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def get_spec(model):
+    label = model if isinstance(model, str) else model._meta.label
+    try:
+        return label, EXPORTS[label]
+    except KeyError:
+        raise ExportError(f'{label} is not exportable; choose one of: {", ".join(EXPORTS)}')
+
+
+def status_choices(model):
+    """Status names accepted by export_queryset for a model (empty if none)"""
+    label, spec = get_spec(model)
+    if 'status_values' in spec:
+        return list(spec['status_values'])
+    if 'status_field' in spec:
+        field = apps.get_model(label)._meta.get_field(spec['status_field'])
+        return [value for value, _ in field.flatchoices]
+    return []
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def export_queryset(model, since=None, until=None, status=None, queryset=None):
+    """
+    Rows of `model` to export, oldest first.
+
+    `since`/`until` are inclusive dates; `status` is one of status_choices().
+    `queryset` narrows an existing selection (admin actions).
+    """
+    label, spec = get_spec(model)
+    if queryset is None:
+        queryset = apps.get_model(label)._default_manager.all()
+    date_field = spec['date_field']
+    # Whole local days, as datetime bounds so the column's index is usable
+    if since:
+        queryset = queryset.filter(**{f'{date_field}__gte': _start_of_day(since)})
+    if until:
+        queryset = queryset.filter(**{f'{date_field}__lt': _start_of_day(until + datetime.timedelta(days=1))})
+    if status:
+        if status not in status_choices(label):
+            raise ExportError(f'Unknown status {status!r} for {label}')
+        value = spec.get('status_values', {}).get(status, status)
+        queryset = queryset.filter(**{spec['status_field']: value})
+    return queryset.order_by(date_field, 'pk')
+
+
+def escape_formula(value):
+    """Keep spreadsheets from evaluating submitted text such as '=HYPERLINK(...)'"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _column(model, path):
+    """(header, formatter) for a field path such as 'project__name'"""
+    field = None
+    for part in path.split('__'):
+        field = model._meta.get_field(part)
+        model = field.related_model
+    header = capfirst(path.replace('__', ' ').replace('_', ' ') if '__' in path else field.verbose_name)
+    labels = dict(field.flatchoices) if field.choices else None
+
+    def format_value(value):
+        if value is None:
+            return ''
+        if labels is not None:
+            return str(labels.get(value, value))
+        if isinstance(value, datetime.datetime):
+            return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S') if timezone.is_aware(value) else value.isoformat(' ')
+        if isinstance(value, bool):
+            return 'Yes' if value else 'No'
+        return value
+    return header, format_value
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Header row, then one formatted row per object, read in chunks"""
+    _, spec = get_spec(queryset.model)
+    columns = [_column(queryset.model, path) for path in spec['fields']]
+    yield [header for header, _ in columns]
+    formatters = [format_value for _, format_value in columns]
+    for values in queryset.values_list(*spec['fields']).iterator(chunk_size=chunk_size):
+        yield [format_value(value) for format_value, value in zip(formatters, values)]
+
+
+class Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield '\ufeff'  # BOM so Excel opens UTF-8 names correctly
+    for row in rows:
+        yield writer.writerow([escape_formula(value) for value in row])
+
+
+def write_csv(rows, stream):
+    for line in csv_lines(rows):
+        stream.write(line)
+
+
+def _xlsx_cell(sheet, value):
+    if not isinstance(value, str):
+        return value
+    cell = WriteOnlyCell(sheet, value=value)
+    # openpyxl would store any text starting with '=' as a formula
+    cell.data_type = 's'
+    return cell
+
+
+def write_xlsx(rows, stream, title='Export'):
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31])
+    for row in rows:
+        sheet.append([_xlsx_cell(sheet, value) for value in row])
+    workbook.save(stream)
+
+
+def export_filename(model, fmt):
+    return f'{model._meta.model_name}-{timezone.localdate():%Y%m%d}.{fmt}'
+
+
+def export_response(queryset, fmt='csv'):
+    """HTTP download of an export; CSV streams row by row"""
+    filename = export_filename(queryset.model, fmt)
+    rows = export_rows(queryset)
+    if fmt == 'csv':
+        response = StreamingHttpResponse(csv_lines(rows), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    if fmt == 'xlsx':
+        # The write-only workbook spills rows to disk; the zip is assembled
+        # in a temporary file and streamed from there
+        output = tempfile.TemporaryFile()
+        write_xlsx(rows, output, title=str(queryset.model._meta.verbose_name_plural))
+        output.seek(0)
+        return FileResponse(
+            output, as_attachment=True, filename=filename,
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+    raise ExportError(f'Unknown export format {fmt!r}')
+
+
+def export_as_csv(modeladmin, request, queryset):
+    """Admin action: the selected rows (with the changelist's filters) as CSV"""
+    try:
+        return export_response(export_queryset(queryset.model, queryset=queryset), 'csv')
+    except ExportError as error:
+        modeladmin.message_user(request, str(error), level='error')
+export_as_csv.short_description = '📥 Export selected to CSV'
+
+
+def export_as_xlsx(modeladmin, request, queryset):
+    """Admin action: the selected rows as an Excel workbook"""
+    try:
+        return export_response(export_queryset(queryset.model, queryset=queryset), 'xlsx')
+    except ExportError as error:
+        modeladmin.message_user(request, str(error), level='error')
+export_as_xlsx.short_description = '📥 Export selected to Excel'
+
+
+EXPORT_ACTIONS = [export_as_csv, export_as_xlsx]
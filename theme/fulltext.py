@@ -0,0 +1,220 @@
+"""
+Full-text search for projects and blog posts.
+
+The backend is picked from the database vendor:
+
+* SQLite: an FTS5 virtual table per document type, kept in sync by the
+  signals in theme.signals and ranked with bm25().
+* PostgreSQL: a GIN expression index over to_tsvector(), ranked with
+  ts_rank().
+* Anything else: plain icontains matching in creation order.
+
+All backends match every word of the query as a prefix, so "sky res"
+finds "Skyline Residency".
+
+The tables and indexes are created by theme migration 0010, which keeps
+its own copy of DOCUMENTS; changing a document's fields or weights needs a
+new migration.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from Projects.models import Project
+from blogs.models import Blog
+
+
+class Document:
+    """A searchable model: its table, text columns and their weights"""
+
+    def __init__(self, name, model, fields, weights):
+        self.name = name
+        self.model = model
+        self.fields = fields
+        self.weights = weights
+
+    @property
+    def table(self):
+        return self.model._meta.db_table
+
+    @property
+    def index_name(self):
+        return f'fulltext_{self.name}'
+
+    def columns(self):
+        return [self.model._meta.get_field(field).column for field in self.fields]
+
+
+DOCUMENTS = {
+    'project': Document(
+        'project', Project,
+        fields=['name', 'project_by', 'location', 'developers'],
+        weights=[10.0, 5.0, 3.0, 3.0],
+    ),
+    'blog': Document(
+        'blog', Blog,
+        fields=['title', 'meta_description', 'content'],
+        weights=[10.0, 4.0, 1.0],
+    ),
+}
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+# Upper bound on ids returned by one search
+MAX_RESULTS = 1000
+
+
+def query_terms(query):
+    return _WORD.findall(query or '')[:16]
+
+
+class IContainsBackend:
+    """Portable fallback: substring matching, newest first"""
+
+    def update(self, document, instance):
+        pass
+
+    def remove(self, document, pk):
+        pass
+
+    def rebuild(self, document):
+        pass
+
+    def search(self, document, query, limit=MAX_RESULTS):
+        terms = query_terms(query)
+        if not terms:
+            return []
+        condition = Q()
+        for term in terms:
+            term_condition = Q()
+            for field in document.fields:
+                term_condition |= Q(**{f'{field}__icontains': term})
+            condition &= term_condition
+        return list(
+            document.model._default_manager.filter(condition)
+            .order_by('-pk').values_list('pk', flat=True)[:limit]
+        )
+
+
+class SQLiteFTS5Backend(IContainsBackend):
+    """FTS5 virtual table holding a copy of the text columns"""
+
+    def _populate(self, execute, document):
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(column) for column in document.columns())
+        execute(f'DELETE FROM {quote(document.index_name)}')
+        execute(
+            f'INSERT INTO {quote(document.index_name)} (rowid, {columns}) '
+            f'SELECT {quote(document.model._meta.pk.column)}, {columns} FROM {quote(document.table)}'
+        )
+
+    def update(self, document, instance):
+        quote = connection.ops.quote_name
+        columns = document.columns()
+        placeholders = ', '.join(['%s'] * (len(columns) + 1))
+        values = [instance.pk] + [getattr(instance, field) or '' for field in document.fields]
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {quote(document.index_name)} WHERE rowid = %s', [instance.pk])
+            cursor.execute(
+                f'INSERT INTO {quote(document.index_name)} '
+                f'(rowid, {", ".join(quote(column) for column in columns)}) VALUES ({placeholders})',
+                values,
+            )
+
+    def remove(self, document, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {connection.ops.quote_name(document.index_name)} WHERE rowid = %s', [pk]
+            )
+
+    def rebuild(self, document):
+        with connection.cursor() as cursor:
+            self._populate(cursor.execute, document)
+
+    def search(self, document, query, limit=MAX_RESULTS):
+        terms = query_terms(query)
+        if not terms:
+            return []
+        # Each term quoted (no FTS5 syntax injection) and matched as a prefix
+        match = ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+        weights = ', '.join(str(weight) for weight in document.weights)
+        table = connection.ops.quote_name(document.index_name)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {table} WHERE {table} MATCH %s '
+                f'ORDER BY bm25({table}, {weights}) LIMIT %s',
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresBackend(IContainsBackend):
+    """to_tsvector() over the text columns, backed by a GIN expression index"""
+
+    config = 'simple'
+    # ts_rank weight labels, best first
+    labels = 'ABCD'
+
+    def _vector(self, document, quote):
+        parts = []
+        for column, label in zip(document.columns(), self._labels(document)):
+            parts.append(
+                f"setweight(to_tsvector('{self.config}', coalesce({quote(column)}, '')), '{label}')"
+            )
+        return ' || '.join(parts)
+
+    def _labels(self, document):
+        ranked = sorted(range(len(document.weights)), key=lambda i: -document.weights[i])
+        labels = [None] * len(ranked)
+        for position, i in enumerate(ranked):
+            labels[i] = self.labels[min(position, len(self.labels) - 1)]
+        return labels
+
+    def search(self, document, query, limit=MAX_RESULTS):
+        terms = query_terms(query)
+        if not terms:
+            return []
+        quote = connection.ops.quote_name
+        vector = self._vector(document, quote)
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {quote(document.model._meta.pk.column)} FROM {quote(document.table)} "
+                f"WHERE ({vector}) @@ to_tsquery('{self.config}', %s) "
+                f"ORDER BY ts_rank({vector}, to_tsquery('{self.config}', %s)) DESC LIMIT %s",
+                [tsquery, tsquery, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+def get_backend(vendor=None):
+    vendor = vendor or connection.vendor
+    if vendor == 'sqlite':
+        return SQLiteFTS5Backend()
+    if vendor == 'postgresql':
+        return PostgresBackend()
+    return IContainsBackend()
+
+
+def search(name, query, limit=MAX_RESULTS):
+    """Primary keys of `name` documents matching query, most relevant first"""
+    return get_backend().search(DOCUMENTS[name], query, limit)
+
+
+def update_document(instance):
+    for document in DOCUMENTS.values():
+        if isinstance(instance, document.model):
+            get_backend().update(document, instance)
+
+
+def remove_document(instance):
+    for document in DOCUMENTS.values():
+        if isinstance(instance, document.model):
+            get_backend().remove(document, instance.pk)
+
+
+def rebuild():
+    backend = get_backend()
+    for document in DOCUMENTS.values():
+        backend.rebuild(document)
@@ -0,0 +1,131 @@
+from django.db.models import Case, CharField, F, Q, Value, When, Window
+from django.db.models.functions import RowNumber
+from django.utils.functional import SimpleLazyObject
+
+from Projects.models import Project
+
+
+# Number of projects shown in each homepage carousel
+CAROUSEL_LIMITS = {
+    'featured_projects': 6,
+    'trending_projects': 8,
+    'ready_to_move_projects': 8,
+    'recently_viewed_projects': 8,
+    'hot_deal_projects': 8,
+    'premium_projects': 8,
+    'editors_choice_projects': 8,
+    'residential_projects': 10,
+    'commercial_projects': 10,
+}
+CATEGORY_CAROUSEL_LIMIT = 6
+
+
+def _newest_first():
+    return [F('created_at').desc(), F('id').desc()]
+
+
+def _rank(partition_by=None, order_by=None):
+    """Row number of a project inside one carousel partition"""
+    return Window(
+        RowNumber(),
+        partition_by=partition_by,
+        order_by=order_by or _newest_first(),
+    )
+
+
+def get_home_candidates():
+    """
+    Fetch every active project that appears in at least one homepage carousel.
+
+    Each carousel is expressed as a ROW_NUMBER() window over its own partition,
+    so a single bounded query returns the top-N rows of every carousel
+    (including one per category) no matter how many categories exist.
+    """
+    category_group = Case(
+        When(category__name__icontains='residential', then=Value('residential')),
+        When(category__name__icontains='commercial', then=Value('commercial')),
+        default=Value(''),
+        output_field=CharField(),
+    )
+
+    limits = CAROUSEL_LIMITS
+    return (
+        Project.objects.filter(is_active=True)
+        .annotate(
+            category_group=category_group,
+            featured_rank=_rank([F('is_featured')]),
+            hot_deal_rank=_rank([F('is_hot_deal')]),
+            premium_rank=_rank([F('is_premium_listing')]),
+            editors_choice_rank=_rank([F('is_editors_choice')]),
+            status_rank=_rank([F('status')]),
+            category_rank=_rank([F('category_id')]),
+            category_group_rank=_rank([category_group]),
+            views_rank=_rank(order_by=[F('views').desc(), F('id').desc()]),
+            recent_rank=_rank(),
+        )
+        .filter(
+            Q(is_featured=True, featured_rank__lte=limits['featured_projects'])
+            | Q(is_hot_deal=True, hot_deal_rank__lte=limits['hot_deal_projects'])
+            | Q(is_premium_listing=True, premium_rank__lte=limits['premium_projects'])
+            | Q(is_editors_choice=True, editors_choice_rank__lte=limits['editors_choice_projects'])
+            | Q(status='ready_to_move', status_rank__lte=limits['ready_to_move_projects'])
+            | Q(category__isnull=False, category_rank__lte=CATEGORY_CAROUSEL_LIMIT)
+            | Q(category_group='residential', category_group_rank__lte=limits['residential_projects'])
+            | Q(category_group='commercial', category_group_rank__lte=limits['commercial_projects'])
+            | Q(views_rank__lte=limits['trending_projects'])
+            | Q(recent_rank__lte=limits['recently_viewed_projects'])
+        )
+        .select_related('city', 'category', 'project_type')
+        .prefetch_related('amenities')
+        .order_by('-created_at', '-id')
+    )
+
+
+def build_home_carousels(categories):
+    """
+    Split the homepage candidates into every carousel in memory.
+
+    Returns a dict of carousel name -> list of projects and attaches a
+    ``featured_projects`` list to each of the given categories.
+    """
+    projects = list(get_home_candidates())
+    limits = CAROUSEL_LIMITS
+
+    def pick(predicate, name):
+        return [p for p in projects if predicate(p)][:limits[name]]
+
+    carousels = {
+        'featured_projects': pick(lambda p: p.is_featured, 'featured_projects'),
+        'trending_projects': sorted(
+            (p for p in projects if p.views_rank <= limits['trending_projects']),
+            key=lambda p: p.views_rank,
+        ),
+        'ready_to_move_projects': pick(lambda p: p.status == 'ready_to_move', 'ready_to_move_projects'),
+        'recently_viewed_projects': pick(lambda p: True, 'recently_viewed_projects'),
+        'hot_deal_projects': pick(lambda p: p.is_hot_deal, 'hot_deal_projects'),
+        'premium_projects': pick(lambda p: p.is_premium_listing, 'premium_projects'),
+        'editors_choice_projects': pick(lambda p: p.is_editors_choice, 'editors_choice_projects'),
+        'residential_projects': pick(lambda p: p.category_group == 'residential', 'residential_projects'),
+        'commercial_projects': pick(lambda p: p.category_group == 'commercial', 'commercial_projects'),
+    }
+
+    for category in categories:
+        category.featured_projects = [
+            p for p in projects if p.category_id == category.id
+        ][:CATEGORY_CAROUSEL_LIMIT]
+
+    return carousels
+
+
+def lazy_home_carousels(categories):
+    """
+    Carousel context entries that only hit the database when rendered.
+
+    The homepage sections are fragment-cached, so on a cache hit the
+    carousel query never runs at all.
+    """
+    carousels = SimpleLazyObject(lambda: build_home_carousels(categories))
+    return {
+        name: SimpleLazyObject(lambda name=name: carousels[name])
+        for name in CAROUSEL_LIMITS
+    }
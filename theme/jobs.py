@@ -0,0 +1,172 @@
+"""
+Database-backed job queue.
+
+Jobs are rows in the theme Job table, so the queue works on SQLite and
+PostgreSQL with no extra service. Tasks are plain functions registered
+with ``@task('name')`` in an app's ``tasks`` module and take JSON-able
+arguments:
+
+    enqueue('projects.process_image', 'Projects.GalleryImage', 12, 'image',
+            key='process_image:Projects.GalleryImage:12:gallery/a.jpg')
+
+A job with a key is only created once; enqueueing the same key again
+returns the existing job (a failed one is retried). The ``run_worker``
+management command claims due jobs and runs them in a process pool.
+Failures are retried with exponential backoff up to ``max_attempts``.
+Finished jobs are deleted after JOB_RETENTION (done) or
+FAILED_JOB_RETENTION (failed, kept longer for inspection) by the worker.
+"""
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+
+# A running job whose worker has not finished it in this long is re-queued
+JOB_LOCK_TIMEOUT = timedelta(minutes=10)
+RETRY_BASE_DELAY = 30
+# How long finished jobs are kept before prune_jobs() deletes them
+JOB_RETENTION = timedelta(days=7)
+FAILED_JOB_RETENTION = timedelta(days=30)
+
+TASKS = {}
+
+
+def task(name):
+    """Register a function as a job task"""
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def discover_tasks():
+    autodiscover_modules('tasks')
+
+
+def enqueue(task_name, *args, key=None, delay=0, max_attempts=3):
+    """Queue a task; with a key, at most one job exists for it"""
+    run_after = timezone.now() + timedelta(seconds=delay)
+    if key is None:
+        return Job.objects.create(task=task_name, args=list(args), run_after=run_after, max_attempts=max_attempts)
+
+    with transaction.atomic():
+        job, created = Job.objects.get_or_create(
+            key=key,
+            defaults={'task': task_name, 'args': list(args), 'run_after': run_after, 'max_attempts': max_attempts},
+        )
+        if not created and job.status == Job.FAILED:
+            Job.objects.filter(pk=job.pk, status=Job.FAILED).update(
+                status=Job.PENDING, attempts=0, run_after=run_after, last_error='',
+            )
+            job.refresh_from_db()
+    return job
+
+
+def enqueue_many(task_name, calls, max_attempts=3):
+    """
+    Queue many keyed calls of one task with a single INSERT.
+
+    `calls` is an iterable of (args, key); keys that already have a job
+    are skipped.
+    """
+    run_after = timezone.now()
+    Job.objects.bulk_create(
+        [
+            Job(task=task_name, args=list(args), key=key, run_after=run_after, max_attempts=max_attempts)
+            for args, key in calls
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_jobs(worker, limit=10):
+    """
+    Mark up to `limit` due jobs as running for this worker and return them.
+
+    The claim is a conditional UPDATE, so concurrent workers never get the
+    same job (no SELECT ... FOR UPDATE needed, which SQLite lacks).
+    """
+    now = timezone.now()
+    # Recover jobs from workers that died mid-run
+    Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - JOB_LOCK_TIMEOUT).update(
+        status=Job.PENDING, locked_by='', locked_at=None,
+    )
+    candidates = list(
+        Job.objects.filter(status=Job.PENDING, run_after__lte=now)
+        .order_by('run_after', 'id').values_list('id', flat=True)[:limit]
+    )
+    if not candidates:
+        return []
+    Job.objects.filter(id__in=candidates, status=Job.PENDING).update(
+        status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=F('attempts') + 1,
+    )
+    return list(Job.objects.filter(id__in=candidates, status=Job.RUNNING, locked_by=worker, locked_at=now))
+
+
+def execute(task_name, args):
+    """Run one task; returns an error string, or None on success"""
+    try:
+        func = TASKS[task_name]
+    except KeyError:
+        return f'Unknown task {task_name!r}'
+    try:
+        func(*args)
+    except Exception:
+        return traceback.format_exc()
+    return None
+
+
+def finish_job(job, error):
+    """Record a job's outcome, scheduling a retry if attempts remain"""
+    now = timezone.now()
+    if error is None:
+        Job.objects.filter(pk=job.pk).update(status=Job.DONE, finished_at=now, last_error='', locked_by='')
+    elif job.attempts < job.max_attempts:
+        delay = RETRY_BASE_DELAY * 2 ** (job.attempts - 1)
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.PENDING, run_after=now + timedelta(seconds=delay), last_error=error, locked_by='', locked_at=None,
+        )
+    else:
+        Job.objects.filter(pk=job.pk).update(status=Job.FAILED, finished_at=now, last_error=error, locked_by='')
+
+
+def requeue_job(job):
+    """Put a claimed job back in the queue without counting the attempt"""
+    Job.objects.filter(pk=job.pk, status=Job.RUNNING).update(
+        status=Job.PENDING, attempts=F('attempts') - 1, run_after=timezone.now(), locked_by='', locked_at=None,
+    )
+
+
+def prune_jobs(done_age=JOB_RETENTION, failed_age=FAILED_JOB_RETENTION):
+    """Delete jobs that finished longer ago than their retention; returns how many"""
+    now = timezone.now()
+    deleted, _ = Job.objects.filter(status=Job.DONE, finished_at__lt=now - done_age).delete()
+    failed, _ = Job.objects.filter(status=Job.FAILED, finished_at__lt=now - failed_age).delete()
+    return deleted + failed
+
+
+def run_pending(limit=100):
+    """Run due jobs in this process (tests, cron without a worker); returns how many ran"""
+    discover_tasks()
+    worker = worker_name()
+    ran = 0
+    while ran < limit:
+        jobs = claim_jobs(worker, min(10, limit - ran))
+        if not jobs:
+            break
+        for job in jobs:
+            finish_job(job, execute(job.task, job.args))
+            ran += 1
+    return ran
@@ -0,0 +1,148 @@
+"""
+Unified lead index.
+
+Every lead form writes to its own table; each insert also writes a row to
+theme's Lead table with the contact details normalized (E.164 phone,
+lower-cased email) and their dedupe keys (theme.dedupe), so dashboards and
+duplicate lookups across sources are a single indexed query:
+
+    Lead.objects.filter(phone=normalize_phone('98765 43210'))
+
+Rows are kept in step by the signals in theme.signals. Code that inserts
+leads with bulk_create (no signals) calls index_leads() itself.
+"""
+from django.apps import apps
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from .dedupe import email_key, hash_key, normalize_email, normalize_phone, phone_key, queue_matching, refresh_contacts
+from .models import Lead, LeadContact
+
+
+# Source model label -> Lead.source and where its fields live
+LEAD_SOURCES = {
+    'land_leads.LandRequirement': {
+        'source': 'land', 'phone': 'contact_number', 'date_field': 'created_at', 'status_field': 'status',
+    },
+    'investment_leads.InvestmentRequirement': {
+        'source': 'investment', 'phone': 'contact_number', 'date_field': 'created_at',
+    },
+    'requirements.Requirement': {
+        'source': 'requirement', 'phone': 'contact_number', 'date_field': 'created_at',
+    },
+    'theme.ContactForm': {
+        'source': 'contact', 'phone': 'phone', 'date_field': 'submitted_at',
+        'status_field': 'is_read', 'status_map': {True: 'read', False: 'new'},
+    },
+    'Projects.FloorPlanAccess': {
+        'source': 'floor_plan', 'phone': 'phone', 'date_field': 'accessed_at', 'project_field': 'project_id',
+    },
+    'Projects.ProjectInquiry': {
+        'source': 'project_inquiry', 'phone': 'phone', 'date_field': 'created_at', 'project_field': 'project_id',
+    },
+}
+
+INDEX_BATCH_SIZE = 500
+
+
+def lead_status(spec, instance):
+    if 'status_field' not in spec:
+        return 'new'
+    value = getattr(instance, spec['status_field'])
+    return spec.get('status_map', {}).get(value, value) or 'new'
+
+
+def lead_values(spec, instance):
+    """Lead field values for a source row"""
+    phone = normalize_phone(getattr(instance, spec['phone']))
+    email = normalize_email(instance.email)
+    return {
+        'project_id': getattr(instance, spec['project_field']) if 'project_field' in spec else None,
+        'name': (instance.name or '')[:255],
+        'phone': phone,
+        'email': email,
+        'phone_key': hash_key(phone),
+        'email_key': hash_key(email),
+        'status': lead_status(spec, instance),
+        'created_at': getattr(instance, spec['date_field']),
+    }
+
+
+def assign_keys(instance):
+    """Set the dedupe keys on a source row before it is saved"""
+    spec = LEAD_SOURCES[instance._meta.label]
+    instance.phone_key = phone_key(getattr(instance, spec['phone']))
+    instance.email_key = email_key(instance.email)
+
+
+def index_lead(instance):
+    """Create or refresh the Lead row for one source row"""
+    spec = LEAD_SOURCES[instance._meta.label]
+    values = lead_values(spec, instance)
+    lead = Lead.objects.filter(source=spec['source'], object_id=instance.pk).first()
+    if lead is None:
+        Lead.objects.create(source=spec['source'], object_id=instance.pk, **values)
+        queue_matching()
+        return
+
+    # New contact details: hand the lead back to the matcher
+    rematch = (lead.phone_key, lead.email_key) != (values['phone_key'], values['email_key'])
+    if rematch:
+        values['contact'] = None
+    Lead.objects.filter(pk=lead.pk).update(**values)
+    if rematch:
+        if lead.contact_id:
+            refresh_contacts({lead.contact_id})
+        queue_matching()
+
+
+def index_leads(instances):
+    """Index freshly inserted source rows (all of one model) with one INSERT per batch"""
+    instances = list(instances)
+    if not instances:
+        return
+    spec = LEAD_SOURCES[instances[0]._meta.label]
+    Lead.objects.bulk_create(
+        [Lead(source=spec['source'], object_id=instance.pk, **lead_values(spec, instance)) for instance in instances],
+        batch_size=INDEX_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    queue_matching()
+
+
+def annotate_contact(queryset):
+    """Annotate source rows with their contact's lead count and sources"""
+    spec = LEAD_SOURCES[queryset.model._meta.label]
+    lead = Lead.objects.filter(source=spec['source'], object_id=OuterRef('pk'))
+    return queryset.annotate(
+        contact_lead_count=Subquery(lead.values('contact__lead_count')[:1]),
+        contact_sources=Subquery(lead.values('contact__sources')[:1]),
+    )
+
+
+def remove_lead(instance):
+    spec = LEAD_SOURCES[instance._meta.label]
+    leads = Lead.objects.filter(source=spec['source'], object_id=instance.pk)
+    contact_ids = set(leads.exclude(contact=None).values_list('contact_id', flat=True))
+    leads.delete()
+    if contact_ids:
+        refresh_contacts(contact_ids)
+
+
+def rebuild_leads():
+    """
+    Re-index every row of the source models. Contacts are dropped; run
+    the matcher afterwards.
+    """
+    for label, spec in LEAD_SOURCES.items():
+        with transaction.atomic():
+            Lead.objects.filter(source=spec['source']).delete()
+            batch = []
+            for instance in apps.get_model(label).objects.order_by('pk').iterator(chunk_size=INDEX_BATCH_SIZE):
+                batch.append(Lead(source=spec['source'], object_id=instance.pk, **lead_values(spec, instance)))
+                if len(batch) >= INDEX_BATCH_SIZE:
+                    Lead.objects.bulk_create(batch)
+                    batch = []
+            Lead.objects.bulk_create(batch)
+    # Every lead is unmatched again; the matcher rebuilds the contacts
+    LeadContact.objects.all().delete()
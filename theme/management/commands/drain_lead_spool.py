@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from theme.spool import DRAIN_BATCH_SIZE, drain, failed_count, pending_count, retry_failed
+
+
+class Command(BaseCommand):
+    help = 'Move leads from the write-behind spool (LEAD_INGESTION = "spool") into the lead tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DRAIN_BATCH_SIZE)
+        parser.add_argument('--poll', type=float, default=1.0, help='Seconds to sleep when the spool is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once the spool is drained')
+        parser.add_argument('--retry-failed', action='store_true', help='Queue rows that failed to insert again first')
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            self.stdout.write(f'Retrying {retry_failed()} failed leads.')
+        failed = failed_count()
+        if failed:
+            self.stderr.write(f'{failed} spooled leads failed to insert; see the log, then use --retry-failed.')
+        try:
+            while True:
+                close_old_connections()
+                stored = drain(options['batch_size'])
+                if stored:
+                    self.stdout.write(f'Stored {stored} leads ({pending_count()} pending).')
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['poll'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping drainer.')
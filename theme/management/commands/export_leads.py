@@ -0,0 +1,51 @@
+import datetime
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from theme.exports import (
+    EXPORT_CHUNK_SIZE, EXPORTS, FORMATS, ExportError, export_queryset, export_rows, write_csv, write_xlsx,
+)
+
+
+def parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'Invalid date {value!r}, expected YYYY-MM-DD')
+
+
+class Command(BaseCommand):
+    help = 'Export leads as CSV or XLSX with constant memory, e.g. export_leads land_leads.LandRequirement --since 2024-01-01'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(EXPORTS), help='Model label to export')
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--output', '-o', help='File to write (default: stdout, CSV only)')
+        parser.add_argument('--since', type=parse_date, help='First day to include (YYYY-MM-DD)')
+        parser.add_argument('--until', type=parse_date, help='Last day to include (YYYY-MM-DD)')
+        parser.add_argument('--status', help='Only leads with this status (models with a status field)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        fmt = options['format']
+        if fmt == 'xlsx' and not options['output']:
+            raise CommandError('XLSX exports need --output')
+        try:
+            queryset = export_queryset(
+                options['model'], since=options['since'], until=options['until'], status=options['status'],
+            )
+            rows = export_rows(queryset, chunk_size=options['chunk_size'])
+            if fmt == 'xlsx':
+                with open(options['output'], 'wb') as output:
+                    write_xlsx(rows, output, title=str(queryset.model._meta.verbose_name_plural))
+            elif options['output']:
+                with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                    write_csv(rows, output)
+            else:
+                write_csv(rows, sys.stdout)
+        except ExportError as error:
+            raise CommandError(error)
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'Exported {options["model"]} to {options["output"]}.'))
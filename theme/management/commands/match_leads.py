@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from theme.dedupe import match_leads
+
+
+class Command(BaseCommand):
+    help = 'Cluster unmatched leads into contacts by their phone/email keys'
+
+    def handle(self, *args, **options):
+        matched = match_leads()
+        self.stdout.write(self.style.SUCCESS(f'Matched {matched} leads.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from theme.fulltext import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Re-sync the full-text search index with the project and blog tables'
+
+    def handle(self, *args, **options):
+        rebuild()
+        self.stdout.write(self.style.SUCCESS('Full-text index rebuilt.'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from theme.leads import rebuild_leads
+from theme.models import Lead
+
+
+class Command(BaseCommand):
+    help = 'Re-sync the unified Lead table with every lead source table'
+
+    def handle(self, *args, **options):
+        rebuild_leads()
+        self.stdout.write(self.style.SUCCESS(f'Lead index rebuilt ({Lead.objects.count()} leads).'))
@@ -0,0 +1,85 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from theme.jobs import claim_jobs, discover_tasks, finish_job, prune_jobs, requeue_job, worker_name
+from theme.worker import init_process, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (image processing etc.) in a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help='Pool size')
+        parser.add_argument('--poll', type=float, default=2.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is drained')
+        parser.add_argument('--prune-every', type=float, default=3600, help='Seconds between deleting old finished jobs')
+
+    def handle(self, *args, **options):
+        discover_tasks()
+        worker = worker_name()
+        processes = options['processes']
+        self.stdout.write(f'Worker {worker} started with {processes} processes.')
+
+        next_prune = 0
+        pool = self.start_pool(processes)
+        try:
+            while True:
+                close_old_connections()
+                if time.monotonic() >= next_prune:
+                    pruned = prune_jobs()
+                    if pruned:
+                        self.stdout.write(f'Pruned {pruned} finished jobs.')
+                    next_prune = time.monotonic() + options['prune_every']
+                jobs = claim_jobs(worker, limit=processes * 2)
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+                    continue
+                if not self.run_batch(pool, jobs):
+                    # A pool process died (OOM, segfault); every later submit
+                    # would fail, so start a fresh pool
+                    self.stdout.write('A pool process died; restarting the pool.')
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self.start_pool(processes)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping worker.')
+        finally:
+            pool.shutdown()
+
+    def start_pool(self, processes):
+        # spawn, not fork: forked children would share the parent's DB connection
+        context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=processes, mp_context=context, initializer=init_process)
+
+    def run_batch(self, pool, jobs):
+        """Run claimed jobs and record their outcomes; False if the pool broke"""
+        futures = []
+        for job in jobs:
+            try:
+                futures.append((job, pool.submit(run_job, job.task, job.args)))
+            except BrokenProcessPool:
+                futures.append((job, None))
+        intact = True
+        for job, future in futures:
+            try:
+                if future is None:
+                    raise BrokenProcessPool
+                error = future.result()
+            except BrokenProcessPool:
+                # Not the job's failure: run it again without using an attempt
+                requeue_job(job)
+                intact = False
+                self.stdout.write(f'{job.task} #{job.pk}: requeued')
+                continue
+            except Exception as exc:
+                error = repr(exc)
+            finish_job(job, error)
+            status = 'done' if error is None else 'failed'
+            self.stdout.write(f'{job.task} #{job.pk}: {status}')
+        return intact
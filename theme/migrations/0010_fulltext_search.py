@@ -0,0 +1,61 @@
+from django.db import migrations
+
+
+# (index name, table, pk column, [(column, PostgreSQL weight label)]) as of
+# this migration; PostgreSQL only uses the index while theme.fulltext
+# builds the identical to_tsvector() expression
+DOCUMENTS = [
+    ('fulltext_project', 'Projects_project', 'id', [
+        ('name', 'A'), ('project_by', 'B'), ('location', 'C'), ('developers', 'D'),
+    ]),
+    ('fulltext_blog', 'blogs_blog', 'id', [
+        ('title', 'A'), ('meta_description', 'B'), ('content', 'C'),
+    ]),
+]
+
+
+def create_fulltext_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    quote = schema_editor.quote_name
+    for index, table, pk, columns in DOCUMENTS:
+        names = ', '.join(quote(column) for column, _ in columns)
+        if vendor == 'sqlite':
+            # FTS5 table holding a copy of the text, filled from the rows
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {quote(index)} '
+                f"USING fts5({names}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+            schema_editor.execute(f'DELETE FROM {quote(index)}')
+            schema_editor.execute(
+                f'INSERT INTO {quote(index)} (rowid, {names}) SELECT {quote(pk)}, {names} FROM {quote(table)}'
+            )
+        elif vendor == 'postgresql':
+            vector = ' || '.join(
+                f"setweight(to_tsvector('simple', coalesce({quote(column)}, '')), '{label}')"
+                for column, label in columns
+            )
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {quote(index)} ON {quote(table)} USING GIN (({vector}))'
+            )
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for index, *_ in DOCUMENTS:
+        if vendor == 'sqlite':
+            schema_editor.execute(f'DROP TABLE IF EXISTS {schema_editor.quote_name(index)}')
+        elif vendor == 'postgresql':
+            schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(index)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theme', '0009_developer_siteconfig_site_logo'),
+        ('Projects', '0006_floorplanaccess'),
+        ('blogs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_indexes, drop_fulltext_indexes),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.2 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Projects', '0007_relatedproject'),
+        ('theme', '0011_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Lead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('land', 'Land Requirement'), ('investment', 'Investment Requirement'), ('requirement', 'Property Requirement'), ('contact', 'Contact Form'), ('floor_plan', 'Floor Plan Access')], max_length=20)),
+                ('object_id', models.PositiveIntegerField(help_text='Primary key of the row in the source table')),
+                ('name', models.CharField(blank=True, max_length=255)),
+                ('phone', models.CharField(blank=True, help_text='E.164, e.g. +919876543210', max_length=20)),
+                ('email', models.CharField(blank=True, help_text='Lower-cased', max_length=254)),
+                ('status', models.CharField(default='new', max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='leads', to='Projects.project')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['created_at'], name='theme_lead_created_db33b0_idx'), models.Index(fields=['phone', 'created_at'], name='theme_lead_phone_ad6cdd_idx'), models.Index(fields=['email', 'created_at'], name='theme_lead_email_e3d48a_idx'), models.Index(fields=['source', 'created_at'], name='theme_lead_source_8f1dbb_idx'), models.Index(fields=['project', 'created_at'], name='theme_lead_project_b76f16_idx'), models.Index(fields=['status', 'created_at'], name='theme_lead_status_d8997d_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='lead',
+            constraint=models.UniqueConstraint(fields=('source', 'object_id'), name='unique_lead_source_row'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+import re
+
+from django.db import migrations, transaction
+
+
+# Lead sources as of this migration (later ones are indexed as they are added)
+LEAD_SOURCES = {
+    'land_leads.LandRequirement': {
+        'source': 'land', 'phone': 'contact_number', 'date_field': 'created_at', 'status_field': 'status',
+    },
+    'investment_leads.InvestmentRequirement': {
+        'source': 'investment', 'phone': 'contact_number', 'date_field': 'created_at',
+    },
+    'requirements.Requirement': {
+        'source': 'requirement', 'phone': 'contact_number', 'date_field': 'created_at',
+    },
+    'theme.ContactForm': {
+        'source': 'contact', 'phone': 'phone', 'date_field': 'submitted_at',
+        'status_field': 'is_read', 'status_map': {True: 'read', False: 'new'},
+    },
+    'Projects.FloorPlanAccess': {
+        'source': 'floor_plan', 'phone': 'phone', 'date_field': 'accessed_at', 'project_field': 'project_id',
+    },
+}
+
+BATCH_SIZE = 500
+
+
+def normalize_phone(value):
+    """E.164, defaulting to India's +91 (as theme.dedupe.normalize_phone)"""
+    value = (value or '').strip()
+    digits = re.sub(r'\D', '', value)
+    if not digits:
+        return ''
+    if value.startswith('+'):
+        return f'+{digits}'
+    if digits.startswith('00'):
+        return f'+{digits[2:]}'
+    digits = digits.lstrip('0')
+    if len(digits) == 10:
+        return f'+91{digits}'
+    return f'+{digits}'
+
+
+def lead_status(spec, row):
+    if 'status_field' not in spec:
+        return 'new'
+    value = getattr(row, spec['status_field'])
+    return spec.get('status_map', {}).get(value, value) or 'new'
+
+
+def backfill_leads(apps, schema_editor):
+    Lead = apps.get_model('theme', 'Lead')
+    for label, spec in LEAD_SOURCES.items():
+        with transaction.atomic():
+            Lead.objects.filter(source=spec['source']).delete()
+            batch = []
+            for row in apps.get_model(label).objects.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+                batch.append(Lead(
+                    source=spec['source'],
+                    object_id=row.pk,
+                    project_id=getattr(row, spec['project_field']) if 'project_field' in spec else None,
+                    name=(row.name or '')[:255],
+                    phone=normalize_phone(getattr(row, spec['phone'])),
+                    email=(row.email or '').strip().lower(),
+                    status=lead_status(spec, row),
+                    created_at=getattr(row, spec['date_field']),
+                ))
+                if len(batch) >= BATCH_SIZE:
+                    Lead.objects.bulk_create(batch)
+                    batch = []
+            Lead.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theme', '0012_lead'),
+        ('Projects', '0007_relatedproject'),
+        ('land_leads', '0002_landrequirement_status'),
+        ('investment_leads', '0003_alter_investmentrequirement_options_and_more'),
+        ('requirements', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_leads, migrations.RunPython.noop),
+    ]
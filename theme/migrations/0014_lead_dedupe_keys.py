@@ -0,0 +1,108 @@
+# Generated by Django 5.0.2 on 2026-10-18 09:15
+
+import hashlib
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Key derivation as of this migration (theme.dedupe at the time)
+def normalize_phone(value):
+    value = (value or '').strip()
+    digits = re.sub(r'\D', '', value)
+    if not digits:
+        return ''
+    if value.startswith('+'):
+        return f'+{digits}'
+    if digits.startswith('00'):
+        return f'+{digits[2:]}'
+    digits = digits.lstrip('0')
+    if len(digits) == 10:
+        return f'+91{digits}'
+    return f'+{digits}'
+
+
+def hash_key(normalized):
+    if not normalized:
+        return ''
+    return hashlib.sha256(normalized.encode()).hexdigest()[:32]
+
+
+def backfill_keys(model, phone_field, batch_size=500):
+    batch = []
+    for row in model.objects.order_by('pk').iterator(chunk_size=batch_size):
+        row.phone_key = hash_key(normalize_phone(getattr(row, phone_field)))
+        row.email_key = hash_key((row.email or '').strip().lower())
+        batch.append(row)
+        if len(batch) >= batch_size:
+            model.objects.bulk_update(batch, ['phone_key', 'email_key'])
+            batch = []
+    model.objects.bulk_update(batch, ['phone_key', 'email_key'])
+
+
+def fill_keys(apps, schema_editor):
+    backfill_keys(apps.get_model('theme', 'ContactForm'), 'phone')
+    # Lead rows already hold the normalized phone/email
+    Lead = apps.get_model('theme', 'Lead')
+    batch = []
+    for lead in Lead.objects.order_by('pk').iterator(chunk_size=500):
+        lead.phone_key = hash_key(lead.phone)
+        lead.email_key = hash_key(lead.email)
+        batch.append(lead)
+        if len(batch) >= 500:
+            Lead.objects.bulk_update(batch, ['phone_key', 'email_key'])
+            batch = []
+    Lead.objects.bulk_update(batch, ['phone_key', 'email_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theme', '0013_backfill_leads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactform',
+            name='email_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='contactform',
+            name='phone_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='email_key',
+            field=models.CharField(blank=True, db_index=True, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='phone_key',
+            field=models.CharField(blank=True, db_index=True, max_length=32),
+        ),
+        migrations.CreateModel(
+            name='LeadContact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, help_text='Name on the latest lead', max_length=255)),
+                ('lead_count', models.PositiveIntegerField(default=0)),
+                ('sources', models.CharField(blank=True, help_text='Comma separated Lead sources', max_length=100)),
+                ('first_seen', models.DateTimeField(blank=True, null=True)),
+                ('last_seen', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-last_seen'],
+                'indexes': [models.Index(fields=['last_seen'], name='theme_leadc_last_se_67ca2c_idx'), models.Index(fields=['lead_count'], name='theme_leadc_lead_co_f17ab7_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='contact',
+            field=models.ForeignKey(blank=True, help_text='Set by the background matcher', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='leads', to='theme.leadcontact'),
+        ),
+        migrations.RunPython(fill_keys, migrations.RunPython.noop),
+    ]
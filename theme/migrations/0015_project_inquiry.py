@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-18 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theme', '0014_lead_dedupe_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lead',
+            name='source',
+            field=models.CharField(choices=[('land', 'Land Requirement'), ('investment', 'Investment Requirement'), ('requirement', 'Property Requirement'), ('contact', 'Contact Form'), ('floor_plan', 'Floor Plan Access'), ('project_inquiry', 'Project Inquiry')], max_length=20),
+        ),
+    ]
@@ -1,5 +1,15 @@
+import time
+
 from django.db import models
 
+from .content_cache import get_content_version, bump_content_version
+
+
+SITE_CONFIG_CONTENT = 'site_config'
+# Seconds a worker trusts its memoized SiteConfig without a version change,
+# in case a bump is lost (e.g. the cache was flushed or unreachable)
+SITE_CONFIG_MEMO_TTL = 300
+
 
 class Developer(models.Model):
     """Model for managing developer/partner companies"""
@@ -56,6 +66,9 @@ class ContactForm(models.Model):
     message = models.TextField(verbose_name="Message")
     submitted_at = models.DateTimeField(auto_now_add=True, verbose_name="Submitted At")
     is_read = models.BooleanField(default=False, verbose_name="Is Read")
+    # Hashed normalized phone/email for duplicate matching (theme.dedupe)
+    phone_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
+    email_key = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
     
     class Meta:
         verbose_name = "Contact Form Submission"
@@ -180,6 +193,9 @@ class SiteConfig(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Per-process memo of (content version, expiry, instance), see get_cached_config
+    _memo = None
+    
     class Meta:
         verbose_name = "Site Configuration"
         verbose_name_plural = "Site Configuration"
@@ -192,11 +208,44 @@ class SiteConfig(models.Model):
         if not self.pk and SiteConfig.objects.exists():
             raise ValueError("Only one SiteConfig instance is allowed. Please update the existing one.")
         super().save(*args, **kwargs)
+        # Every worker drops its memoized copy on the next request
+        bump_content_version(SITE_CONFIG_CONTENT)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_content_version(SITE_CONFIG_CONTENT)
+        return result
+    
+    @classmethod
+    def get_cached_config(cls):
+        """
+        Get the site configuration without touching the database.
+        
+        The instance is memoized in-process and revalidated against a
+        version number in the shared cache, which save() bumps; the memo
+        is also reloaded every SITE_CONFIG_MEMO_TTL seconds.
+        """
+        # Read the version before loading so a concurrent save can only
+        # make the memo look stale, never fresh
+        version = get_content_version(SITE_CONFIG_CONTENT)
+        memo = cls._memo
+        if memo is not None and memo[0] == version and memo[1] > time.monotonic():
+            return memo[2]
+        config, created = cls._get_or_create()
+        if created:
+            # Creating it bumped the version
+            version = get_content_version(SITE_CONFIG_CONTENT)
+        cls._memo = (version, time.monotonic() + SITE_CONFIG_MEMO_TTL, config)
+        return config
     
     @classmethod
     def get_config(cls):
         """Get or create the site configuration"""
-        config, created = cls.objects.get_or_create(
+        return cls._get_or_create()[0]
+
+    @classmethod
+    def _get_or_create(cls):
+        return cls.objects.get_or_create(
             pk=1,
             defaults={
                 'site_title': 'VeloCity Realtor',
@@ -210,7 +259,6 @@ class SiteConfig(models.Model):
                 'office_address': 'VeloCity Realtor Office,\nKolkata, West Bengal,\nIndia',
             }
         )
-        return config
 
     def get_whatsapp_url(self):
         """Generate WhatsApp URL for web"""
@@ -219,3 +267,105 @@ class SiteConfig(models.Model):
             clean_number = ''.join(filter(lambda x: x.isdigit() or x == '+', self.whatsapp_number))
             return f"https://wa.me/{clean_number.lstrip('+')}"
         return "#"
+
+
+class Job(models.Model):
+    """Background job stored in the database (see theme.jobs)"""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    task = models.CharField(max_length=100)
+    args = models.JSONField(default=list, blank=True)
+    key = models.CharField(max_length=255, unique=True, null=True, blank=True, help_text="Idempotency key; one job per key")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+
+class LeadContact(models.Model):
+    """A person behind one or more leads, clustered on shared phone/email keys (see theme.dedupe)"""
+    name = models.CharField(max_length=255, blank=True, help_text="Name on the latest lead")
+    lead_count = models.PositiveIntegerField(default=0)
+    sources = models.CharField(max_length=100, blank=True, help_text="Comma separated Lead sources")
+    first_seen = models.DateTimeField(null=True, blank=True)
+    last_seen = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-last_seen']
+        indexes = [
+            models.Index(fields=['last_seen']),
+            models.Index(fields=['lead_count']),
+        ]
+
+    def __str__(self):
+        return f"{self.name or 'Contact'} ({self.lead_count} leads)"
+
+
+class Lead(models.Model):
+    """One row per lead from any source, normalized for cross-source queries (see theme.leads)"""
+    SOURCE_CHOICES = [
+        ('land', 'Land Requirement'),
+        ('investment', 'Investment Requirement'),
+        ('requirement', 'Property Requirement'),
+        ('contact', 'Contact Form'),
+        ('floor_plan', 'Floor Plan Access'),
+        ('project_inquiry', 'Project Inquiry'),
+    ]
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    object_id = models.PositiveIntegerField(help_text="Primary key of the row in the source table")
+    project = models.ForeignKey(
+        'Projects.Project', on_delete=models.SET_NULL, null=True, blank=True, related_name='leads'
+    )
+    name = models.CharField(max_length=255, blank=True)
+    phone = models.CharField(max_length=20, blank=True, help_text="E.164, e.g. +919876543210")
+    email = models.CharField(max_length=254, blank=True, help_text="Lower-cased")
+    status = models.CharField(max_length=20, default='new')
+    created_at = models.DateTimeField()
+    phone_key = models.CharField(max_length=32, blank=True, db_index=True)
+    email_key = models.CharField(max_length=32, blank=True, db_index=True)
+    contact = models.ForeignKey(
+        LeadContact, on_delete=models.SET_NULL, null=True, blank=True, related_name='leads',
+        help_text="Set by the background matcher",
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'object_id'], name='unique_lead_source_row'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['phone', 'created_at']),
+            models.Index(fields=['email', 'created_at']),
+            models.Index(fields=['source', 'created_at']),
+            models.Index(fields=['project', 'created_at']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_source_display()} #{self.object_id} - {self.name}"
@@ -0,0 +1,134 @@
+"""
+Rate limiting for the public (csrf-exempt) write endpoints.
+
+Each budget allows `limit` requests per `window` seconds per client IP and
+project. The client IP is the address the last trusted proxy saw
+(settings.TRUSTED_PROXY_COUNT hops from the right of X-Forwarded-For), so
+clients cannot choose it; IPv6 clients are counted per /64.
+
+Counts live in the shared cache as a sliding window counter: the current
+fixed window's count plus the previous window's count weighted by how
+much of it still overlaps the sliding window. That is two small keys
+per client, updated with atomic cache.incr, and it does not let a client
+burst twice the budget across a window boundary.
+
+Budgets are configured per endpoint in settings.RATE_LIMITS
+(name -> (limit, window)) on top of DEFAULT_RATE_LIMITS; a budget of None
+disables limiting for that endpoint.
+
+The counters need a cache shared by every worker (CACHE_URL=redis://...);
+with the per-process locmem default each worker counts separately.
+"""
+import functools
+import ipaddress
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+
+DEFAULT_RATE_LIMITS = {
+    # View counting (increment-views and project-visit endpoints)
+    'project_views': (20, 60 * 60),
+    'floor_plan_access': (5, 60 * 60),
+    'project_inquiry': (5, 60 * 60),
+}
+
+RATE_LIMITED_MESSAGE = 'Too many requests. Please try again later.'
+
+
+def _parse_ip(value):
+    try:
+        return ipaddress.ip_address((value or '').strip())
+    except ValueError:
+        return None
+
+
+def client_address(request):
+    """
+    The visitor's address as an ip_address, or None.
+
+    Behind TRUSTED_PROXY_COUNT proxies, each appending the address it saw
+    to X-Forwarded-For, the client is that many hops from the right;
+    anything further left was written by the client.
+    """
+    proxies = getattr(settings, 'TRUSTED_PROXY_COUNT', 0)
+    if proxies:
+        hops = request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+        if len(hops) >= proxies:
+            address = _parse_ip(hops[-proxies])
+            if address is not None:
+                return address
+    return _parse_ip(request.META.get('REMOTE_ADDR'))
+
+
+def client_ip(request):
+    address = client_address(request)
+    return str(address) if address is not None else None
+
+
+def client_key(request):
+    """Rate limit identity: the IPv4 address, or the IPv6 /64"""
+    address = client_address(request)
+    if address is None:
+        return 'unknown'
+    if address.version == 6:
+        return str(ipaddress.ip_network(f'{address}/64', strict=False).network_address)
+    return str(address)
+
+
+def get_budget(name):
+    budgets = {**DEFAULT_RATE_LIMITS, **getattr(settings, 'RATE_LIMITS', {})}
+    return budgets.get(name)
+
+
+def hit(key, limit, window):
+    """
+    Count one request against `key`; returns 0 when allowed, otherwise
+    the seconds until the client may retry.
+    """
+    now = time.time()
+    current = int(now // window)
+    elapsed = now - current * window
+    current_key = f'ratelimit:{key}:{current}'
+    # Each window's counter is still read as "previous" during the next one
+    cache.add(current_key, 0, window * 2)
+    try:
+        count = cache.incr(current_key)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(current_key, 1, window * 2)
+        count = 1
+    previous = cache.get(f'ratelimit:{key}:{current - 1}', 0)
+    if previous * (window - elapsed) / window + count <= limit:
+        return 0
+    return max(1, math.ceil(window - elapsed))
+
+
+def throttled(request, name, project_id=None):
+    """Seconds to wait if this request is over the `name` budget, else 0"""
+    budget = get_budget(name)
+    if budget is None:
+        return 0
+    limit, window = budget
+    return hit(f'{name}:{client_key(request)}:{project_id or ""}', limit, window)
+
+
+def rate_limit(name):
+    """
+    Reject requests over the `name` budget with a 429 JSON error. The view's
+    project_id argument, when it has one, is part of the key.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            retry_after = throttled(request, name, kwargs.get('project_id'))
+            if retry_after:
+                response = JsonResponse({'success': False, 'error': RATE_LIMITED_MESSAGE}, status=429)
+                response['Retry-After'] = str(retry_after)
+                return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
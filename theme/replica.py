@@ -0,0 +1,124 @@
+"""
+Read-replica routing for the public catalog pages.
+
+When a ``replica`` database is configured (DATABASE_REPLICA_URL), views
+decorated with @read_from_replica run their reads against it; everything
+else, and every write, uses ``default``. Replicas lag, so a visitor whose
+request wrote to the primary (e.g. a lead form) reads from it for
+REPLICA_STICKY_SECONDS afterwards. StickyPrimaryMiddleware keeps the
+deadline in the visitor's session when they already have one; it never
+creates a session for it. Views marked @not_sticky (view counting) never
+pin a visitor.
+
+Reads made while the primary is inside a transaction stay on the
+primary. In tests the replica alias mirrors ``default`` (TEST['MIRROR']),
+and TestCase's wrapping transaction keeps those reads on ``default``.
+"""
+import functools
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_ALIAS = 'replica'
+STICKY_SESSION_KEY = 'db_primary_until'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+
+
+def is_sticky(request):
+    """Whether this visitor wrote recently enough to need the primary"""
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return False
+    # Loads the session here, from the primary, before reads are routed
+    return request.session.get(STICKY_SESSION_KEY, 0) > time.time()
+
+
+def read_from_replica(view):
+    """Route the view's reads to the replica unless the visitor is sticky"""
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not replica_configured() or is_sticky(request):
+            return view(request, *args, **kwargs)
+        token = _use_replica.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+def not_sticky(view):
+    """Writes made by this view (e.g. view counts) don't pin the visitor to the primary"""
+    view.replica_not_sticky = True
+    return view
+
+
+class WriteDetector:
+    """execute_wrapper noting whether any statement modified data"""
+
+    WRITES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+    def __init__(self):
+        self.wrote = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if not self.wrote and sql.lstrip().upper().startswith(self.WRITES):
+            self.wrote = True
+        return execute(sql, params, many, context)
+
+
+class StickyPrimaryMiddleware:
+    """Pin a session's reads to the primary for a while after it writes"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+        detector = WriteDetector()
+        with connections[DEFAULT_DB_ALIAS].execute_wrapper(detector):
+            response = self.get_response(request)
+        if detector.wrote and self.can_stick(request):
+            request.session[STICKY_SESSION_KEY] = time.time() + sticky_seconds()
+        return response
+
+    def can_stick(self, request):
+        match = request.resolver_match
+        if match is None or getattr(match.func, 'replica_not_sticky', False):
+            return False
+        # Only sessions that exist already (or that the view is saving anyway)
+        session = getattr(request, 'session', None)
+        return session is not None and (session.session_key is not None or session.modified)
+
+
+class ReplicaRouter:
+    """Reads inside @read_from_replica views go to the replica; writes never do"""
+
+    def db_for_read(self, model, **hints):
+        # Inside a transaction on the primary, read what it has written
+        if _use_replica.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica follows the primary's schema through replication
+        return db != REPLICA_ALIAS
@@ -0,0 +1,421 @@
+"""
+In-memory facet index for the property search page.
+
+Every active project gets a bit position; each filter option (category,
+city, type, status, BHK, amenity, tag, ...) is a Python int bitset over
+those positions. Any filter combination is then a handful of ANDs, facet
+counts are popcounts, and sorting/pagination run over precomputed orders,
+so a search only queries the database for the 16 projects it displays.
+Infinite scroll pages through the same orders with keyset cursors.
+
+The index is built per process and rebuilt when the catalog content
+version changes (see theme.signals) or after SEARCH_INDEX_MAX_AGE seconds,
+which picks up flushed view counts for the "most viewed" sort.
+"""
+import base64
+import binascii
+import json
+import re
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from decimal import Decimal
+
+from Projects.models import Project, Category, City, ProjectType, Amenity, Tag
+from .content_cache import SEARCH_CONTENT, get_content_version
+
+
+SEARCH_INDEX_MAX_AGE = 60 * 5
+SEARCH_PAGE_SIZE = 16
+
+# "4" in the BHK filter means four or more bedrooms
+BHK_PLUS = 4
+
+BUDGET_LABELS = {
+    '0-2000000': 'Under ₹20L',
+    '2000000-5000000': '₹20L - ₹50L',
+    '5000000-10000000': '₹50L - ₹1Cr',
+    '10000000-20000000': '₹1Cr - ₹2Cr',
+    '20000000-50000000': '₹2Cr - ₹5Cr',
+    '50000000-': '₹5Cr+',
+}
+
+# Sort parameter -> (attribute, descending). Ties are broken on id in the
+# same direction so the order is total.
+SORTS = {
+    '-created_at': ('created_at', True),
+    'onwards_price': ('onwards_price', False),
+    '-onwards_price': ('onwards_price', True),
+    '-views': ('views', True),
+    'name': ('name', False),
+}
+DEFAULT_SORT = '-created_at'
+RELEVANCE = 'relevance'
+
+def _cursor_datetime(value):
+    value = datetime.fromisoformat(_cursor_type(value, str))
+    # The index holds aware datetimes; a naive one can't be compared
+    if value.tzinfo is None or value.utcoffset() is None:
+        raise ValueError('naive datetime in cursor')
+    return value
+
+
+def _cursor_decimal(value):
+    value = Decimal(_cursor_type(value, str))
+    if not value.is_finite():
+        raise ValueError('non-finite decimal in cursor')
+    return value
+
+
+def _cursor_type(value, expected):
+    # bool is an int subclass but never a valid cursor value
+    if not isinstance(value, expected) or isinstance(value, bool):
+        raise TypeError(f'expected {expected.__name__} in cursor')
+    return value
+
+
+# Sort attribute -> parser for the value stored in a cursor; cursors come
+# from the query string, so anything that isn't what encode_cursor wrote
+# must raise (ValueError/TypeError) rather than reach the bisect
+_CURSOR_VALUES = {
+    'created_at': _cursor_datetime,
+    'onwards_price': _cursor_decimal,
+    'views': lambda value: _cursor_type(value, int),
+    'name': lambda value: _cursor_type(value, str),
+}
+
+_BHK_RANGE = re.compile(r'(\d+)\s*(?:-|to)\s*(\d+)', re.IGNORECASE)
+_NUMBER = re.compile(r'\d+')
+
+
+def parse_bhk(value):
+    """Normalize a free-text BHK field ("2, 3, 4 BHK", "2-4 BHK") to a set of ints"""
+    if not value:
+        return set()
+    result = set()
+    for start, end in _BHK_RANGE.findall(value):
+        start, end = int(start), int(end)
+        if start <= end <= 20:
+            result.update(range(start, end + 1))
+    remainder = _BHK_RANGE.sub(' ', value)
+    result.update(int(n) for n in _NUMBER.findall(remainder) if 0 < int(n) <= 20)
+    return result
+
+
+def parse_budget(budget):
+    """Split a "min-max" budget parameter into Decimals (either may be None)"""
+    if not budget or '-' not in budget:
+        return None
+    min_price, max_price = budget.split('-', 1)
+    try:
+        return (
+            Decimal(int(min_price)) if min_price else None,
+            Decimal(int(max_price)) if max_price else None,
+        )
+    except ValueError:
+        return None
+
+
+def _sort_key(value):
+    # NULLs sort lowest, as they do in SQLite
+    return (value is not None, value)
+
+
+def encode_cursor(sort, value, project_id):
+    """Opaque cursor pointing just after the given (value, id) in a sort order"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    raw = json.dumps([sort, value, project_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, sort):
+    """(value, id) from a cursor made for this sort, or None to start over"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, value, project_id = json.loads(raw)
+        if cursor_sort != sort or not isinstance(project_id, int) or isinstance(project_id, bool):
+            return None
+        if value is not None and sort in SORTS:
+            value = _CURSOR_VALUES[SORTS[sort][0]](value)
+    except (ValueError, TypeError, ArithmeticError, binascii.Error):
+        return None
+    return value, project_id
+
+
+class SearchIndex:
+    """Bitset index over the active projects"""
+
+    def __init__(self):
+        self.built_at = time.monotonic()
+
+        rows = list(
+            Project.objects.filter(is_active=True).order_by('id').values(
+                'id', 'name', 'category_id', 'city_id', 'project_type_id',
+                'bhk', 'onwards_price', 'status', 'is_featured',
+                'trending_tag', 'views', 'created_at',
+            )
+        )
+        self.ids = [row['id'] for row in rows]
+        self.positions = {project_id: pos for pos, project_id in enumerate(self.ids)}
+        self.all_bits = (1 << len(rows)) - 1
+
+        self.category_bits = {}
+        self.city_bits = {}
+        self.project_type_bits = {}
+        self.status_bits = {}
+        self.bhk_bits = {}
+        self.featured_bits = 0
+        self.trending_bits = 0
+        prices = []
+
+        for pos, row in enumerate(rows):
+            bit = 1 << pos
+            for bits, key in (
+                (self.category_bits, row['category_id']),
+                (self.city_bits, row['city_id']),
+                (self.project_type_bits, row['project_type_id']),
+                (self.status_bits, row['status']),
+            ):
+                if key is not None:
+                    bits[key] = bits.get(key, 0) | bit
+            for bhk in parse_bhk(row['bhk']):
+                self.bhk_bits[bhk] = self.bhk_bits.get(bhk, 0) | bit
+            if row['is_featured']:
+                self.featured_bits |= bit
+            if row['trending_tag'] is not None:
+                self.trending_bits |= bit
+            if row['onwards_price'] is not None:
+                prices.append((row['onwards_price'], pos))
+
+        prices.sort()
+        self._price_values = [price for price, _ in prices]
+        self._price_positions = [pos for _, pos in prices]
+
+        self.amenity_bits = self._relation_bits(Project.amenities.through, 'amenity_id')
+        self.tag_bits = self._relation_bits(Project.tags.through, 'tag_id')
+
+        # Per sort attribute: positions in ascending (value, id) order and the
+        # matching keys, so cursors can be located by bisection
+        self._values = {}
+        self._ascending = {}
+        self._keys = {}
+        self.orders = {}
+        for sort, (attr, descending) in SORTS.items():
+            if attr not in self._ascending:
+                values = [row[attr] for row in rows]
+                ascending = sorted(
+                    range(len(rows)),
+                    key=lambda pos: (_sort_key(values[pos]), self.ids[pos]),
+                )
+                self._values[attr] = values
+                self._ascending[attr] = ascending
+                self._keys[attr] = [(_sort_key(values[pos]), self.ids[pos]) for pos in ascending]
+            ascending = self._ascending[attr]
+            self.orders[sort] = ascending[::-1] if descending else ascending
+
+        # Name-or-id lookups for the filter parameters
+        self.options = {
+            'category': self._options(Category.objects.values_list('id', 'name')),
+            'city': self._options(City.objects.values_list('id', 'name')),
+            'project_type': self._options(ProjectType.objects.values_list('id', 'name')),
+            'amenities': self._options(Amenity.objects.values_list('id', 'name')),
+            'tags': self._options(Tag.objects.values_list('id', 'name')),
+        }
+
+    def _relation_bits(self, through, column):
+        bits = {}
+        for project_id, related_id in through.objects.values_list('project_id', column):
+            pos = self.positions.get(project_id)
+            if pos is not None:
+                bits[related_id] = bits.get(related_id, 0) | (1 << pos)
+        return bits
+
+    @staticmethod
+    def _options(pairs):
+        by_id, by_name = {}, {}
+        for option_id, name in pairs:
+            by_id[option_id] = name
+            by_name.setdefault(name.lower(), (option_id, name))
+        return by_id, by_name
+
+    def resolve(self, kind, raw):
+        """Resolve a name-or-id filter parameter to (id, name), or None"""
+        by_id, by_name = self.options[kind]
+        if raw.isdigit():
+            option_id = int(raw)
+            if option_id in by_id:
+                return option_id, by_id[option_id]
+            return None
+        return by_name.get(raw.lower())
+
+    def bhk(self, value):
+        """Projects offering this many bedrooms (or more, for BHK_PLUS)"""
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return 0
+        if value >= BHK_PLUS:
+            return self.combine_any(bits for bhk, bits in self.bhk_bits.items() if bhk >= value)
+        return self.bhk_bits.get(value, 0)
+
+    def price_range(self, min_price=None, max_price=None):
+        start = bisect_left(self._price_values, min_price) if min_price is not None else 0
+        end = bisect_right(self._price_values, max_price) if max_price is not None else len(self._price_values)
+        bits = 0
+        for pos in self._price_positions[start:end]:
+            bits |= 1 << pos
+        return bits
+
+    def project_ids(self, project_ids):
+        bits = 0
+        for project_id in project_ids:
+            pos = self.positions.get(project_id)
+            if pos is not None:
+                bits |= 1 << pos
+        return bits
+
+    def combine(self, filters):
+        """AND together filter bitsets; no filters matches everything"""
+        bits = self.all_bits
+        for value in filters:
+            bits &= value
+        return bits
+
+    @staticmethod
+    def combine_any(filters):
+        bits = 0
+        for value in filters:
+            bits |= value
+        return bits
+
+    def facet_counts(self, filters):
+        """
+        Result counts per option for every facet.
+
+        Each facet is counted against all *other* active filters, so the
+        numbers say how many results picking that option would give.
+        """
+        facets = {
+            'category': self.category_bits,
+            'city': self.city_bits,
+            'project_type': self.project_type_bits,
+            'status': self.status_bits,
+            'amenities': self.amenity_bits,
+            'tags': self.tag_bits,
+            'bhk': {value: self.bhk(value) for value in range(1, BHK_PLUS + 1)},
+            'budget': {
+                budget: self.price_range(*parse_budget(budget))
+                for budget in BUDGET_LABELS
+            },
+        }
+        counts = {}
+        for facet, options in facets.items():
+            base = self.combine(bits for name, bits in filters.items() if name != facet)
+            counts[facet] = {
+                option: (base & bits).bit_count()
+                for option, bits in options.items()
+            }
+        return counts
+
+    def ranked_ids(self, bits, project_ids):
+        """Matching ids in the order given (e.g. by search relevance)"""
+        positions = self.positions
+        return [
+            project_id for project_id in project_ids
+            if project_id in positions and bits >> positions[project_id] & 1
+        ]
+
+    def sorted_ids(self, bits, sort=DEFAULT_SORT):
+        order = self.orders.get(sort, self.orders[DEFAULT_SORT])
+        ids = self.ids
+        return [ids[pos] for pos in order if bits >> pos & 1]
+
+    def page(self, bits, sort=DEFAULT_SORT, cursor=None, size=SEARCH_PAGE_SIZE):
+        """
+        One page of matching ids after cursor, and the cursor for the next page.
+
+        The cursor holds the last (value, id) shown, so the page starts by
+        bisection in the sort order instead of skipping earlier results.
+        """
+        if sort not in SORTS:
+            sort = DEFAULT_SORT
+        attr, descending = SORTS[sort]
+        ascending, keys = self._ascending[attr], self._keys[attr]
+        after = decode_cursor(cursor, sort)
+        if after is not None:
+            after = (_sort_key(after[0]), after[1])
+        if descending:
+            end = bisect_left(keys, after) if after is not None else len(keys)
+            positions = (ascending[i] for i in range(end - 1, -1, -1))
+        else:
+            start = bisect_right(keys, after) if after is not None else 0
+            positions = (ascending[i] for i in range(start, len(keys)))
+
+        page = self._take(bits, positions, size)
+        next_cursor = None
+        if len(page) > size:
+            page = page[:size]
+            last = page[-1]
+            next_cursor = encode_cursor(sort, self._values[attr][last], self.ids[last])
+        return [self.ids[pos] for pos in page], next_cursor
+
+    def ranked_page(self, bits, project_ids, cursor=None, size=SEARCH_PAGE_SIZE):
+        """Like page(), over an externally ranked id list (search relevance)"""
+        after = decode_cursor(cursor, RELEVANCE)
+        start = 0
+        if after is not None:
+            try:
+                start = project_ids.index(after[1]) + 1
+            except ValueError:
+                pass
+        positions = self.positions
+        page = self._take(
+            bits,
+            (positions[project_id] for project_id in project_ids[start:] if project_id in positions),
+            size,
+        )
+        next_cursor = None
+        if len(page) > size:
+            page = page[:size]
+            next_cursor = encode_cursor(RELEVANCE, None, self.ids[page[-1]])
+        return [self.ids[pos] for pos in page], next_cursor
+
+    @staticmethod
+    def _take(bits, positions, size):
+        # One extra match tells whether there is a next page
+        page = []
+        for pos in positions:
+            if bits >> pos & 1:
+                page.append(pos)
+                if len(page) > size:
+                    break
+        return page
+
+
+def load_projects(project_ids):
+    """Fetch projects for display, preserving the order of project_ids"""
+    projects = Project.objects.filter(id__in=project_ids).select_related(
+        'city', 'category', 'project_type'
+    ).prefetch_related('amenities').in_bulk()
+    return [projects[project_id] for project_id in project_ids if project_id in projects]
+
+
+_memo = None
+
+
+def get_search_index():
+    """The current process's index, rebuilt when the catalog changes"""
+    global _memo
+    version = get_content_version(SEARCH_CONTENT)
+    if _memo is not None:
+        memo_version, index = _memo
+        if memo_version == version and time.monotonic() - index.built_at < SEARCH_INDEX_MAX_AGE:
+            return index
+    index = SearchIndex()
+    _memo = (version, index)
+    return index
@@ -0,0 +1,139 @@
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from Projects.models import (
+    Project, City, Amenity, Category, ProjectType, Tag, GalleryImage, FloorPlan,
+    NearestArea, ConstructionUpdate, SpecificationCategory, SpecificationItem,
+    WhyChooseUs, ProjectAmenityImage, ProjectOverview, FloorPlanAccess, ProjectInquiry,
+)
+from blogs.models import Blog
+from investment_leads.models import InvestmentRequirement
+from land_leads.models import LandRequirement
+from requirements.models import Requirement
+from . import fulltext, leads
+from .models import Developer, ContactForm
+from .content_cache import (
+    HOME_CONTENT, SEARCH_CONTENT, PROJECT_DETAIL_CONTENT, bump_content_version, project_content,
+)
+
+
+# Model -> content caches its rows appear in
+CONTENT_MODELS = {
+    Project: (HOME_CONTENT, SEARCH_CONTENT),
+    City: (HOME_CONTENT, SEARCH_CONTENT, PROJECT_DETAIL_CONTENT),
+    Amenity: (HOME_CONTENT, SEARCH_CONTENT, PROJECT_DETAIL_CONTENT),
+    Category: (HOME_CONTENT, SEARCH_CONTENT, PROJECT_DETAIL_CONTENT),
+    ProjectType: (HOME_CONTENT, SEARCH_CONTENT, PROJECT_DETAIL_CONTENT),
+    SpecificationCategory: (PROJECT_DETAIL_CONTENT,),
+    Developer: (HOME_CONTENT,),
+    Tag: (SEARCH_CONTENT,),
+}
+
+# Rows shown on a single project's detail page
+PROJECT_PAGE_MODELS = (
+    Project, GalleryImage, FloorPlan, NearestArea, ConstructionUpdate,
+    SpecificationItem, WhyChooseUs, ProjectAmenityImage, ProjectOverview,
+)
+
+
+def _bump_content_versions(sender, **kwargs):
+    # View counting saves with update_fields=['views'] on every detail hit;
+    # that must not throw away the whole homepage cache.
+    update_fields = kwargs.get('update_fields')
+    if sender is Project and update_fields and set(update_fields) <= {'views'}:
+        return
+    for namespace in CONTENT_MODELS[sender]:
+        bump_content_version(namespace)
+
+
+for model in CONTENT_MODELS:
+    post_save.connect(_bump_content_versions, sender=model, dispatch_uid=f'content_version_save_{model.__name__}')
+    post_delete.connect(_bump_content_versions, sender=model, dispatch_uid=f'content_version_delete_{model.__name__}')
+
+
+def _bump_project_version(sender, instance, update_fields=None, **kwargs):
+    if sender is Project:
+        if update_fields and set(update_fields) <= {'views'}:
+            return
+        project_id = instance.pk
+    else:
+        project_id = instance.project_id
+    bump_content_version(project_content(project_id))
+
+
+for model in PROJECT_PAGE_MODELS:
+    post_save.connect(_bump_project_version, sender=model, dispatch_uid=f'project_version_save_{model.__name__}')
+    post_delete.connect(_bump_project_version, sender=model, dispatch_uid=f'project_version_delete_{model.__name__}')
+
+
+@receiver(m2m_changed, sender=Project.amenities.through, dispatch_uid='content_version_amenities')
+@receiver(m2m_changed, sender=Project.tags.through, dispatch_uid='content_version_tags')
+def project_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_content_version(HOME_CONTENT)
+        bump_content_version(SEARCH_CONTENT)
+        if not reverse:
+            bump_content_version(project_content(instance.pk))
+        elif pk_set:
+            for project_id in pk_set:
+                bump_content_version(project_content(project_id))
+        else:
+            # Reverse clear: the affected projects are not reported
+            bump_content_version(PROJECT_DETAIL_CONTENT)
+
+
+@receiver(post_save, sender=Project, dispatch_uid='fulltext_project_save')
+@receiver(post_save, sender=Blog, dispatch_uid='fulltext_blog_save')
+def update_fulltext_document(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'views'}:
+        return
+    fulltext.update_document(instance)
+
+
+@receiver(post_delete, sender=Project, dispatch_uid='fulltext_project_delete')
+@receiver(post_delete, sender=Blog, dispatch_uid='fulltext_blog_delete')
+def remove_fulltext_document(sender, instance, **kwargs):
+    fulltext.remove_document(instance)
+
+
+LEAD_MODELS = (LandRequirement, InvestmentRequirement, Requirement, ContactForm, FloorPlanAccess, ProjectInquiry)
+
+
+def _assign_dedupe_keys(sender, instance, raw=False, **kwargs):
+    if not raw:
+        leads.assign_keys(instance)
+
+
+def _index_lead(sender, instance, raw=False, **kwargs):
+    if not raw:
+        leads.index_lead(instance)
+
+
+def _remove_lead(sender, instance, **kwargs):
+    leads.remove_lead(instance)
+
+
+for model in LEAD_MODELS:
+    pre_save.connect(_assign_dedupe_keys, sender=model, dispatch_uid=f'lead_keys_{model.__name__}')
+    post_save.connect(_index_lead, sender=model, dispatch_uid=f'lead_index_save_{model.__name__}')
+    post_delete.connect(_remove_lead, sender=model, dispatch_uid=f'lead_index_delete_{model.__name__}')
+
+
+@receiver(connection_created, dispatch_uid='sqlite_pragmas')
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Apply the PRAGMAs given in DATABASE_URL (Source/database.py). Production
+    sets journal_mode=wal, which lets readers run alongside the single
+    writer, and synchronous=normal, safe in WAL mode without an fsync per
+    commit. The busy timeout comes from the connection's `timeout` option.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = connection.settings_dict.get('PRAGMAS', {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        # Values are checked against Source.database.SQLITE_PRAGMAS
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
@@ -0,0 +1,193 @@
+"""
+Write-behind ingestion for public lead forms.
+
+With ``LEAD_INGESTION = 'spool'`` the form views do not INSERT into the
+lead tables on the request. save_lead() checks the values against the
+model's fields and appends them to a spool: a small SQLite side database
+in WAL mode with synchronous=FULL (LEAD_SPOOL_PATH). Appends do not contend
+with the main database's write lock, and each append is durable once it
+returns. LEAD_SPOOL_PATH must be on persistent storage (a mounted volume
+in deployment, not the container's disk), and a drainer process must run
+next to the web process (see the Procfile). ``manage.py drain_lead_spool`` moves spooled leads
+into their tables in batches with bulk_create, then does what the save
+signals would have done: dedupe keys, the Lead index and matching.
+
+Delivery is at-least-once. A drainer killed between committing a batch
+and deleting it from the spool inserts that batch again on restart.
+Rows that still cannot be inserted stay in the spool with their error;
+``drain_lead_spool --retry-failed`` queues them again.
+
+With the default ``'direct'`` mode save_lead() is a plain create().
+"""
+import json
+import logging
+import sqlite3
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .leads import LEAD_SOURCES, assign_keys, index_leads
+
+
+logger = logging.getLogger(__name__)
+
+DRAIN_BATCH_SIZE = 500
+DRAIN_LOCK_KEY = 'lead_spool_draining'
+DRAIN_LOCK_TIMEOUT = 60 * 10
+
+_local = threading.local()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spool (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    model TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    submitted_at TEXT NOT NULL,
+    error TEXT
+)
+"""
+
+
+def spool_enabled():
+    return getattr(settings, 'LEAD_INGESTION', 'direct') == 'spool'
+
+
+def connect(path=None):
+    """This thread's connection to the spool database (created on first use)"""
+    path = str(path or settings.LEAD_SPOOL_PATH)
+    if not hasattr(_local, 'connections'):
+        _local.connections = {}
+    if path not in _local.connections:
+        # Autocommit: every append is its own (WAL) transaction
+        connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        # FULL: an append survives power loss once it returns
+        connection.execute('PRAGMA synchronous=FULL')
+        connection.execute(SCHEMA)
+        _local.connections[path] = connection
+    return _local.connections[path]
+
+
+def append(model, values):
+    """Durably queue one row of `model` (field name -> JSON-able value)"""
+    connect().execute(
+        'INSERT INTO spool (model, payload, submitted_at) VALUES (?, ?, ?)',
+        (model._meta.label, json.dumps(values), timezone.now().isoformat()),
+    )
+
+
+def save_lead(model, **values):
+    """Store a lead submitted from a public form; returns the row, or None when spooled"""
+    if spool_enabled():
+        validate(model, values)
+        append(model, values)
+        return None
+    return model.objects.create(**values)
+
+
+def validate(model, values):
+    """
+    Raise ValidationError for values the INSERT would reject (nulls,
+    unparseable numbers or dates, over-long strings), so the visitor is told
+    now rather than the drainer failing later. Like create(), it does not
+    enforce blank or choices.
+    """
+    for name, value in values.items():
+        field = model._meta.get_field(name)
+        if value is None:
+            if not field.null:
+                raise ValidationError({name: f'{field.verbose_name} cannot be null.'})
+            continue
+        field.run_validators(field.to_python(value))
+
+
+def pending_count():
+    return connect().execute('SELECT COUNT(*) FROM spool WHERE error IS NULL').fetchone()[0]
+
+
+def failed_count():
+    return connect().execute('SELECT COUNT(*) FROM spool WHERE error IS NOT NULL').fetchone()[0]
+
+
+def retry_failed():
+    """Queue rows that failed to insert again; returns how many"""
+    return connect().execute('UPDATE spool SET error = NULL WHERE error IS NOT NULL').rowcount
+
+
+def drain(batch_size=DRAIN_BATCH_SIZE):
+    """
+    Insert spooled leads into their tables; returns how many were stored.
+
+    Only one drainer runs at a time (cache lock).
+    """
+    if not cache.add(DRAIN_LOCK_KEY, True, DRAIN_LOCK_TIMEOUT):
+        return 0
+    try:
+        stored = 0
+        while True:
+            rows = connect().execute(
+                'SELECT id, model, payload, submitted_at FROM spool WHERE error IS NULL ORDER BY id LIMIT ?',
+                (batch_size,),
+            ).fetchall()
+            if not rows:
+                return stored
+            by_model = {}
+            for row in rows:
+                by_model.setdefault(row[1], []).append(row)
+            for label, model_rows in by_model.items():
+                stored += _store(label, model_rows)
+    finally:
+        cache.delete(DRAIN_LOCK_KEY)
+
+
+def _store(label, rows):
+    """Bulk insert one model's rows, falling back to one by one to isolate bad rows"""
+    try:
+        _insert(label, rows)
+    except Exception:
+        logger.warning('Bulk insert of %d spooled %s rows failed; retrying one by one', len(rows), label, exc_info=True)
+    else:
+        _forget([row[0] for row in rows])
+        return len(rows)
+
+    stored = 0
+    for row in rows:
+        try:
+            _insert(label, [row])
+        except Exception as error:
+            logger.exception('Could not store spooled %s row %s', label, row[0])
+            connect().execute('UPDATE spool SET error = ? WHERE id = ?', (repr(error), row[0]))
+        else:
+            _forget([row[0]])
+            stored += 1
+    return stored
+
+
+def _insert(label, rows):
+    model = apps.get_model(label)
+    date_field = LEAD_SOURCES[label]['date_field']
+    instances, submitted = [], []
+    for _, _, payload, submitted_at in rows:
+        instance = model(**json.loads(payload))
+        assign_keys(instance)
+        instances.append(instance)
+        submitted.append(parse_datetime(submitted_at))
+
+    with transaction.atomic():
+        model.objects.bulk_create(instances)
+        # auto_now_add stamped the drain time; keep the submission time
+        for instance, submitted_at in zip(instances, submitted):
+            setattr(instance, date_field, submitted_at)
+        model.objects.bulk_update(instances, [date_field])
+        index_leads(instances)
+
+
+def _forget(ids):
+    placeholders = ','.join('?' * len(ids))
+    connect().execute(f'DELETE FROM spool WHERE id IN ({placeholders})', ids)
@@ -2,6 +2,7 @@
 class SearchPropertiesManager {
     constructor() {
         this.isLoading = false;
+        this.isLoadingMore = false;
         this.debounceTimer = null;
         this.init();
     }
@@ -246,6 +247,17 @@ class SearchPropertiesManager {
             }
         });
 
+        // Re-attach quick sort buttons
+        document.querySelectorAll('button[data-sort]').forEach(button => {
+            button.addEventListener('click', (e) => {
+                e.preventDefault();
+                this.submitSort(button.getAttribute('data-sort'));
+            });
+        });
+
+        // Infinite scroll over cursor pages
+        this.observeLoadMore();
+
         // Re-attach pagination events
         document.querySelectorAll('a[href*="page="]').forEach(link => {
             link.addEventListener('click', (e) => {
@@ -324,6 +336,71 @@ class SearchPropertiesManager {
         });
     }
 
+    observeLoadMore() {
+        const sentinel = document.querySelector('.search-load-more[data-next-cursor]');
+        if (!sentinel) return;
+
+        const button = sentinel.querySelector('button');
+        if (button) {
+            button.addEventListener('click', () => this.loadMore(sentinel));
+        }
+
+        if ('IntersectionObserver' in window) {
+            const observer = new IntersectionObserver((entries) => {
+                if (entries.some(entry => entry.isIntersecting)) {
+                    observer.disconnect();
+                    this.loadMore(sentinel);
+                }
+            }, { rootMargin: '400px' });
+            observer.observe(sentinel);
+        }
+    }
+
+    loadMore(sentinel) {
+        if (this.isLoadingMore || !sentinel.isConnected) return;
+        this.isLoadingMore = true;
+
+        const params = new URLSearchParams(window.location.search);
+        params.delete('page');
+        params.set('cursor', sentinel.getAttribute('data-next-cursor'));
+
+        fetch(window.location.pathname + '?' + params.toString(), {
+            headers: { 'X-Requested-With': 'XMLHttpRequest' }
+        })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            return response.text();
+        })
+        .then(data => {
+            const tempDiv = document.createElement('div');
+            tempDiv.innerHTML = data;
+
+            // Append the new cards and swap in the next sentinel
+            const grid = document.querySelector('.flex-1 .property-grid');
+            const newCards = tempDiv.querySelector('.property-grid');
+            if (grid && newCards) {
+                grid.append(...newCards.children);
+            }
+            const nextSentinel = tempDiv.querySelector('.search-load-more');
+            if (nextSentinel) {
+                sentinel.replaceWith(nextSentinel);
+            } else {
+                sentinel.remove();
+            }
+            this.observeLoadMore();
+            this.applyLayoutFixes();
+        })
+        .catch(error => {
+            console.error('AJAX Error:', error);
+            this.showErrorMessage('Failed to load more properties. Please try again.');
+        })
+        .finally(() => {
+            this.isLoadingMore = false;
+        });
+    }
+
     loadFromUrl(url, updateHistory = true) {
         this.makeAjaxRequest(url, updateHistory);
     }
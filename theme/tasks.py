@@ -0,0 +1,8 @@
+"""Background jobs for theme (run by the run_worker command)"""
+from .dedupe import match_leads
+from .jobs import task
+
+
+@task('theme.match_leads')
+def match_leads_task():
+    match_leads()
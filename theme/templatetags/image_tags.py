@@ -0,0 +1,41 @@
+from django import template
+from django.utils.html import format_html
+
+from Projects.images import has_derivatives, srcset, variant_url
+
+register = template.Library()
+
+# Variant -> default ``sizes`` attribute
+DEFAULT_SIZES = {
+    'thumb': '160px',
+    'card': '(min-width: 1280px) 33vw, (min-width: 768px) 50vw, 100vw',
+    'hero': '(min-width: 1024px) 55vw, 100vw',
+    'full': '100vw',
+}
+
+
+@register.simple_tag
+def responsive_image(image, variant='card', alt='', css_class='', loading='lazy', sizes=None):
+    """
+    <picture> with WebP and JPEG srcsets for a project image.
+
+    Usage: {% responsive_image project.banner_image 'card' alt=project.name css_class="w-full h-48" %}
+    Images without derivatives render as a plain <img> of the original.
+    """
+    if not image:
+        return ''
+    if not has_derivatives(image):
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}">',
+            image.url, alt, css_class, loading,
+        )
+    sizes = sizes or DEFAULT_SIZES.get(variant, '100vw')
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="{}">'
+        '</picture>',
+        srcset(image, 'webp'), sizes,
+        variant_url(image, variant), srcset(image, 'jpeg'), sizes,
+        alt, css_class, loading,
+    )
@@ -0,0 +1,190 @@
+"""
+Two-level cache backend: a small in-process LRU (L1) in front of a shared
+cache alias (L2).
+
+Reads are served from L1 when present and fall back to L2, copying the
+value into L1 for at most L1_TIMEOUT seconds. Writes go to both. Atomic
+operations (add, incr, decr) and deletes go to L2 and drop the key from
+L1, so locks and counters behave exactly as on the shared backend.
+
+Other processes' writes become visible here when the L1 copy expires, so
+L1_TIMEOUT bounds how stale a read can be. Keys that must never be read
+stale belong on the shared alias itself, not on a tiered one.
+
+    CACHES = {
+        'default': {'BACKEND': '...RedisCache', 'LOCATION': 'redis://...'},
+        'content': {
+            'BACKEND': 'theme.tiered_cache.TieredCache',
+            'LOCATION': 'content',  # names this process's L1 store
+            'OPTIONS': {'L2': 'default', 'L1_TIMEOUT': 5, 'L1_MAX_ENTRIES': 1000},
+        },
+    }
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+_MISSING = object()
+
+# LOCATION -> LocalLRU, shared by every thread of the process
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class LocalLRU:
+    """Thread-safe LRU of pickled values with per-entry expiry"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            expires, pickled = item
+            if expires <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def set(self, key, value, ttl):
+        # Pickled like LocMemCache, so callers never share a mutable object
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, pickled)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.l2_alias = options.get('L2', 'default')
+        self.l1_timeout = options.get('L1_TIMEOUT', 5)
+        with _stores_lock:
+            self.l1 = _stores.setdefault(location, LocalLRU(options.get('L1_MAX_ENTRIES', 1000)))
+
+    @property
+    def l2(self):
+        return caches[self.l2_alias]
+
+    def _l1_key(self, key, version):
+        return self.make_and_validate_key(key, version=version)
+
+    def _l1_ttl(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self.l1_timeout
+        return min(timeout, self.l1_timeout)
+
+    def _remember(self, key, value, version, timeout=DEFAULT_TIMEOUT):
+        l1_key = self._l1_key(key, version)
+        ttl = self._l1_ttl(timeout)
+        if ttl > 0:
+            self.l1.set(l1_key, value, ttl)
+        else:
+            self.l1.delete(l1_key)
+
+    def _forget(self, key, version):
+        self.l1.delete(self._l1_key(key, version))
+
+    def get(self, key, default=None, version=None):
+        value = self.l1.get(self._l1_key(key, version))
+        if value is not _MISSING:
+            return value
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        self._remember(key, value, version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found, missing = {}, []
+        for key in keys:
+            value = self.l1.get(self._l1_key(key, version))
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing:
+            fetched = self.l2.get_many(missing, version=version)
+            for key, value in fetched.items():
+                self._remember(key, value, version)
+            found.update(fetched)
+        return found
+
+    def has_key(self, key, version=None):
+        if self.l1.get(self._l1_key(key, version)) is not _MISSING:
+            return True
+        return self.l2.has_key(key, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        self._remember(key, value, version, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            if key in failed:
+                self._forget(key, version)
+            else:
+                self._remember(key, value, version, timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self._remember(key, value, version, timeout)
+        else:
+            # Someone else's value is current; read it from L2 next time
+            self._forget(key, version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self._forget(key, version)
+        return self.l2.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._forget(key, version)
+        return self.l2.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self._forget(key, version)
+        return self.l2.decr(key, delta, version=version)
+
+    def delete(self, key, version=None):
+        self._forget(key, version)
+        return self.l2.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self._forget(key, version)
+        self.l2.delete_many(keys, version=version)
+
+    def clear(self):
+        """Clears this process's L1 and the whole shared L2"""
+        self.l1.clear()
+        self.l2.clear()
@@ -31,8 +31,16 @@ from land_leads.models import LandRequirement
 from investment_leads.models import InvestmentRequirement
 from requirements.models import Requirement
 from .models import SiteConfig, ContactForm, Developer
+from .homepage import lazy_home_carousels
+from .content_cache import HOME_CONTENT, HOME_FRAGMENT_TIMEOUT, get_content_version
+from . import fulltext
+from .spool import save_lead
+from .ratelimit import rate_limit
+from .replica import not_sticky, read_from_replica
+from .search_index import get_search_index, load_projects, parse_budget, BHK_PLUS, BUDGET_LABELS, DEFAULT_SORT, SEARCH_PAGE_SIZE
 
 
+@read_from_replica
 def home(request):
     """Home page view"""
     # Get categories with featured projects
@@ -44,63 +52,10 @@ def home(request):
     commercial_types = ProjectType.objects.filter(category__name__icontains='commercial')
     amenities = Amenity.objects.filter(is_active=True)[:8]  # Show first 8 amenities
     
-    # Featured projects
-    featured_projects = Project.objects.filter(
-        is_featured=True, 
-        is_active=True
-    ).select_related('city', 'category', 'project_type').prefetch_related('amenities')[:6]
-    
-    # Add featured projects to categories
-    for category in categories:
-        category.featured_projects = Project.objects.filter(
-            category=category,
-            is_active=True
-        ).select_related('city', 'project_type').prefetch_related('amenities')[:6]
-    
-    # Trending properties (most viewed)
-    trending_projects = Project.objects.filter(
-        is_active=True
-    ).order_by('-views')[:8]
-    
-    # Ready to move properties
-    ready_to_move_projects = Project.objects.filter(
-        status='ready_to_move',
-        is_active=True
-    ).select_related('city', 'project_type').prefetch_related('amenities')[:8]
-    
-    # Recently Viewed Properties (can be based on session or default to newest)
-    recently_viewed_projects = Project.objects.filter(
-        is_active=True
-    ).order_by('-created_at')[:8]
-    
-    # Hot Deals
-    hot_deal_projects = Project.objects.filter(
-        is_hot_deal=True,
-        is_active=True
-    ).select_related('city', 'project_type').prefetch_related('amenities')[:8]
-    
-    # Premium Listings
-    premium_projects = Project.objects.filter(
-        is_premium_listing=True,
-        is_active=True
-    ).select_related('city', 'project_type').prefetch_related('amenities')[:8]
-    
-    # Editor's Choice
-    editors_choice_projects = Project.objects.filter(
-        is_editors_choice=True,
-        is_active=True
-    ).select_related('city', 'project_type').prefetch_related('amenities')[:8]
-    
-    # Projects by Category for horizontal scrolling
-    residential_projects = Project.objects.filter(
-        category__name__icontains='residential',
-        is_active=True
-    ).select_related('city', 'project_type').prefetch_related('amenities')[:10]
-    
-    commercial_projects = Project.objects.filter(
-        category__name__icontains='commercial',
-        is_active=True
-    ).select_related('city', 'project_type').prefetch_related('amenities')[:10]
+    # All project carousels (and each category's featured projects) come
+    # from a single query, split in memory - and only when a cached
+    # homepage fragment is missing
+    carousels = lazy_home_carousels(categories)
     
     # Active developers for the developers section
     active_developers = Developer.objects.filter(is_active=True).order_by('order', 'name')
@@ -111,27 +66,21 @@ def home(request):
         'residential_types': residential_types,
         'commercial_types': commercial_types,
         'amenities': amenities,
-        'featured_projects': featured_projects,
-        'trending_projects': trending_projects,
-        'ready_to_move_projects': ready_to_move_projects,
-        'recently_viewed_projects': recently_viewed_projects,
-        'hot_deal_projects': hot_deal_projects,
-        'premium_projects': premium_projects,
-        'editors_choice_projects': editors_choice_projects,
-        'residential_projects': residential_projects,
-        'commercial_projects': commercial_projects,
         'active_developers': active_developers,
+        'home_cache_version': get_content_version(HOME_CONTENT),
+        'home_cache_timeout': HOME_FRAGMENT_TIMEOUT,
+        **carousels,
     }
     
     return render(request, 'pages/home.html', context)
 
 
+@read_from_replica
 def search_properties(request):
     """Search and filter properties"""
-    # Get all projects
-    projects = Project.objects.filter(is_active=True).select_related(
-        'city', 'category', 'project_type'
-    ).prefetch_related('amenities')
+    # Filters, facet counts and sorting are resolved against the in-memory
+    # search index; the database is only asked for the page being shown
+    index = get_search_index()
     
     # Get filter options
     categories = Category.objects.all()
@@ -141,16 +90,16 @@ def search_properties(request):
     
     # Store applied filters for display
     applied_filters = []
+    # Facet name -> bitset of matching projects
+    filters = {}
     
     # Apply filters
     search_query = request.GET.get('q')
+    ranked_ids = None
     if search_query:
-        projects = projects.filter(
-            Q(name__icontains=search_query) |
-            Q(project_by__icontains=search_query) |
-            Q(location__icontains=search_query) |
-            Q(developers__icontains=search_query)
-        )
+        # Full-text matches, most relevant first
+        ranked_ids = fulltext.search('project', search_query)
+        filters['q'] = index.project_ids(ranked_ids)
         applied_filters.append({
             'label': 'Search',
             'value': search_query,
@@ -158,76 +107,34 @@ def search_properties(request):
             'raw_value': search_query
         })
     
-    # Category filter
-    category_id = request.GET.get('category')
-    if category_id:
-        try:
-            # Try to get by ID first
-            if category_id.isdigit():
-                category = Category.objects.get(id=category_id)
-            else:
-                # Try to get by name if not a digit
-                category = Category.objects.get(name__iexact=category_id)
-            projects = projects.filter(category=category)
-            applied_filters.append({
-                'label': 'Category',
-                'value': category.name,
-                'param': 'category',
-                'raw_value': category_id
-            })
-        except (Category.DoesNotExist, ValueError):
-            pass
-    
-    # City filter
-    city_id = request.GET.get('city')
-    if city_id:
-        try:
-            # Try to get by ID first
-            if city_id.isdigit():
-                city = City.objects.get(id=city_id)
-            else:
-                # Try to get by name if not a digit
-                city = City.objects.get(name__iexact=city_id)
-            projects = projects.filter(city=city)
-            applied_filters.append({
-                'label': 'City',
-                'value': city.name,
-                'param': 'city',
-                'raw_value': city_id
-            })
-        except (City.DoesNotExist, ValueError):
-            pass
-    
-    # Project type filter
-    project_type_id = request.GET.get('project_type')
-    if project_type_id:
-        try:
-            # Try to get by ID first
-            if project_type_id.isdigit():
-                project_type = ProjectType.objects.get(id=project_type_id)
-            else:
-                # Try to get by name if not a digit
-                project_type = ProjectType.objects.get(name__iexact=project_type_id)
-            projects = projects.filter(project_type=project_type)
-            applied_filters.append({
-                'label': 'Type',
-                'value': project_type.name,
-                'param': 'project_type',
-                'raw_value': project_type_id
-            })
-        except (ProjectType.DoesNotExist, ValueError):
-            pass
+    # Category, city and project type filters (by id or by name)
+    for param, label, option_bits in (
+        ('category', 'Category', index.category_bits),
+        ('city', 'City', index.city_bits),
+        ('project_type', 'Type', index.project_type_bits),
+    ):
+        raw_value = request.GET.get(param)
+        if not raw_value:
+            continue
+        option = index.resolve(param, raw_value)
+        if option is None:
+            continue
+        option_id, option_name = option
+        filters[param] = option_bits.get(option_id, 0)
+        applied_filters.append({
+            'label': label,
+            'value': option_name,
+            'param': param,
+            'raw_value': raw_value
+        })
     
     # BHK filter
     bhk = request.GET.get('bhk')
     if bhk:
-        if bhk == '4':
-            projects = projects.filter(bhk__icontains='4')
-        else:
-            projects = projects.filter(bhk__icontains=f'{bhk} BHK')
+        filters['bhk'] = index.bhk(bhk)
         applied_filters.append({
             'label': 'BHK',
-            'value': f'{bhk}{"+" if bhk == "4" else ""} BHK',
+            'value': f'{bhk}{"+" if bhk == str(BHK_PLUS) else ""} BHK',
             'param': 'bhk',
             'raw_value': bhk
         })
@@ -235,25 +142,13 @@ def search_properties(request):
     # Budget filter
     budget = request.GET.get('budget')
     if budget:
-        budget_labels = {
-            '0-2000000': 'Under ₹20L',
-            '2000000-5000000': '₹20L - ₹50L',
-            '5000000-10000000': '₹50L - ₹1Cr',
-            '10000000-20000000': '₹1Cr - ₹2Cr',
-            '20000000-50000000': '₹2Cr - ₹5Cr',
-            '50000000-': '₹5Cr+',
-        }
-        
-        if '-' in budget:
-            min_price, max_price = budget.split('-')
-            if min_price:
-                projects = projects.filter(onwards_price__gte=int(min_price))
-            if max_price:
-                projects = projects.filter(onwards_price__lte=int(max_price))
+        price_range = parse_budget(budget)
+        if price_range:
+            filters['budget'] = index.price_range(*price_range)
         
         applied_filters.append({
             'label': 'Budget',
-            'value': budget_labels.get(budget, budget),
+            'value': BUDGET_LABELS.get(budget, budget),
             'param': 'budget',
             'raw_value': budget
         })
@@ -261,7 +156,7 @@ def search_properties(request):
     # Status filter
     status = request.GET.get('status')
     if status:
-        projects = projects.filter(status=status)
+        filters['status'] = index.status_bits.get(status, 0)
         status_labels = {
             'ready_to_move': 'Ready to Move',
             'under_construction': 'Under Construction',
@@ -275,22 +170,27 @@ def search_properties(request):
             'raw_value': status
         })
     
-    # Amenities filter
-    amenity_ids = request.GET.getlist('amenities')
-    if amenity_ids:
-        projects = projects.filter(amenities__id__in=amenity_ids).distinct()
-        selected_amenities = Amenity.objects.filter(id__in=amenity_ids)
-        for amenity in selected_amenities:
+    # Amenity and tag filters (match any of the selected options)
+    for param, label, option_bits in (
+        ('amenities', 'Amenity', index.amenity_bits),
+        ('tags', 'Tag', index.tag_bits),
+    ):
+        selected = [index.resolve(param, raw) for raw in request.GET.getlist(param)]
+        selected = [option for option in selected if option]
+        if not selected:
+            continue
+        filters[param] = index.combine_any(option_bits.get(option_id, 0) for option_id, _ in selected)
+        for option_id, option_name in selected:
             applied_filters.append({
-                'label': 'Amenity',
-                'value': amenity.name,
-                'param': 'amenities',
-                'raw_value': str(amenity.id)
+                'label': label,
+                'value': option_name,
+                'param': param,
+                'raw_value': str(option_id)
             })
     
     # Special filters
     if request.GET.get('featured'):
-        projects = projects.filter(is_featured=True)
+        filters['featured'] = index.featured_bits
         applied_filters.append({
             'label': 'Filter',
             'value': 'Featured',
@@ -299,7 +199,7 @@ def search_properties(request):
         })
     
     if request.GET.get('trending'):
-        projects = projects.filter(trending_tag__isnull=False)
+        filters['trending'] = index.trending_bits
         applied_filters.append({
             'label': 'Filter',
             'value': 'Trending',
@@ -307,32 +207,51 @@ def search_properties(request):
             'raw_value': 'true'
         })
     
-    # Sorting
-    sort_by = request.GET.get('sort', '-created_at')
-    valid_sorts = ['-created_at', 'onwards_price', '-onwards_price', '-views', 'name']
-    if sort_by in valid_sorts:
-        projects = projects.order_by(sort_by)
-    else:
-        projects = projects.order_by('-created_at')
+    # Sorting (text searches default to relevance)
+    sort_by = request.GET.get('sort')
+    by_relevance = ranked_ids is not None and not sort_by
+    sort_by = sort_by or DEFAULT_SORT
+    matched = index.combine(filters.values())
     
-    # Pagination
-    paginator = Paginator(projects, 16)  # Show 16 projects per page (4x4 grid)
-    page_number = request.GET.get('page')
-    projects_page = paginator.get_page(page_number)
+    # Facet counts for every filter option given the other active filters
+    facet_counts = index.facet_counts(filters)
+    for option_list, facet in ((categories, 'category'), (cities, 'city'), (project_types, 'project_type'), (amenities, 'amenities')):
+        for option in option_list:
+            option.facet_count = facet_counts[facet].get(option.id, 0)
     
     context = {
-        'projects': projects_page,
         'categories': categories,
         'cities': cities,
         'project_types': project_types,
         'amenities': amenities,
         'applied_filters': applied_filters,
+        'facet_counts': facet_counts,
+        'total_count': matched.bit_count(),
     }
     
-    # Handle AJAX requests
+    # AJAX / infinite scroll: keyset pages, so deep scrolling costs the same as page one
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        cursor = request.GET.get('cursor')
+        if by_relevance:
+            page_ids, next_cursor = index.ranked_page(matched, ranked_ids, cursor, SEARCH_PAGE_SIZE)
+        else:
+            page_ids, next_cursor = index.page(matched, sort_by, cursor, SEARCH_PAGE_SIZE)
+        context['projects'] = load_projects(page_ids)
+        context['next_cursor'] = next_cursor
         return render(request, 'pages/search_properties_ajax.html', context)
     
+    if by_relevance:
+        project_ids = index.ranked_ids(matched, ranked_ids)
+    else:
+        project_ids = index.sorted_ids(matched, sort_by)
+    
+    # Pagination over ids; only the displayed page is loaded
+    paginator = Paginator(project_ids, SEARCH_PAGE_SIZE)  # Show 16 projects per page (4x4 grid)
+    page_number = request.GET.get('page')
+    projects_page = paginator.get_page(page_number)
+    projects_page.object_list = load_projects(projects_page.object_list)
+    context['projects'] = projects_page
+    
     return render(request, 'pages/search_properties.html', context)
 
 
@@ -345,6 +264,8 @@ def project_detail(request, project_id):
 
 
 @require_POST
+@rate_limit('project_views')
+@not_sticky
 def increment_project_views(request, project_id):
     """Increment project view count"""
     try:
@@ -377,7 +298,7 @@ def land_requirement(request):
             return redirect('theme:home')
         
         # Create land requirement
-        land_req = LandRequirement.objects.create(**data)
+        save_lead(LandRequirement, **data)
         
         messages.success(request, 'Thank you! Your land requirement has been submitted successfully. We will contact you soon.')
         return redirect('theme:home')
@@ -408,7 +329,7 @@ def investment_requirement(request):
             return redirect('theme:investment_page')
         
         # Create investment requirement
-        investment_req = InvestmentRequirement.objects.create(**data)
+        save_lead(InvestmentRequirement, **data)
         
         messages.success(request, 'Thank you! Your investment inquiry has been submitted successfully. We will contact you soon.')
         return redirect('theme:investment_page')
@@ -423,7 +344,7 @@ def land_page(request):
     from .models import SiteConfig
     
     # Get site configuration for contact information
-    site_config = SiteConfig.get_config()
+    site_config = SiteConfig.get_cached_config()
     
     context = {
         'page_title': 'Land Requirements',
@@ -440,7 +361,7 @@ def requirements_page(request):
     from requirements.models import Requirement
     
     # Get site configuration for contact information
-    site_config = SiteConfig.get_config()
+    site_config = SiteConfig.get_cached_config()
     
     context = {
         'page_title': 'Property Requirements',
@@ -472,7 +393,8 @@ def requirements_submission(request):
             agreed_to_terms = request.POST.get('agreed_to_terms') == 'on'
             
             # Create requirement
-            requirement = Requirement.objects.create(
+            save_lead(
+                Requirement,
                 name=name,
                 contact_number=contact_number,
                 email=email,
@@ -501,7 +423,7 @@ def investment_page(request):
     from .models import SiteConfig
     
     # Get site configuration for contact information
-    site_config = SiteConfig.get_config()
+    site_config = SiteConfig.get_cached_config()
     
     context = {
         'page_title': 'Investment Opportunities',
@@ -524,7 +446,8 @@ def contact_us(request):
             message = request.POST.get('message')
             
             # Save to database
-            contact_submission = ContactForm.objects.create(
+            save_lead(
+                ContactForm,
                 name=name,
                 email=email,
                 phone=phone,
@@ -539,7 +462,7 @@ def contact_us(request):
             messages.error(request, 'Sorry, there was an error sending your message. Please try again.')
     
     # Get site config (singleton)
-    site_config = SiteConfig.get_config()
+    site_config = SiteConfig.get_cached_config()
     context = {
         'page_title': 'Contact Us',
         'site_config': site_config,
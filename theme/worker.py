@@ -0,0 +1,22 @@
+"""
+Entry points for run_worker's pool processes.
+
+Pool processes are spawned, so they import this module before Django is
+set up; it must not import models at module level.
+"""
+import signal
+
+import django
+
+
+def init_process():
+    django.setup()
+    from .jobs import discover_tasks
+    discover_tasks()
+    # Ctrl+C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def run_job(task_name, args):
+    from .jobs import execute
+    return execute(task_name, args)